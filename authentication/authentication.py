@@ -0,0 +1,91 @@
+"""
+JWT authentication that trusts token claims instead of loading the User row.
+
+Access tokens issued by ``LoginView`` carry the user id, ``is_superuser`` and
+a password fingerprint, so the request user can be a ``TokenUser`` built from
+the token. The only per-user state still checked (active flag, superuser flag
+and password fingerprint) is read through a small in-process TTL cache, which
+lets deactivation, demotion and password changes revoke tokens within
+``JWT_USER_STATE_TTL`` seconds without a query on every request.
+Tokens revoked at logout are rejected through the in-process denylist.
+"""
+import threading
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .revocation import denylist
+from .tokens import PASSWORD_CLAIM, SUPERUSER_CLAIM, password_fingerprint
+
+_user_state = TTLCache(maxsize=settings.JWT_USER_STATE_CACHE_SIZE, ttl=settings.JWT_USER_STATE_TTL)
+_user_state_lock = threading.Lock()
+
+
+def get_user_state(user_id):
+    """``(is_active, is_superuser, password fingerprint)`` for a user, or None if it is gone."""
+    with _user_state_lock:
+        if user_id in _user_state:
+            return _user_state[user_id]
+    row = get_user_model().objects.filter(pk=user_id).values_list('is_active', 'is_superuser', 'password').first()
+    state = None if row is None else (row[0], row[1], password_fingerprint(row[2]))
+    with _user_state_lock:
+        _user_state[user_id] = state
+    return state
+
+
+def forget_user_state(user_id=None):
+    """Drop cached state for one user (or everyone) in this process."""
+    with _user_state_lock:
+        if user_id is None:
+            _user_state.clear()
+        else:
+            _user_state.pop(user_id, None)
+
+
+def ensure_claims_current(validated_token):
+    """Raise AuthenticationFailed if the user changed since ``validated_token`` was issued."""
+    state = get_user_state(validated_token[api_settings.USER_ID_CLAIM])
+    if state is None:
+        raise AuthenticationFailed(_('User not found'), code='user_not_found')
+    is_active, is_superuser, fingerprint = state
+    if not is_active:
+        raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+    if is_superuser != validated_token[SUPERUSER_CLAIM] or fingerprint != validated_token[PASSWORD_CLAIM]:
+        raise AuthenticationFailed(_('Token is no longer valid'), code='token_revoked')
+
+
+def has_user_claims(validated_token) -> bool:
+    return SUPERUSER_CLAIM in validated_token and PASSWORD_CLAIM in validated_token
+
+
+class DenylistMixin:
+    """Reject tokens whose ``jti`` has been revoked."""
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if denylist.is_revoked(validated_token[api_settings.JTI_CLAIM]):
+            raise AuthenticationFailed(_('Token has been revoked'), code='token_revoked')
+        return validated_token
+
+
+class UserJWTAuthentication(DenylistMixin, JWTAuthentication):
+    """Simple JWT's DB-backed authentication, for views that need the full User row."""
+
+
+class ClaimsJWTAuthentication(DenylistMixin, JWTAuthentication):
+    """Authenticate from access token claims; ``request.user`` is a ``TokenUser``."""
+
+    def get_user(self, validated_token):
+        if not has_user_claims(validated_token):
+            # Issued before the claims were embedded; fall back to the DB lookup
+            return super().get_user(validated_token)
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+        ensure_claims_current(validated_token)
+        return TokenUser(validated_token)
@@ -0,0 +1,76 @@
+"""
+Bounded pool for password verification.
+
+PBKDF2 is deliberately CPU-heavy. On a 0.5-CPU web container, a burst of
+logins occupying every Gunicorn thread starves cheap read requests.
+``verify_credentials`` therefore runs only the hash comparison on a small
+shared executor, which caps how many hashes run at once. Callers that wait
+longer than ``AUTH_PASSWORD_HASH_TIMEOUT`` give up, and their queued work is
+cancelled, instead of piling up behind the burst. Pool threads never touch
+the database.
+"""
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+from django.contrib.auth import get_user_model, user_login_failed
+from django.contrib.auth.hashers import check_password, make_password
+
+_executor = None
+
+
+class PasswordHashBusy(Exception):
+    """Raised when no hashing slot became free within the timeout."""
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.AUTH_PASSWORD_HASH_WORKERS,
+            thread_name_prefix='password-hash',
+        )
+    return _executor
+
+
+def _check(password, encoded):
+    """Return ``(is_correct, must_rehash)`` without saving anything."""
+    if encoded is None:
+        # Unknown user: hash anyway so response time does not reveal it
+        make_password(password)
+        return False, False
+    rehash = []
+    is_correct = check_password(password, encoded, setter=rehash.append)
+    return is_correct, bool(rehash)
+
+
+def _run(password, encoded):
+    future = get_executor().submit(_check, password, encoded)
+    try:
+        return future.result(timeout=settings.AUTH_PASSWORD_HASH_TIMEOUT)
+    except FutureTimeoutError:
+        future.cancel()
+        raise PasswordHashBusy
+
+
+def verify_credentials(request, username, password):
+    """
+    Same result as ``authenticate()`` with the default ModelBackend, but hashing on the pool.
+
+    The user lookup and any rehash save stay on the calling thread. A hash
+    whose hasher or iteration count is outdated is upgraded once, with a
+    single-column UPDATE.
+    """
+    user_model = get_user_model()
+    try:
+        user = user_model._default_manager.get_by_natural_key(username)
+    except user_model.DoesNotExist:
+        user = None
+
+    is_correct, must_rehash = _run(password, user.password if user else None)
+    if not is_correct or not user.is_active:
+        user_login_failed.send(sender=__name__, credentials={'username': username}, request=request)
+        return None
+    if must_rehash:
+        user.set_password(password)
+        user.save(update_fields=['password'])
+    return user
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from authentication.models import RevokedToken
+
+
+class Command(BaseCommand):
+    help = 'Delete revoked-token rows whose tokens have expired anyway'
+
+    def handle(self, *args, **options):
+        deleted, _details = RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+        self.stdout.write(self.style.SUCCESS(f'Pruned {deleted} expired revoked token(s)'))
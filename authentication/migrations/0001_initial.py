@@ -0,0 +1,28 @@
+# Generated by Django 4.2.26 on 2026-10-17 02:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevokedToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('jti', models.CharField(max_length=255, unique=True)),
+                ('token_type', models.CharField(max_length=20)),
+                ('user_id', models.CharField(blank=True, help_text='Token subject, for auditing', max_length=255, null=True)),
+                ('expires_at', models.DateTimeField(help_text='Original token expiry; the row can be pruned after this')),
+                ('revoked_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['revoked_at'], name='revokedtoken_revoked_at_idx'), models.Index(fields=['expires_at'], name='revokedtoken_expires_at_idx')],
+            },
+        ),
+    ]
@@ -1,3 +1,20 @@
 from django.db import models
 
-# Create your models here.
+
+class RevokedToken(models.Model):
+    """A JWT (by ``jti``) that must no longer be accepted: logged out or rotated away."""
+    jti = models.CharField(max_length=255, unique=True)
+    token_type = models.CharField(max_length=20)
+    user_id = models.CharField(max_length=255, blank=True, null=True, help_text="Token subject, for auditing")
+    expires_at = models.DateTimeField(help_text="Original token expiry; the row can be pruned after this")
+    revoked_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Delta sync of the in-process denylist and pruning
+            models.Index(fields=['revoked_at'], name='revokedtoken_revoked_at_idx'),
+            models.Index(fields=['expires_at'], name='revokedtoken_expires_at_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.token_type} {self.jti}"
@@ -1,25 +1,16 @@
 from rest_framework.permissions import BasePermission
 from rest_framework_simplejwt.authentication import JWTAuthentication
-from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFailed
 
 
 class IsAccessTokenValid(BasePermission):
     """
-    Allows access only if the user has a valid access token.
+    Allows access only if the request was authenticated with a valid access token.
+
+    Reuses the token DRF's authentication already validated instead of
+    decoding it again.
     """
     def has_permission(self, request, view):
-        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-        
-        if not auth_header.startswith('Bearer '):
-            return False
-        
-        try:
-            jwt_authenticator = JWTAuthentication()
-            validated_user, validated_token = jwt_authenticator.authenticate(request)
-            request.user = validated_user
-            return True
-        except (InvalidToken, AuthenticationFailed):
-            return False
+        return request.auth is not None and isinstance(request.successful_authenticator, JWTAuthentication)
 
 
 class IsSuperUser(BasePermission):
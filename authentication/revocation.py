@@ -0,0 +1,135 @@
+"""
+Revoked-token denylist.
+
+Revoked JTIs live in the ``RevokedToken`` table. Every process keeps a bloom
+filter of them plus an LRU of exact answers, so checking a token that was
+never revoked (the common case) costs no query. A bloom hit is confirmed
+against the LRU, and then the table. Each process pulls rows revoked by
+other processes every ``JWT_DENYLIST_SYNC_INTERVAL`` seconds, with one
+indexed query.
+"""
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from cachetools import LRUCache
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+# Re-read rows revoked slightly before the last sync, to cover clock skew
+# between app servers and transactions that committed late.
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings (double hashing on one blake2b digest)."""
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:], 'big') | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class Denylist:
+    """Per-process front for the RevokedToken table."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget everything; the next check reloads from the table."""
+        with self._lock:
+            self._bloom = None
+            self._answers = LRUCache(maxsize=settings.JWT_DENYLIST_LRU_SIZE)
+            self._synced_at = None
+            self._next_sync = 0.0
+
+    def _load(self, rows, bloom):
+        for jti in rows:
+            bloom.add(jti)
+            self._answers[jti] = True
+
+    def _sync(self):
+        from .models import RevokedToken
+
+        now = time.monotonic()
+        with self._lock:
+            if self._bloom is not None and now < self._next_sync:
+                return
+            started = timezone.now()
+            if self._bloom is None or self._bloom.count > self._bloom.capacity:
+                live = RevokedToken.objects.filter(expires_at__gt=started)
+                bloom = BloomFilter(max(settings.JWT_DENYLIST_CAPACITY, 2 * live.count()))
+                self._load(live.values_list('jti', flat=True).iterator(), bloom)
+                self._bloom = bloom
+            else:
+                recent = RevokedToken.objects.filter(revoked_at__gte=self._synced_at - SYNC_OVERLAP)
+                self._load(recent.values_list('jti', flat=True), self._bloom)
+            self._synced_at = started
+            self._next_sync = now + settings.JWT_DENYLIST_SYNC_INTERVAL
+
+    def is_revoked(self, jti) -> bool:
+        self._sync()
+        with self._lock:
+            if jti not in self._bloom:
+                return False
+            if jti in self._answers:
+                return self._answers[jti]
+
+        from .models import RevokedToken
+        revoked = RevokedToken.objects.filter(jti=jti).exists()
+        with self._lock:
+            self._answers[jti] = revoked
+        return revoked
+
+    def revoke(self, token) -> bool:
+        """
+        Record ``token`` (a simplejwt Token) as revoked.
+
+        Returns False if it was already revoked, which lets rotation treat a
+        refresh token as single-use even under concurrent requests.
+        """
+        from .models import RevokedToken
+
+        jti = token[settings.SIMPLE_JWT['JTI_CLAIM']]
+        try:
+            with transaction.atomic():
+                RevokedToken.objects.create(
+                    jti=jti,
+                    token_type=token.get(settings.SIMPLE_JWT['TOKEN_TYPE_CLAIM'], ''),
+                    user_id=token.get(settings.SIMPLE_JWT['USER_ID_CLAIM']),
+                    expires_at=datetime.fromtimestamp(token['exp'], tz=dt_timezone.utc),
+                )
+            created = True
+        except IntegrityError:
+            created = False
+
+        self._sync()
+        with self._lock:
+            self._bloom.add(jti)
+            self._answers[jti] = True
+        return created
+
+
+denylist = Denylist()
@@ -33,11 +33,16 @@ class TokenRefreshSerializer(serializers.Serializer):
     refresh = serializers.CharField()
     
     def validate_refresh(self, value):
+        """Decode and verify the token once; the view uses the returned RefreshToken."""
         from rest_framework_simplejwt.tokens import RefreshToken
         from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
-        
+        from rest_framework_simplejwt.settings import api_settings
+        from .revocation import denylist
+
         try:
-            RefreshToken(value)
+            token = RefreshToken(value)
         except (InvalidToken, TokenError):
             raise serializers.ValidationError(_('Invalid refresh token'))
-        return value
+        if denylist.is_revoked(token[api_settings.JTI_CLAIM]):
+            raise serializers.ValidationError(_('Invalid refresh token'))
+        return token
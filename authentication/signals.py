@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.apps import apps
+
+
+def forget_cached_user_state(sender, instance, **kwargs):
+    from .authentication import forget_user_state
+    forget_user_state(instance.pk)
+
+
+def connect_signals():
+    user_model = apps.get_model(settings.AUTH_USER_MODEL)
+    post_save.connect(forget_cached_user_state, sender=user_model, dispatch_uid='jwt_user_state_save')
+    post_delete.connect(forget_cached_user_state, sender=user_model, dispatch_uid='jwt_user_state_delete')
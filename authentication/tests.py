@@ -1,8 +1,27 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.conf import settings
+from django.utils import timezone
 from django.utils.translation import activate
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+
+import io
+import threading
+import time
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from .authentication import ClaimsJWTAuthentication, forget_user_state
+from .models import RevokedToken
+from .revocation import BloomFilter, denylist
 
 User = get_user_model()
 
@@ -202,3 +221,263 @@ class LanguageActivationTestCase(TestCase):
         
         self.assertIn('حجم الصورة', msg_str)
         self.assertIn('5.50 MB', msg_str)
+
+
+class ClaimsJWTAuthenticationTestCase(APITestCase):
+    """Test that access tokens authenticate from their claims"""
+
+    def setUp(self):
+        """Set up a superuser and log in to get real tokens"""
+        forget_user_state()
+        self.client = APIClient()
+        self.user = User.objects.create_superuser(
+            username='owner',
+            email='owner@example.com',
+            password='ownerpass123'
+        )
+        response = self.client.post('/api/auth/login/', {'username': 'owner', 'password': 'ownerpass123'})
+        self.access = response.data['access']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access}')
+
+    def test_login_embeds_claims(self):
+        """Test that the access token carries the superuser flag and username"""
+        token = RefreshToken(self.client.post('/api/auth/login/', {'username': 'owner', 'password': 'ownerpass123'}).data['refresh']).access_token
+
+        self.assertTrue(token['is_superuser'])
+        self.assertEqual(token['username'], 'owner')
+        self.assertIn('pwd', token)
+
+    def test_authenticated_requests_skip_user_query(self):
+        """Test that the user row is read once per TTL, not per request"""
+        self.client.get('/api/portfolio/cache/stats/')
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/portfolio/cache/stats/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_token_verify_decodes_once(self):
+        """Test that token verification reuses DRF's authentication"""
+        with mock.patch.object(ClaimsJWTAuthentication, 'get_validated_token', wraps=ClaimsJWTAuthentication().get_validated_token) as validate:
+            response = self.client.get('/api/auth/token/verify/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(validate.call_count, 1)
+
+    def test_token_verify_rejects_missing_and_invalid_tokens(self):
+        """Test that verification fails without a valid bearer token"""
+        self.client.credentials()
+        self.assertEqual(self.client.get('/api/auth/token/verify/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer invalid.token.here')
+        self.assertEqual(self.client.get('/api/auth/token/verify/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_revokes_tokens(self):
+        """Test that tokens issued before a password change stop working"""
+        self.user.set_password('newpass456!')
+        self.user.save()
+
+        self.assertEqual(self.client.get('/api/auth/token/verify/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivation_and_demotion_revoke_tokens(self):
+        """Test that inactive or demoted users are rejected"""
+        self.user.is_superuser = False
+        self.user.save()
+        self.assertEqual(self.client.get('/api/auth/token/verify/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.user.is_superuser = True
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get('/api/auth/token/verify/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_tokens_without_claims_fall_back_to_database(self):
+        """Test that tokens issued before claims were embedded still work"""
+        legacy = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {legacy}')
+
+        response = self.client.get('/api/portfolio/cache/stats/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_me_still_returns_profile(self):
+        """Test that endpoints needing the full user still get it"""
+        response = self.client.get('/api/auth/me/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['email'], 'owner@example.com')
+
+    def test_superuser_can_create_category_with_token_user(self):
+        """Test that writes assign foreign keys from the claims user"""
+        response = self.client.post('/api/portfolio/categories/', {'name': 'Design', 'name_ar': 'تصميم'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
+class LoginThroughputTestCase(APITestCase):
+    """Test JWT-only login and bounded password hashing"""
+
+    def setUp(self):
+        """Set up a user"""
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+
+    def login(self, username='testuser', password='testpass123'):
+        """Post credentials to the login endpoint"""
+        return self.client.post('/api/auth/login/', {'username': username, 'password': password})
+
+    def test_login_does_not_create_session(self):
+        """Test that JWT-only login writes no session row"""
+        response = self.login()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(Session.objects.exists())
+
+    @override_settings(AUTH_LOGIN_CREATES_SESSION=True)
+    def test_session_login_can_be_enabled(self):
+        """Test that the session mode still logs the user in"""
+        self.login()
+
+        self.assertEqual(Session.objects.count(), 1)
+
+    def test_unknown_user_is_rejected(self):
+        """Test that a missing user gets the invalid credentials response"""
+        response = self.login(username='nobody')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_inactive_user_is_rejected(self):
+        """Test that inactive users cannot log in"""
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.login().status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_outdated_hash_is_upgraded_once(self):
+        """Test that a hash from an older hasher is replaced on successful login"""
+        self.user.password = make_password('testpass123', hasher='pbkdf2_sha1')
+        self.user.save()
+
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$'))
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+    @override_settings(AUTH_PASSWORD_HASH_TIMEOUT=0.05)
+    def test_saturated_pool_returns_503(self):
+        """Test that logins fail fast when every hashing slot is busy"""
+        release = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=1)
+        executor.submit(release.wait)
+        self.addCleanup(executor.shutdown)
+        self.addCleanup(release.set)
+
+        with mock.patch('authentication.hashing._executor', executor):
+            response = self.login()
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '1')
+
+
+class RefreshRotationTestCase(APITestCase):
+    """Test refresh token rotation, logout revocation and the denylist"""
+
+    def setUp(self):
+        """Set up a user, log in and start from an empty denylist"""
+        forget_user_state()
+        denylist.reset()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        tokens = self.client.post('/api/auth/login/', {'username': 'testuser', 'password': 'testpass123'}).data
+        self.access = tokens['access']
+        self.refresh = tokens['refresh']
+
+    def refresh_with(self, token):
+        """Call the refresh endpoint"""
+        return self.client.post('/api/auth/token/refresh/', {'refresh': token})
+
+    def test_refresh_rotates_and_old_token_is_single_use(self):
+        """Test that refreshing returns a new refresh token and revokes the old one"""
+        response = self.refresh_with(self.refresh)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('access', response.data)
+        self.assertNotEqual(response.data['refresh'], self.refresh)
+        self.assertEqual(self.refresh_with(self.refresh).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.refresh_with(response.data['refresh']).status_code, status.HTTP_200_OK)
+
+    def test_refresh_decodes_once(self):
+        """Test that the refresh token is verified a single time per request"""
+        with mock.patch('rest_framework_simplejwt.tokens.Token.verify', autospec=True, side_effect=lambda token: None) as verify:
+            self.refresh_with(self.refresh)
+
+        self.assertEqual(verify.call_count, 1)
+
+    def test_rotated_access_token_keeps_claims(self):
+        """Test that access tokens from a refresh still authenticate without a user query"""
+        access = self.refresh_with(self.refresh).data['access']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+
+        self.assertEqual(self.client.get('/api/auth/token/verify/').status_code, status.HTTP_200_OK)
+
+    def test_logout_revokes_access_and_refresh_tokens(self):
+        """Test that logout makes both tokens unusable"""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access}')
+
+        response = self.client.post('/api/auth/logout/', {'refresh': self.refresh})
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.client.get('/api/auth/token/verify/').status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.client.get('/api/auth/me/').status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.credentials()
+        self.assertEqual(self.refresh_with(self.refresh).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(RevokedToken.objects.count(), 2)
+
+    def test_unrevoked_tokens_are_checked_without_queries(self):
+        """Test that the denylist answers from memory for tokens that were never revoked"""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access}')
+        self.client.get('/api/portfolio/cache/stats/')
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get('/api/auth/token/verify/')
+
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_revocations_from_other_processes_are_synced(self):
+        """Test that rows added directly to the table are picked up on the next sync"""
+        token = RefreshToken(self.refresh)
+        self.assertFalse(denylist.is_revoked(token['jti']))
+        RevokedToken.objects.create(jti=token['jti'], token_type='refresh', expires_at=timezone.now() + timedelta(days=1))
+
+        later = time.monotonic() + settings.JWT_DENYLIST_SYNC_INTERVAL + 1
+        with mock.patch('authentication.revocation.time.monotonic', return_value=later):
+            self.assertTrue(denylist.is_revoked(token['jti']))
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        """Test that every added item is reported as present"""
+        bloom = BloomFilter(capacity=1000)
+        items = [f'jti-{i}' for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+
+        self.assertTrue(all(item in bloom for item in items))
+        false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+    def test_prune_command_removes_expired_rows(self):
+        """Test that expired revocations are deleted"""
+        RevokedToken.objects.create(jti='old', token_type='refresh', expires_at=timezone.now() - timedelta(minutes=1))
+        RevokedToken.objects.create(jti='live', token_type='refresh', expires_at=timezone.now() + timedelta(days=1))
+
+        call_command('prune_revoked_tokens', stdout=io.StringIO())
+
+        self.assertEqual(list(RevokedToken.objects.values_list('jti', flat=True)), ['live'])
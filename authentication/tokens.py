@@ -0,0 +1,23 @@
+"""Issue JWTs that carry enough claims to authenticate without a User query."""
+import hashlib
+
+from rest_framework_simplejwt.tokens import RefreshToken
+
+SUPERUSER_CLAIM = 'is_superuser'
+USERNAME_CLAIM = 'username'
+# Changes whenever the password does, so a password change revokes older tokens
+PASSWORD_CLAIM = 'pwd'
+
+
+def password_fingerprint(password_hash: str) -> str:
+    """Short digest of the stored password hash; never the hash itself."""
+    return hashlib.sha256(password_hash.encode('utf-8')).hexdigest()[:16]
+
+
+def tokens_for_user(user) -> RefreshToken:
+    """Refresh token (and, through it, access tokens) with the user's auth claims embedded."""
+    refresh = RefreshToken.for_user(user)
+    refresh[SUPERUSER_CLAIM] = user.is_superuser
+    refresh[USERNAME_CLAIM] = user.get_username()
+    refresh[PASSWORD_CLAIM] = password_fingerprint(user.password)
+    return refresh
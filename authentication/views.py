@@ -1,12 +1,18 @@
 from django.shortcuts import render
 from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
 from django.utils.translation import gettext_lazy as _
 
 from .serializers import (
     LoginSerializer, UserSerializer, TokenRefreshSerializer, PasswordChangeSerializer
 )
 from .permissions import IsAccessTokenValid
+from .authentication import UserJWTAuthentication, ensure_claims_current, has_user_claims
+from .revocation import denylist
+from .tokens import tokens_for_user
+from .hashing import PasswordHashBusy, verify_credentials
+from django.conf import settings
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -21,21 +27,30 @@ class LoginView(APIView):
         serializer = LoginSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        user = authenticate(
-            request,
-            username=serializer.validated_data['username'],
-            password=serializer.validated_data['password'],
-        )
+        try:
+            user = verify_credentials(
+                request,
+                username=serializer.validated_data['username'],
+                password=serializer.validated_data['password'],
+            )
+        except PasswordHashBusy:
+            return Response(
+                {'message': _('Too many login attempts in progress, please retry shortly')},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': '1'},
+            )
         if not user:
             return Response(
                 {'message': _('Invalid credentials')},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        login(request, user)
-        
+        # The API authenticates with JWTs only; a session is just an extra DB write
+        if settings.AUTH_LOGIN_CREATES_SESSION:
+            login(request, user)
+
         # Generate tokens
-        refresh = RefreshToken.for_user(user)
+        refresh = tokens_for_user(user)
         
         return Response({
             'user': UserSerializer(user).data,
@@ -48,11 +63,24 @@ class LogoutView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
+        """Revoke the access token used for this request and, if given, the refresh token."""
+        if request.auth is not None:
+            denylist.revoke(request.auth)
+        raw_refresh = request.data.get('refresh')
+        if raw_refresh:
+            try:
+                refresh = RefreshToken(raw_refresh)
+            except TokenError:
+                refresh = None
+            if refresh is not None and str(refresh.get(api_settings.USER_ID_CLAIM)) == str(request.user.id):
+                denylist.revoke(refresh)
         logout(request)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 class PasswordChangeView(APIView):
+    # Needs the User row, not the claims-only TokenUser
+    authentication_classes = [UserJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -75,6 +103,7 @@ class PasswordChangeView(APIView):
 
 
 class MeView(APIView):
+    authentication_classes = [UserJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
@@ -97,14 +126,29 @@ class TokenRefreshView(APIView):
     def post(self, request):
         serializer = TokenRefreshSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        
+        refresh = serializer.validated_data['refresh']
+
         try:
-            refresh = RefreshToken(serializer.validated_data['refresh'])
-            return Response({
-                'access': str(refresh.access_token),
-            }, status=status.HTTP_200_OK)
-        except (InvalidToken, TokenError) as e:
+            if has_user_claims(refresh):
+                ensure_claims_current(refresh)
+        except AuthenticationFailed:
             return Response(
                 {'detail': _('Invalid refresh token')},
                 status=status.HTTP_401_UNAUTHORIZED,
             )
+
+        data = {}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            # Revoking first makes each refresh token single-use, even when the
+            # same token is presented by two requests at once.
+            if api_settings.BLACKLIST_AFTER_ROTATION and not denylist.revoke(refresh):
+                return Response(
+                    {'detail': _('Invalid refresh token')},
+                    status=status.HTTP_401_UNAUTHORIZED,
+                )
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+        data['access'] = str(refresh.access_token)
+        return Response(data, status=status.HTTP_200_OK)
@@ -0,0 +1,216 @@
+"""
+Concurrent-connection capacity of the two deployment modes.
+
+Seeds a SQLite database, then starts real servers against it on localhost
+and drives them with an increasing number of concurrent connections:
+
+* ``gunicorn``: the current setup, ``config.wsgi`` with ``--workers=2 --threads=2``;
+* ``uvicorn``: ``config.asgi`` with ``--workers 2``, where the public GET
+  endpoints are served by the async views (portfolios/async_views.py).
+
+    python -m benchmarks.capacity --connections 4,16,64,256 --duration 10 --db-latency 2
+
+Every client opens a new connection per request, like nginx does with its
+default HTTP/1.0 upstream. The mix replays the public reads of the load test
+(``benchmarks.load``) plus image lists. Requests that fail or take longer
+than ``--timeout`` count as errors. ``--db-latency`` adds a sleep to every
+query in the servers to stand in for the network hop to Postgres, and
+``--no-cache`` turns the response cache off so each request reaches the
+database. Results are per server and connection count: throughput, latency
+percentiles and errors.
+"""
+import argparse
+import asyncio
+import atexit
+import os
+import random
+import socket
+import subprocess
+import time
+from contextlib import ExitStack
+from urllib.parse import urlencode
+
+from .common import report, setup_django, summarize
+from .load import REQUESTS
+
+DEFAULT_MIX = 'list=40,detail=25,info=15,categories=10,images=10'
+READ_REQUESTS = {kind: REQUESTS[kind] for kind in ('list', 'detail', 'info', 'categories')}
+READ_REQUESTS['images'] = lambda rng, data: ('get', f'/api/portfolio/{rng.choice(data["portfolio_ids"])}/images/', {})
+
+SERVERS = {
+    'gunicorn': ['gunicorn', 'benchmarks.capacity:wsgi_application()', '--workers=2', '--threads=2', '--log-level=warning'],
+    'uvicorn': ['uvicorn', 'benchmarks.capacity:asgi_application', '--factory', '--workers=2', '--log-level=warning', '--no-access-log'],
+}
+
+# Patches that last for the life of a server process
+server_patches = ExitStack()
+atexit.register(server_patches.close)
+
+
+def prepare_server():
+    """Per server process: local media storage and the simulated query latency."""
+    from django.db.backends.signals import connection_created
+    from .common import local_media_storage
+
+    server_patches.enter_context(local_media_storage())
+    latency = float(os.environ.get('BENCHMARK_DB_LATENCY_MS', '0')) / 1000
+    if latency:
+        def delay(execute, sql, params, many, context):
+            time.sleep(latency)
+            return execute(sql, params, many, context)
+
+        def install(connection, **kwargs):
+            connection.execute_wrappers.append(delay)
+
+        connection_created.connect(install, weak=False)
+
+
+def wsgi_application():
+    from config.wsgi import application
+
+    prepare_server()
+    return application
+
+
+def asgi_application():
+    from config.asgi import application
+
+    prepare_server()
+    return application
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(name, env):
+    port = free_port()
+    bind = ['--bind', f'127.0.0.1:{port}'] if name == 'gunicorn' else ['--host', '127.0.0.1', '--port', str(port)]
+    process = subprocess.Popen(SERVERS[name] + bind, env=env)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'{name} exited with status {process.returncode}')
+        try:
+            status, _elapsed = asyncio.run(fetch(port, '/api/portfolio/info/', {}, timeout=5))
+            if status == 200:
+                return process, port
+        except OSError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f'{name} did not start on port {port}')
+
+
+async def fetch(port, path, headers, timeout):
+    """One GET over a fresh connection; returns the status code and duration."""
+    start = time.perf_counter()
+
+    async def request():
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        try:
+            lines = [f'GET {path} HTTP/1.1', 'Host: localhost', 'Connection: close',
+                     *(f'{name}: {value}' for name, value in headers.items())]
+            writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+            await writer.drain()
+            response = await reader.read()
+        finally:
+            writer.close()
+        return int(response.split(b' ', 2)[1])
+
+    status = await asyncio.wait_for(request(), timeout)
+    return status, time.perf_counter() - start
+
+
+async def drive(port, plan, connections, duration, timeout):
+    """``connections`` clients sending requests back to back for ``duration`` seconds."""
+    durations, errors = [], 0
+    deadline = time.perf_counter() + duration
+
+    async def client(offset):
+        nonlocal errors
+        index = offset
+        while time.perf_counter() < deadline:
+            path, headers = plan[index % len(plan)]
+            index += connections
+            try:
+                status, elapsed = await fetch(port, path, headers, timeout)
+            except (OSError, asyncio.TimeoutError, IndexError, ValueError):
+                errors += 1
+                continue
+            if status == 200:
+                durations.append(elapsed)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(offset) for offset in range(connections)))
+    summary = summarize(durations, time.perf_counter() - start)
+    summary['errors'] = errors
+    return summary
+
+
+def build_plan(mix, data, seed_value, size=5000):
+    rng = random.Random(seed_value)
+    plan = []
+    for kind in rng.choices(list(mix), weights=list(mix.values()), k=size):
+        _method, path, kwargs = READ_REQUESTS[kind](rng, data)
+        query = urlencode(kwargs.get('data', {}))
+        plan.append((f'{path}?{query}' if query else path, kwargs.get('headers', {})))
+    return plan
+
+
+def parse_read_mix(value):
+    mix = {}
+    for item in value.split(','):
+        kind, _sep, weight = item.partition('=')
+        if kind.strip() not in READ_REQUESTS:
+            raise argparse.ArgumentTypeError(f'unknown request kind {kind!r}; choose from {", ".join(READ_REQUESTS)}')
+        mix[kind.strip()] = int(weight)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--connections', default='4,16,64,256', help='Comma-separated concurrent connection counts')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per server and connection count')
+    parser.add_argument('--timeout', type=float, default=10, help='Seconds before a request counts as an error')
+    parser.add_argument('--servers', default='gunicorn,uvicorn', help='Comma-separated: gunicorn, uvicorn')
+    parser.add_argument('--db-latency', type=float, default=0, help='Milliseconds added to every query in the servers')
+    parser.add_argument('--no-cache', action='store_true', help='Turn the response cache off in the servers')
+    parser.add_argument('--portfolios', type=int, default=500)
+    parser.add_argument('--images', type=int, default=4, help='Images per portfolio')
+    parser.add_argument('--mix', type=parse_read_mix, default=parse_read_mix(DEFAULT_MIX), help=f'Weights per request kind (default {DEFAULT_MIX})')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    setup_django()
+    from .load import seed
+
+    data = seed(user_count=2, portfolio_count=args.portfolios, images_per_portfolio=args.images)
+    plan = build_plan(args.mix, data, args.seed)
+
+    env = {
+        **os.environ,
+        'PYTHONPATH': os.pathsep.join(filter(None, [os.getcwd(), os.environ.get('PYTHONPATH')])),
+        'DJANGO_DEBUG': 'False',
+        'BENCHMARK_DB_LATENCY_MS': str(args.db_latency),
+        'PORTFOLIO_RESPONSE_CACHE_ENABLED': 'False' if args.no_cache else 'True',
+    }
+    results = {}
+    for name in args.servers.split(','):
+        process, port = start_server(name.strip(), env)
+        try:
+            for connections in [int(value) for value in args.connections.split(',')]:
+                results[f'{name.strip()} x{connections}'] = asyncio.run(drive(port, plan, connections, args.duration, args.timeout))
+        finally:
+            process.terminate()
+            process.wait()
+    report(results, as_json=args.json, extra_columns=['errors'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""
+Shared setup for the scripts in this package.
+
+Run them from the repository root as modules, e.g. ``python -m benchmarks.login``.
+By default they use a throwaway SQLite database; set ``BENCHMARK_DATABASE_URL``
+to an empty Postgres database to benchmark against Postgres. ``DATABASE_URL``
+is ignored. To reproduce the production CPU limit, run them in a one-off
+``web`` container, which docker-compose caps at 0.5 CPU. Skip the image
+entrypoint, which migrates the production database and starts Gunicorn, and
+leave ``BENCHMARK_DATABASE_URL`` unset so the run stays on a throwaway SQLite
+file inside the container:
+
+    docker compose run --rm --no-deps --entrypoint python web -m benchmarks.login
+"""
+import json
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from unittest import mock
+
+VARIANT_WIDTHS = (320, 640, 1280)
+
+
+def setup_django(migrate=True):
+    """
+    Configure settings for a standalone run and create the schema.
+
+    ``DATABASE_URL`` and the read replicas are always replaced, so a run inside
+    a deployed container never reaches its database. The scripts use
+    ``BENCHMARK_DATABASE_URL`` if set, otherwise a new SQLite file; child
+    processes inherit the choice through the environment.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    os.environ.setdefault('DJANGO_SECRET_KEY', 'benchmark-secret-key')
+    if not os.environ.get('BENCHMARK_DATABASE_URL'):
+        os.environ['BENCHMARK_DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='bench-'), 'db.sqlite3')
+    os.environ['DATABASE_URL'] = os.environ['BENCHMARK_DATABASE_URL']
+    os.environ['DATABASE_REPLICA_URLS'] = ''
+
+    import django
+    django.setup()
+
+    from django.test.utils import setup_test_environment
+    # Allows the 'testserver' host used by django.test.Client
+    setup_test_environment()
+    if migrate:
+        from django.core.management import call_command
+        ensure_empty_database()
+        call_command('migrate', verbosity=0, interactive=False)
+
+
+def ensure_empty_database():
+    """Exit before migrating a database that already has users or portfolios."""
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from portfolios.models import Portfolio
+
+    tables = connection.introspection.table_names()
+    for model in (get_user_model(), Portfolio):
+        if model._meta.db_table in tables and model.objects.exists():
+            raise SystemExit('Refusing to seed a database that already has users or portfolios; '
+                             'point BENCHMARK_DATABASE_URL at an empty database or leave it unset.')
+
+
+@contextmanager
+def local_media_storage():
+    """Serve and store image fields from a temporary FileSystemStorage instead of GCS."""
+    from django.core.files.storage import FileSystemStorage
+    from django.test import override_settings
+    from portfolios.models import PortfolioImage, PortfolioImageVariant, PortfolioInfo
+
+    location = tempfile.mkdtemp(prefix='bench-media-')
+    storage = FileSystemStorage(location=location, base_url='/media/')
+    with mock.patch.object(PortfolioImage._meta.get_field('image'), 'storage', storage), \
+            mock.patch.object(PortfolioImageVariant._meta.get_field('image'), 'storage', storage), \
+            mock.patch.object(PortfolioInfo._meta.get_field('background_image'), 'storage', storage), \
+            override_settings(PORTFOLIO_UPLOAD_STAGING_ROOT=os.path.join(location, 'staging')):
+        yield storage
+
+
+@contextmanager
+def create_portfolio_page(portfolio_count, image_count):
+    """
+    Create a page of portfolios with a category, images and WebP/JPEG variants.
+
+    Yields the portfolios loaded through ``with_related()``. Image URLs are
+    built with a local FileSystemStorage inside the block instead of signing
+    GCS URLs.
+    """
+    from django.contrib.auth import get_user_model
+    from portfolios.models import Category, Portfolio, PortfolioImage, PortfolioImageVariant
+
+    user, _created = get_user_model().objects.get_or_create(username='bench-portfolios')
+    category, _created = Category.objects.get_or_create(
+        user=user, name='Photography', name_ar='التصوير',
+        defaults={'description': 'Weddings, portraits and events', 'features': ['Editing', 'Prints', 'Albums']},
+    )
+    portfolios = Portfolio.objects.bulk_create([
+        Portfolio(author=user, category=category, title=f'Portfolio {i}', subtitle='Golden hour on the coast', body='Lorem ipsum ' * 80)
+        for i in range(portfolio_count)
+    ])
+    images = PortfolioImage.objects.bulk_create([
+        PortfolioImage(portfolio=portfolio, image=f'portfolios/2025/01/01/photo-{portfolio.pk}-{i}.jpg',
+                       caption='غروب الشمس على الشاطئ', width=2400, height=1600)
+        for portfolio in portfolios for i in range(image_count)
+    ])
+    PortfolioImageVariant.objects.bulk_create([
+        PortfolioImageVariant(source=image, format=variant_format, width=width, height=width * 2 // 3,
+                              image=f'portfolios/variants/2025/01/01/photo-{image.pk}-{width}.{variant_format}')
+        for image in images for variant_format in ('webp', 'jpeg') for width in VARIANT_WIDTHS
+    ])
+
+    with local_media_storage():
+        yield list(Portfolio.objects.with_related().filter(pk__in=[portfolio.pk for portfolio in portfolios]))
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted list."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(durations, elapsed):
+    """Throughput and latency percentiles (milliseconds) for one run."""
+    return {
+        'requests': len(durations),
+        'seconds': round(elapsed, 3),
+        'rps': round(len(durations) / elapsed, 2) if elapsed else None,
+        'mean_ms': round(statistics.mean(durations) * 1000, 2) if durations else None,
+        'p50_ms': round(percentile(durations, 50) * 1000, 2) if durations else None,
+        'p95_ms': round(percentile(durations, 95) * 1000, 2) if durations else None,
+        'p99_ms': round(percentile(durations, 99) * 1000, 2) if durations else None,
+    }
+
+
+def run_concurrently(func, total, concurrency):
+    """Call ``func(i)`` ``total`` times from ``concurrency`` threads and summarize the timings."""
+    def timed(i):
+        start = time.perf_counter()
+        func(i)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        durations = list(executor.map(timed, range(total)))
+    return summarize(durations, time.perf_counter() - start)
+
+
+def report(results, as_json=False, extra_columns=()):
+    """Print ``{scenario: summary}`` as a table or as JSON."""
+    if as_json:
+        print(json.dumps(results, indent=2))
+        return
+    columns = ['requests', 'rps', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', *extra_columns]
+    width = max(len(name) for name in results) + 2
+    widths = [max(10, len(column) + 2) for column in columns]
+    print(''.ljust(width) + ''.join(column.rjust(pad) for column, pad in zip(columns, widths)))
+    for name, summary in results.items():
+        print(name.ljust(width) + ''.join(str(summary.get(column, '')).rjust(pad) for column, pad in zip(columns, widths)))
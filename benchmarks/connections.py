@@ -0,0 +1,130 @@
+"""
+Request latency with and without database connection reuse.
+
+Seeds portfolios with images, then runs the same sequence of portfolio
+detail and image list requests once per connection mode. Each mode runs in
+its own process, with the settings from that mode's environment variables:
+
+* ``direct``: ``DATABASE_CONN_MAX_AGE=0``, a new connection for every request;
+* ``persistent``: ``DATABASE_CONN_MAX_AGE=60`` with health checks;
+* ``pool``: ``DATABASE_POOL_MODE=process`` (PostgreSQL only).
+
+    BENCHMARK_DATABASE_URL=postgres://... python -m benchmarks.connections --requests 500
+
+Requests go through the WSGI handler itself, not django.test.Client, so
+connections are closed at the end of each request as they are under
+Gunicorn. The response cache is off, so every request runs queries. The
+report has latency percentiles, connections opened per request and the
+mean time to get a connection (``connect_ms``). Without ``BENCHMARK_DATABASE_URL``,
+the database is SQLite, where opening a connection is almost free;
+``--connect-latency`` adds a delay to each new connection to stand in for
+the TCP/auth handshake and backend start of a remote Postgres.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from .common import local_media_storage, report, setup_django, summarize
+
+MODES = {
+    'direct': {'DATABASE_CONN_MAX_AGE': '0', 'DATABASE_POOL_MODE': 'none'},
+    'persistent': {'DATABASE_CONN_MAX_AGE': '60', 'DATABASE_CONN_HEALTH_CHECKS': 'True', 'DATABASE_POOL_MODE': 'none'},
+    'pool': {'DATABASE_CONN_MAX_AGE': '0', 'DATABASE_CONN_HEALTH_CHECKS': 'True', 'DATABASE_POOL_MODE': 'process'},
+}
+
+
+def time_connect(samples=20):
+    """Mean milliseconds to get a usable connection in the current mode."""
+    from django.db import connections
+
+    durations = []
+    for _i in range(samples):
+        connection = connections.create_connection('default')
+        start = time.perf_counter()
+        connection.ensure_connection()
+        durations.append(time.perf_counter() - start)
+        connection.close()
+    return round(sum(durations) / len(durations) * 1000, 3)
+
+
+def run_mode(paths, connect_latency):
+    """Child process: replay ``paths`` through the WSGI handler and summarize."""
+    setup_django(migrate=False)
+    from django.core.wsgi import get_wsgi_application
+    from django.db.backends.signals import connection_created
+    from django.test import RequestFactory
+
+    opened = []
+
+    def on_connect(connection, **kwargs):
+        if connect_latency:
+            time.sleep(connect_latency / 1000)
+        opened.append(connection)
+
+    connection_created.connect(on_connect, weak=False)
+    application = get_wsgi_application()
+    factory = RequestFactory()
+
+    with local_media_storage():
+        connect_ms = time_connect()
+        opened.clear()
+        durations = []
+        start = time.perf_counter()
+        for path in paths:
+            started = time.perf_counter()
+            response = application(factory.get(path).environ, lambda status, headers: None)
+            b''.join(response)
+            response.close()  # request_finished: Django closes or keeps the connection here
+            durations.append(time.perf_counter() - started)
+        elapsed = time.perf_counter() - start
+
+    summary = summarize(durations, elapsed)
+    summary['connections_per_request'] = round(len(opened) / len(paths), 3)
+    summary['connect_ms'] = connect_ms
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--portfolios', type=int, default=100)
+    parser.add_argument('--images', type=int, default=4, help='Images per portfolio')
+    parser.add_argument('--modes', help='Comma-separated: direct, persistent, pool (default: all that apply)')
+    parser.add_argument('--connect-latency', type=float, default=0, help='Milliseconds added to opening each connection')
+    parser.add_argument('--json', action='store_true')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        paths = json.loads(sys.stdin.read())
+        print(json.dumps(run_mode(paths, args.connect_latency)))
+        return
+
+    setup_django()
+    from django.db import connection
+    from .load import seed
+
+    with local_media_storage():
+        data = seed(user_count=2, portfolio_count=args.portfolios, images_per_portfolio=args.images)
+    ids = data['portfolio_ids']
+    paths = [f'/api/portfolio/{ids[i % len(ids)]}/' + ('images/' if i % 2 else '') for i in range(args.requests)]
+
+    modes = args.modes.split(',') if args.modes else [
+        mode for mode in MODES if mode != 'pool' or connection.vendor == 'postgresql'
+    ]
+    results = {}
+    for mode in modes:
+        env = {**os.environ, **MODES[mode.strip()], 'PORTFOLIO_RESPONSE_CACHE_ENABLED': 'False'}
+        child = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.connections', '--child', mode, '--connect-latency', str(args.connect_latency)],
+            input=json.dumps(paths), capture_output=True, text=True, env=env, check=True,
+        )
+        results[mode.strip()] = json.loads(child.stdout.strip().splitlines()[-1])
+    report(results, as_json=args.json, extra_columns=['connections_per_request', 'connect_ms'])
+
+
+if __name__ == '__main__':
+    main()
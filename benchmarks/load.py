@@ -0,0 +1,269 @@
+"""
+In-process load test replaying a weighted production traffic mix.
+
+Seeds a dataset (users, the photographer category fixture for each user,
+portfolios with images and srcset variants), then sends the same
+pseudo-random request sequence to the WSGI app (django.test.Client, one
+thread per concurrent client) and the ASGI app (django.test.AsyncClient,
+one task per concurrent client):
+
+    python -m benchmarks.load --requests 2000 --concurrency 8 --output results.json
+
+The mix covers portfolio list pages, portfolio detail, portfolio info, the
+category list, login and image upload. Change it with
+``--mix list=40,detail=25,...``. The report has p50/p95/p99 latency,
+requests/sec and queries per request, overall and per request kind.
+``--output`` writes JSON with the commit and parameters, for diffing
+between commits. Queries are counted by the request profiling middleware
+(monitoring app), which the harness enables with logging off.
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import time
+from collections import defaultdict
+
+from .common import local_media_storage, report, setup_django, summarize
+
+PASSWORD = 'bench-password-123'
+DEFAULT_MIX = 'list=40,detail=25,info=15,categories=10,login=6,upload=4'
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'portfolios', 'fixtures', 'categories', 'photographer.json')
+QUERIES_RE = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+def parse_mix(value):
+    mix = {}
+    for item in value.split(','):
+        kind, _sep, weight = item.partition('=')
+        if kind.strip() not in REQUESTS:
+            raise argparse.ArgumentTypeError(f'unknown request kind {kind!r}; choose from {", ".join(REQUESTS)}')
+        mix[kind.strip()] = int(weight)
+    return mix
+
+
+def seed(user_count, portfolio_count, images_per_portfolio):
+    """Bulk-create the dataset; returns the ids the request plan draws from."""
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+    from django.utils.text import slugify
+    from portfolios.models import Category, Portfolio, PortfolioImage, PortfolioImageVariant, PortfolioInfo
+
+    user_model = get_user_model()
+    password = make_password(PASSWORD)  # hashed once for every user
+    owner = user_model.objects.create_superuser(username='bench-owner', email='owner@example.com', password=PASSWORD)
+    users = [owner] + user_model.objects.bulk_create([
+        user_model(username=f'bench-user-{i}', email=f'user{i}@example.com', password=password, first_name='Bench', last_name=str(i))
+        for i in range(user_count - 1)
+    ])
+    if not PortfolioInfo.objects.exists():
+        PortfolioInfo.objects.create(user=owner)
+
+    with open(FIXTURE, encoding='utf-8') as fixture:
+        category_fields = [entry['fields'] for entry in json.load(fixture)]
+    categories = []
+    for user in users:
+        for fields in category_fields:
+            # bulk_create skips Category.save(), which fills in the slug
+            categories.append(Category(**{**fields, 'user': user}, slug=slugify(fields['name'])))
+    categories = Category.objects.bulk_create(categories)
+
+    rng = random.Random(0)
+    portfolios = Portfolio.objects.bulk_create([
+        Portfolio(author=owner, category=rng.choice(categories), title=f'Portfolio {i}',
+                  subtitle='Golden hour on the coast', body='Lorem ipsum dolor sit amet. ' * 30, is_completed=i % 3 == 0)
+        for i in range(portfolio_count)
+    ], batch_size=500)
+    images = PortfolioImage.objects.bulk_create([
+        PortfolioImage(portfolio=portfolio, image=f'portfolios/2025/01/01/photo-{portfolio.pk}-{i}.jpg',
+                       caption=f'Shot {i}', width=2400, height=1600)
+        for portfolio in portfolios for i in range(images_per_portfolio)
+    ], batch_size=500)
+    PortfolioImageVariant.objects.bulk_create([
+        PortfolioImageVariant(source=image, format=variant_format, width=width, height=width * 2 // 3,
+                              image=f'portfolios/variants/2025/01/01/photo-{image.pk}-{width}.{variant_format}')
+        for image in images for variant_format in ('webp', 'jpeg') for width in (320, 640, 1280)
+    ], batch_size=500)
+    return {
+        'owner': owner,
+        'usernames': [user.username for user in users],
+        'portfolio_ids': [portfolio.pk for portfolio in portfolios],
+        'pages': max(1, -(-portfolio_count // 10)),
+    }
+
+
+def upload_body():
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new('RGB', (800, 600), color='teal').save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+
+# Each builder returns (method, path, kwargs for the test client)
+REQUESTS = {
+    'list': lambda rng, data: ('get', '/api/portfolio/', {'data': {'page': rng.randint(1, min(data['pages'], 20))}}),
+    'detail': lambda rng, data: ('get', f'/api/portfolio/{rng.choice(data["portfolio_ids"])}/', {}),
+    'info': lambda rng, data: ('get', '/api/portfolio/info/', {'headers': {'Accept-Language': rng.choice(['en', 'ar'])}}),
+    'categories': lambda rng, data: ('get', '/api/portfolio/categories/', {}),
+    'login': lambda rng, data: ('post', '/api/auth/login/', {
+        'data': {'username': rng.choice(data['usernames']), 'password': PASSWORD},
+        'content_type': 'application/json',
+    }),
+    'upload': lambda rng, data: ('post', f'/api/portfolio/{rng.choice(data["portfolio_ids"])}/images/', {
+        'data': {'image': ('upload', data['image']), 'caption': 'Load test'},
+        'headers': {'Authorization': f'Bearer {data["access"]}'},
+    }),
+}
+
+
+def build_plan(mix, total, data, seed_value):
+    """The same request sequence for every server, so their results compare."""
+    rng = random.Random(seed_value)
+    kinds = rng.choices(list(mix), weights=list(mix.values()), k=total)
+    return [(kind, *REQUESTS[kind](rng, data)) for kind in kinds]
+
+
+def prepare(kwargs):
+    """Fresh upload file objects per request (they are consumed when sent)."""
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    data = kwargs.get('data')
+    if isinstance(data, dict) and isinstance(data.get('image'), tuple):
+        _name, body = data['image']
+        kwargs = {**kwargs, 'data': {**data, 'image': SimpleUploadedFile('upload.jpg', body, content_type='image/jpeg')}}
+    return kwargs
+
+
+def record(kind, response, duration, results):
+    match = QUERIES_RE.search(response.get('Server-Timing', ''))
+    results.append((kind, duration, int(match.group(1)) if match else None, response.status_code))
+
+
+def run_wsgi(plan, concurrency):
+    from concurrent.futures import ThreadPoolExecutor
+    from django.db import connection
+    from django.test import Client
+
+    results = []
+
+    def worker(offset):
+        client = Client()
+        try:
+            for kind, method, path, kwargs in plan[offset::concurrency]:
+                start = time.perf_counter()
+                response = getattr(client, method)(path, **prepare(kwargs))
+                record(kind, response, time.perf_counter() - start, results)
+        finally:
+            connection.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, range(concurrency)))
+    return results, time.perf_counter() - start
+
+
+def run_asgi(plan, concurrency):
+    from django.test import AsyncClient
+
+    results = []
+
+    async def worker(offset):
+        client = AsyncClient()
+        for kind, method, path, kwargs in plan[offset::concurrency]:
+            start = time.perf_counter()
+            response = await getattr(client, method)(path, **prepare(kwargs))
+            record(kind, response, time.perf_counter() - start, results)
+
+    async def main():
+        await asyncio.gather(*(worker(offset) for offset in range(concurrency)))
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    return results, time.perf_counter() - start
+
+
+def summarize_run(results, elapsed):
+    """Overall and per-kind summaries with queries per request and status counts."""
+    groups = defaultdict(list)
+    for result in results:
+        groups['all'].append(result)
+        groups[result[0]].append(result)
+    summaries = {}
+    for name, rows in groups.items():
+        summary = summarize([duration for _kind, duration, _queries, _status in rows], elapsed)
+        counted = [queries for _kind, _duration, queries, _status in rows if queries is not None]
+        summary['queries_per_request'] = round(sum(counted) / len(counted), 2) if counted else None
+        statuses = defaultdict(int)
+        for _kind, _duration, _queries, status_code in rows:
+            statuses[str(status_code)] += 1
+        summary['statuses'] = dict(sorted(statuses.items()))
+        summaries[name] = summary
+    return summaries
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--portfolios', type=int, default=2000)
+    parser.add_argument('--images', type=int, default=4, help='Images per portfolio')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=4, help='Matches 2 Gunicorn workers x 2 threads by default')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f'Weights per request kind (default {DEFAULT_MIX})')
+    parser.add_argument('--servers', default='wsgi,asgi', help='Comma-separated: wsgi, asgi')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='Write the JSON results to this file')
+    parser.add_argument('--json', action='store_true', help='Print JSON instead of a table')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from django.test import override_settings
+    from authentication.tokens import tokens_for_user
+
+    with local_media_storage(), override_settings(REQUEST_PROFILING_ENABLED=True, REQUEST_PROFILING_LOG=False):
+        data = seed(args.users, args.portfolios, args.images)
+        data['access'] = str(tokens_for_user(data['owner']).access_token)
+        data['image'] = upload_body()
+        plan = build_plan(args.mix, args.requests, data, args.seed)
+
+        runners = {'wsgi': run_wsgi, 'asgi': run_asgi}
+        results = {}
+        for server in args.servers.split(','):
+            run_results, elapsed = runners[server.strip()](plan, args.concurrency)
+            results[server.strip()] = summarize_run(run_results, elapsed)
+
+    output = {
+        'commit': git_commit(),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'database': connection.vendor,
+        'parameters': {key: value for key, value in vars(args).items() if key not in ('output', 'json')},
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(output, handle, indent=2, sort_keys=True)
+    if args.json:
+        print(json.dumps(output, indent=2, sort_keys=True))
+    else:
+        report(
+            {f'{server} {kind}': summary for server, kinds in results.items() for kind, summary in kinds.items()},
+            extra_columns=['queries_per_request'],
+        )
+
+
+if __name__ == '__main__':
+    main()
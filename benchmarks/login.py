@@ -0,0 +1,84 @@
+"""
+Login throughput, and read latency while a login burst is running.
+
+Compares the previous behaviour (session written on login, hashing on every
+request thread) with JWT-only login plus the bounded hashing pool:
+
+    python -m benchmarks.login --requests 100 --concurrency 4 [--json]
+
+The bench0-bench9 users it logs in as are created in the benchmark's own
+database (see common.py), never in the one ``DATABASE_URL`` points at.
+"""
+import argparse
+import threading
+import time
+
+from .common import report, run_concurrently, setup_django, summarize
+
+PASSWORD = 'bench-password-123'
+
+
+def scenario(name, total, concurrency, **overrides):
+    from django.test import Client, override_settings
+    from authentication import hashing
+
+    hashing._executor = None  # re-created with the overridden worker count
+    with override_settings(**overrides):
+        stop = threading.Event()
+        read_durations = []
+
+        def read_loop():
+            client = Client()
+            while not stop.is_set():
+                start = time.perf_counter()
+                client.get('/api/portfolio/info/')
+                read_durations.append(time.perf_counter() - start)
+
+        reader = threading.Thread(target=read_loop)
+        reader.start()
+
+        def login(i):
+            response = Client().post('/api/auth/login/', {'username': f'bench{i % 10}', 'password': PASSWORD})
+            assert response.status_code == 200, response.content
+
+        try:
+            result = run_concurrently(login, total, concurrency)
+        finally:
+            stop.set()
+            reader.join()
+
+    reads = summarize(read_durations, result['seconds'])
+    return {
+        f'{name}: login': result,
+        f'{name}: reads during burst': reads,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=4, help='Matches 2 Gunicorn workers x 2 threads by default')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    user_model = get_user_model()
+    # setup_django() only migrates a database without users, so these are new
+    for i in range(10):
+        user_model.objects.create_user(username=f'bench{i}', password=PASSWORD)
+
+    results = {}
+    results.update(scenario(
+        'before', args.requests, args.concurrency,
+        AUTH_LOGIN_CREATES_SESSION=True, AUTH_PASSWORD_HASH_WORKERS=args.concurrency,
+    ))
+    results.update(scenario(
+        'after', args.requests, args.concurrency,
+        AUTH_LOGIN_CREATES_SESSION=False, AUTH_PASSWORD_HASH_WORKERS=1,
+    ))
+    report(results, as_json=args.json)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+JSON rendering time for a page of portfolios, DRF's stdlib renderer vs FastJSONRenderer.
+
+The payload is one serialized list page: portfolios with a nested category
+and images that each carry a WebP and JPEG srcset. Serialization runs once;
+only rendering is timed.
+
+    python -m benchmarks.renderers --portfolios 10 --images 12 --iterations 500 [--json]
+
+Without orjson installed both rows measure the stdlib path.
+"""
+import argparse
+import time
+
+from .common import create_portfolio_page, report, setup_django, summarize
+
+
+def time_renderer(renderer, payload, iterations):
+    durations = []
+    start = time.perf_counter()
+    for _i in range(iterations):
+        started = time.perf_counter()
+        renderer.render(payload)
+        durations.append(time.perf_counter() - started)
+    return summarize(durations, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--portfolios', type=int, default=10, help='Portfolios per page (PAGE_SIZE is 10)')
+    parser.add_argument('--images', type=int, default=12, help='Images per portfolio')
+    parser.add_argument('--iterations', type=int, default=500)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+    from config.renderers import FastJSONRenderer, orjson
+    from portfolios.serializers import PortfolioSerializer
+
+    with create_portfolio_page(args.portfolios, args.images) as portfolios:
+        payload = {'count': len(portfolios), 'next': None, 'previous': None,
+                   'results': PortfolioSerializer(portfolios, many=True).data}
+
+    stdlib = JSONRenderer()
+    fast = FastJSONRenderer()
+    assert fast.render(payload) == stdlib.render(payload), 'renderers disagree'
+    if not args.json:
+        print(f'payload: {len(stdlib.render(payload))} bytes, orjson {"installed" if orjson else "not installed"}')
+    report({
+        'stdlib json': time_renderer(stdlib, payload, args.iterations),
+        'FastJSONRenderer': time_renderer(fast, payload, args.iterations),
+    }, as_json=args.json)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Serialization time for a page of portfolios, with and without field plans.
+
+Instances are loaded once with ``with_related()``. The benchmark times only
+``PortfolioSerializer(many=True).data`` (nested category, images and
+srcsets), with ``PORTFOLIO_FIELD_PLANS`` off (plain DRF) and then on:
+
+    python -m benchmarks.serializers --portfolios 10 --images 12 --iterations 200 [--json]
+"""
+import argparse
+import time
+
+from .common import create_portfolio_page, report, setup_django, summarize
+
+
+def time_serializer(portfolios, request, iterations, field_plans):
+    from django.test import override_settings
+    from portfolios.serializers import PortfolioSerializer
+
+    durations = []
+    with override_settings(PORTFOLIO_FIELD_PLANS=field_plans):
+        start = time.perf_counter()
+        for _i in range(iterations):
+            started = time.perf_counter()
+            PortfolioSerializer(portfolios, many=True, context={'request': request}).data
+            durations.append(time.perf_counter() - started)
+        elapsed = time.perf_counter() - start
+    return summarize(durations, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--portfolios', type=int, default=10, help='Portfolios per page (PAGE_SIZE is 10)')
+    parser.add_argument('--images', type=int, default=12, help='Images per portfolio')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    request = Request(APIRequestFactory().get('/api/portfolio/'))
+    with create_portfolio_page(args.portfolios, args.images) as portfolios:
+        report({
+            'DRF fields': time_serializer(portfolios, request, args.iterations, field_plans=False),
+            'field plans': time_serializer(portfolios, request, args.iterations, field_plans=True),
+        }, as_json=args.json)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,4 +2,9 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# Serve the public read endpoints with the native async views (portfolios/async_views.py)
+os.environ.setdefault('PORTFOLIO_ASYNC_VIEWS', 'True')
+# Requests run their queries in short-lived threads; persistent per-thread
+# connections would pile up (use DATABASE_POOL_MODE=process to reuse them)
+os.environ.setdefault('DATABASE_CONN_MAX_AGE', '0')
 application = get_asgi_application()
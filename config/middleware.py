@@ -0,0 +1,116 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from rest_framework.permissions import SAFE_METHODS
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .routers import replica_reads
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise middleware that keeps the middleware chain async under ASGI.
+
+    WhiteNoise 6.7 is sync-only. Under ASGI, Django would then run it in the
+    shared sync thread and call everything below it (including async views)
+    through ``async_to_sync`` from that thread, which serializes requests.
+    Here only static file lookups and responses go through a thread; every
+    other request is awaited directly. Under WSGI it is plain WhiteNoise.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+PRIMARY_COOKIE = 'read_primary'
+PRIMARY_COOKIE_SALT = 'config.middleware.ReplicaRoutingMiddleware'
+
+
+def has_superuser_claim(request) -> bool:
+    """Whether the request carries a valid access token with the superuser claim."""
+    from authentication.tokens import SUPERUSER_CLAIM
+    from rest_framework_simplejwt.exceptions import TokenError
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    scheme, _sep, raw_token = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+    if scheme != 'Bearer' or not raw_token:
+        return False
+    try:
+        return bool(AccessToken(raw_token.strip()).get(SUPERUSER_CLAIM))
+    except TokenError:
+        return False
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Let safe requests read from the read replicas (see config/routers.py).
+
+    A request stays on the primary when it is unsafe, when it has the
+    ``read_primary`` cookie (set for ``DATABASE_REPLICA_LAG`` seconds after a
+    successful write), or when its access token has the superuser claim. The
+    claim covers API clients that do not send cookies, so the portfolio owner
+    always reads their own writes. Not installed without replicas.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token = replica_reads.set(self.reads_from_replica(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            replica_reads.reset(token)
+        return self.pin_after_write(request, response)
+
+    async def __acall__(self, request):
+        token = replica_reads.set(self.reads_from_replica(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            replica_reads.reset(token)
+        return self.pin_after_write(request, response)
+
+    def reads_from_replica(self, request) -> bool:
+        if request.method not in SAFE_METHODS:
+            return False
+        if request.get_signed_cookie(PRIMARY_COOKIE, default=None, salt=PRIMARY_COOKIE_SALT,
+                                     max_age=settings.DATABASE_REPLICA_LAG):
+            return False
+        return not has_superuser_claim(request)
+
+    def pin_after_write(self, request, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_signed_cookie(
+                PRIMARY_COOKIE, '1', salt=PRIMARY_COOKIE_SALT, max_age=settings.DATABASE_REPLICA_LAG,
+                secure=request.is_secure(), httponly=True, samesite='Lax',
+            )
+        return response
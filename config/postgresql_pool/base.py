@@ -0,0 +1,210 @@
+"""
+PostgreSQL backend that keeps a per-process pool of open connections.
+
+Django 4.2 has no connection pool for psycopg2 (one arrived in 5.1 with
+psycopg 3). With this engine, closing a connection returns it to the pool,
+and the next ``connect()`` takes an idle connection instead of opening a new
+one. Django closes connections at the end of every request when
+``CONN_MAX_AGE`` is 0. Connections move between threads but are used by one
+thread at a time. This also works under ASGI, where each request runs its
+queries in a new thread and per-thread persistent connections would pile up.
+
+Only the end-of-request close (``close_if_unusable_or_obsolete``, run on
+``request_started``/``request_finished``) hands a connection back. An
+explicit ``close()`` really closes it and drains the idle connections of
+every pool for the alias, so management commands and test database setup and teardown (which
+close, rename and drop databases) leave nothing open behind. Pools are keyed
+on the connection parameters, so a connection is never reused for another
+database or user.
+
+Configured by the ``POOL`` entry of the database settings: ``MAX_SIZE``
+(open connections per process), ``TIMEOUT`` (seconds to wait for a free one)
+and ``MAX_LIFETIME`` (seconds before a connection is replaced). With
+``CONN_HEALTH_CHECKS``, a reused connection is checked with ``SELECT 1``
+before it is handed out.
+"""
+import os
+import threading
+import time
+
+from django.db.backends.postgresql import base
+from psycopg2 import OperationalError, extensions
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PoolTimeout(OperationalError):
+    """No connection became free in time (raised as django.db.OperationalError)."""
+
+
+class ConnectionPool:
+    """Bounded LIFO pool of DB-API connections."""
+
+    def __init__(self, max_size=10, timeout=10.0, max_lifetime=3600.0):
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._idle = []
+        self._opened_at = {}
+
+    def acquire(self, connect, check=None):
+        """
+        Take an idle connection, or open one with ``connect()``.
+
+        ``check(connection)`` runs on reused connections; if it raises, the
+        connection is discarded and the next one is tried.
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeout(f'No database connection became free within {self.timeout}s')
+        try:
+            while True:
+                with self._lock:
+                    connection = self._idle.pop() if self._idle else None
+                if connection is None:
+                    connection = connect()
+                    self._opened_at[id(connection)] = time.monotonic()
+                    return connection
+                try:
+                    if check is not None:
+                        check(connection)
+                    return connection
+                except Exception:
+                    self.discard(connection)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, connection, reset=None):
+        """Return a connection; it is closed instead if it is too old or ``reset(connection)`` raises."""
+        try:
+            opened_at = self._opened_at.get(id(connection), 0)
+            keep = not connection.closed and time.monotonic() - opened_at < self.max_lifetime
+            if keep and reset is not None:
+                try:
+                    reset(connection)
+                except Exception:
+                    keep = False
+            if keep:
+                with self._lock:
+                    self._idle.append(connection)
+            else:
+                self.discard(connection)
+        finally:
+            self._slots.release()
+
+    def close(self, connection):
+        """Close a checked-out connection for good."""
+        try:
+            self.discard(connection)
+        finally:
+            self._slots.release()
+
+    def drain(self):
+        """Close every idle connection; checked-out ones are kept until released."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            self.discard(connection)
+
+    def discard(self, connection):
+        self._opened_at.pop(id(connection), None)
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    @property
+    def idle_count(self) -> int:
+        with self._lock:
+            return len(self._idle)
+
+
+def get_pool(alias, options, conn_params) -> ConnectionPool:
+    """
+    The pool for ``alias`` and ``conn_params`` in this process.
+
+    Workers forked with a preloaded app get their own pools, and a change of
+    database name or credentials gets a new one.
+    """
+    key = (alias, os.getpid(), tuple(sorted((name, repr(value)) for name, value in conn_params.items())))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(
+                max_size=options.get('MAX_SIZE', 10),
+                timeout=options.get('TIMEOUT', 10.0),
+                max_lifetime=options.get('MAX_LIFETIME', 3600.0),
+            )
+        return pool
+
+
+def drain_pools(alias):
+    """Close the idle connections of every pool for ``alias`` in this process."""
+    pid = os.getpid()
+    with _pools_lock:
+        pools = [pool for (pool_alias, pool_pid, _params), pool in _pools.items() if (pool_alias, pool_pid) == (alias, pid)]
+    for pool in pools:
+        pool.drain()
+
+
+def check_connection(connection):
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+
+
+def reset_connection(connection):
+    """Roll back whatever the last user left open."""
+    status = connection.get_transaction_status()
+    if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+        raise OperationalError('connection is in an unknown state')
+    if status != extensions.TRANSACTION_STATUS_IDLE:
+        connection.rollback()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # The pool the current connection came from
+        self.pool = None
+        self._return_to_pool = False
+
+    def get_new_connection(self, conn_params):
+        open_connection = super().get_new_connection
+        check = check_connection if self.settings_dict['CONN_HEALTH_CHECKS'] else None
+        pool = get_pool(self.alias, self.settings_dict.get('POOL', {}), conn_params)
+        connection = pool.acquire(lambda: open_connection(conn_params), check)
+        self.pool = pool
+        # get_new_connection() sets this when it opens a connection; reused ones
+        # were opened with the same OPTIONS
+        self.isolation_level = base.IsolationLevel(
+            self.settings_dict['OPTIONS'].get('isolation_level', base.IsolationLevel.READ_COMMITTED)
+        )
+        return connection
+
+    def close_if_unusable_or_obsolete(self):
+        # The end-of-request close: hand the connection back instead of closing it
+        self._return_to_pool = True
+        try:
+            super().close_if_unusable_or_obsolete()
+        finally:
+            self._return_to_pool = False
+
+    def close(self):
+        super().close()
+        if not self._return_to_pool:
+            # Also connections other threads handed back, and those to a
+            # database this alias pointed at before (test database setup)
+            drain_pools(self.alias)
+
+    def _close(self):
+        if self.connection is None:
+            return
+        pool, self.pool = self.pool, None
+        with self.wrap_database_errors:
+            if self._return_to_pool:
+                pool.release(self.connection, reset_connection)
+            else:
+                pool.close(self.connection)
@@ -0,0 +1,68 @@
+"""
+JSON renderer and parser that use orjson when it is installed.
+
+Output is the same as rest_framework's JSONRenderer: compact separators,
+non-ASCII kept as UTF-8 and U+2028/U+2029 escaped so the body stays valid
+JavaScript. Values orjson does not encode natively (lazy translations,
+Decimal, datetimes, querysets, ...) are handed to DRF's own encoder, so they
+come out exactly as before. Both classes defer to DRF when orjson is missing,
+when a client asks for indented output, or when the UNICODE_JSON,
+COMPACT_JSON or STRICT_JSON API settings are off.
+
+The one known difference: orjson writes NaN and Infinity as ``null``
+where DRF raises.
+"""
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Datetimes go through DRF's encoder ('Z' suffix for UTC); int and other
+# non-str dict keys are stringified like the stdlib does.
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
+class FastJSONRenderer(JSONRenderer):
+    """Drop-in JSONRenderer; the encoder is chosen per call."""
+
+    def uses_orjson(self, accepted_media_type, renderer_context) -> bool:
+        return (
+            orjson is not None
+            and not self.ensure_ascii
+            and self.compact
+            and self.strict
+            and self.get_indent(accepted_media_type, renderer_context) is None
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if not self.uses_orjson(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # Integers over 64 bits, unsupported dict keys, or an object the
+            # encoder rejects: the stdlib path handles or reports them as before.
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class FastJSONParser(JSONParser):
+    """Drop-in JSONParser for UTF-8 request bodies."""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding') or 'utf-8'
+        if orjson is None or not self.strict or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            # orjson rejects NaN/Infinity, as STRICT_JSON requires
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,50 @@
+"""
+Database router that sends public reads to the read replicas.
+
+Replicas are the ``replica_<n>`` aliases built from ``DATABASE_REPLICA_URLS``
+(see settings.py). Only reads of models in ``DATABASE_REPLICA_APPS`` move, and
+only while ``replica_reads`` is set. ``ReplicaRoutingMiddleware``
+(config/middleware.py) sets it for safe requests that are not pinned to the
+primary. Everything else reads from ``default``: writes, the reads of
+unsafe requests, management commands and the job worker. This way no code
+path reads its own write back from a replica that has not caught up.
+"""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Set per request; async views run their queries in threads with a copy of the context
+replica_reads = ContextVar('replica_reads', default=False)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label not in settings.DATABASE_REPLICA_APPS:
+            return None
+        if not (replica_reads.get() and settings.DATABASE_REPLICAS):
+            # Explicit, so related lookups on an instance read from a replica
+            # do not follow it there
+            return DEFAULT_DB_ALIAS
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db in settings.DATABASE_REPLICAS:
+            return instance._state.db
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        # Never the alias an instance was loaded from
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from the primary
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
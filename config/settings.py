@@ -4,7 +4,6 @@ from pathlib import Path
 from datetime import timedelta
 import dj_database_url
 from corsheaders.defaults import default_headers, default_methods
-from google.oauth2 import service_account
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 load_dotenv(os.path.join(BASE_DIR, 'environments', '.env'))
@@ -56,14 +55,21 @@ INSTALLED_APPS = [
     'users',
     'authentication',
     'portfolios',
+    'jobs',
+    'monitoring',
 ]
 
 MIDDLEWARE = [
+    # Outermost so it times the whole stack; removed at startup unless REQUEST_PROFILING_ENABLED
+    'monitoring.middleware.RequestProfilingMiddleware',
+    # Lets safe requests read from the replicas; removed at startup without DATABASE_REPLICA_URLS
+    'config.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     'corsheaders.middleware.CorsMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware', 
+    # WhiteNoise that stays async under ASGI (see config/middleware.py)
+    'config.middleware.AsyncWhiteNoiseMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -100,10 +106,51 @@ elif CURRENT_ENV == 'test':
 else:
     LOCAL_SETUP_DATABASE = os.getenv('LOCAL_DATABASE_URL')
 
+# Seconds a connection is kept open for the next request of the same thread (0 closes it after each
+# request). config/asgi.py sets 0: under ASGI each request runs in a new thread, so use the pool instead.
+DATABASE_CONN_MAX_AGE = int(os.environ.get('DATABASE_CONN_MAX_AGE', os.getenv('DATABASE_CONN_MAX_AGE', '60')))
+DATABASE_CONN_HEALTH_CHECKS = os.environ.get('DATABASE_CONN_HEALTH_CHECKS', os.getenv('DATABASE_CONN_HEALTH_CHECKS', 'True')) == 'True'
+# PostgreSQL only: 'none', 'process' (per-process pool, config/postgresql_pool) or
+# 'pgbouncer' (DATABASE_URL points at PgBouncer in transaction pooling mode)
+DATABASE_POOL_MODE = os.environ.get('DATABASE_POOL_MODE', os.getenv('DATABASE_POOL_MODE', 'none'))
+
+# Read replicas: comma-separated URLs, configured as the aliases replica_1, replica_2, ...
+# Safe requests read the DATABASE_REPLICA_APPS models from them (config/routers.py)
+DATABASE_REPLICA_URLS = [url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', os.getenv('DATABASE_REPLICA_URLS', '')).split(',') if url.strip()]
+DATABASE_REPLICA_APPS = [app.strip() for app in os.environ.get('DATABASE_REPLICA_APPS', os.getenv('DATABASE_REPLICA_APPS', 'portfolios,users')).split(',')]
+# Seconds a client reads from the primary after a write, and responses built right after any
+# write stay out of the response cache; should exceed the replication lag
+DATABASE_REPLICA_LAG = int(os.environ.get('DATABASE_REPLICA_LAG', os.getenv('DATABASE_REPLICA_LAG', '5')))
+
 DATABASES = {
-    'default': dj_database_url.config(default=os.environ.get('DATABASE_URL', LOCAL_SETUP_DATABASE))
+    'default': dj_database_url.config(default=os.environ.get('DATABASE_URL', LOCAL_SETUP_DATABASE), conn_max_age=DATABASE_CONN_MAX_AGE)
 }
-
+for index, url in enumerate(DATABASE_REPLICA_URLS, start=1):
+    DATABASES[f'replica_{index}'] = dj_database_url.parse(url, conn_max_age=DATABASE_CONN_MAX_AGE)
+    # Tests read the replicas from the test database
+    DATABASES[f'replica_{index}']['TEST'] = {'MIRROR': 'default'}
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['config.routers.ReplicaRouter'] if DATABASE_REPLICAS else []
+
+for database in DATABASES.values():
+    database['CONN_HEALTH_CHECKS'] = DATABASE_CONN_HEALTH_CHECKS
+    if not database.get('ENGINE', '').startswith('django.db.backends.postgresql'):
+        continue
+    if DATABASE_POOL_MODE == 'process':
+        database.update({
+            'ENGINE': 'config.postgresql_pool',
+            # Every request hands its connection back to the pool when it finishes
+            'CONN_MAX_AGE': 0,
+            'POOL': {
+                'MAX_SIZE': int(os.environ.get('DATABASE_POOL_MAX_SIZE', os.getenv('DATABASE_POOL_MAX_SIZE', '10'))),
+                'TIMEOUT': float(os.environ.get('DATABASE_POOL_TIMEOUT', os.getenv('DATABASE_POOL_TIMEOUT', '10'))),
+                'MAX_LIFETIME': float(os.environ.get('DATABASE_POOL_MAX_LIFETIME', os.getenv('DATABASE_POOL_MAX_LIFETIME', '3600'))),
+            },
+        })
+    elif DATABASE_POOL_MODE == 'pgbouncer':
+        # Consecutive transactions may run on different server connections,
+        # so named cursors (iterator() on PostgreSQL) would not survive
+        database['DISABLE_SERVER_SIDE_CURSORS'] = True
 
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
@@ -152,7 +199,18 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+    # Image fields (portfolios.storage.MediaStorage); the backend is imported on first use
+    'media': {
+        'BACKEND': os.environ.get('PORTFOLIO_MEDIA_STORAGE_BACKEND', os.getenv('PORTFOLIO_MEDIA_STORAGE_BACKEND', 'portfolios.gcloud.GoogleCloudMediaStorage')),
+    },
+}
+PORTFOLIO_MEDIA_STORAGE_ALIAS = os.environ.get('PORTFOLIO_MEDIA_STORAGE_ALIAS', os.getenv('PORTFOLIO_MEDIA_STORAGE_ALIAS', 'media'))
+# Service account key as JSON; turned into credentials by portfolios/gcloud.py when the
+# storage is first used (without it, GCS uses the default credentials of the environment)
+GCS_SERVICE_ACCOUNT_JSON = os.environ.get('GCS_SERVICE_ACCOUNT_JSON', os.getenv('GCS_SERVICE_ACCOUNT_JSON', None))
 
 # Google Cloud Storage Configuration (for media files)
 if CURRENT_ENV == 'prod' or os.environ.get('USE_GCS', os.getenv('USE_GCS', 'False')) == 'True':
@@ -161,22 +219,9 @@ if CURRENT_ENV == 'prod' or os.environ.get('USE_GCS', os.getenv('USE_GCS', 'Fals
     GCS_REGION = os.environ.get('GCS_REGION', os.getenv('GCS_REGION', 'europe-west1'))
     GS_LOCATION = 'media'
     GS_DEFAULT_ACL = 'public-read'
-    
-    # Load GCS credentials from environment
-    gcs_credentials_json = os.environ.get('GCS_SERVICE_ACCOUNT_JSON', os.getenv('GCS_SERVICE_ACCOUNT_JSON', None))
-    
-    if gcs_credentials_json:
-        import json
-        try:
-            GS_CREDENTIALS = service_account.Credentials.from_service_account_info(
-                json.loads(gcs_credentials_json)
-            )
-        except Exception as e:
-            print(f"Warning: Failed to load GCS credentials from JSON env var: {e}")
-    else:
-            print(f"Warning: Failed to load GCS credentials from JSON env var: {e}")
-    
-    DEFAULT_FILE_STORAGE = 'storages.backends.gcloud.GoogleCloudStorage'
+
+    STORAGES['default'] = {'BACKEND': 'portfolios.gcloud.GoogleCloudMediaStorage'}
+    PORTFOLIO_DIRECT_UPLOAD_BACKEND = 'portfolios.direct_upload.GCSDirectUploadBackend'
     MEDIA_URL = f'https://storage.googleapis.com/{GS_BUCKET_NAME}/media/'
     
     # Prevent django-storages from compressing media files
@@ -186,15 +231,76 @@ else:
     # Local storage for development
     MEDIA_URL = '/media/'
     MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+    PORTFOLIO_DIRECT_UPLOAD_BACKEND = 'portfolios.direct_upload.LocalDirectUploadBackend'
+
+# Responsive variants generated for every PortfolioImage upload
+PORTFOLIO_IMAGE_VARIANT_WIDTHS = [320, 640, 1280, 2048]
+PORTFOLIO_IMAGE_VARIANT_FORMATS = ['webp', 'jpeg']
+
+# Uploads are staged on local disk and moved to media storage by the job worker.
+# The staging directory must be shared between the web and worker containers, and kept
+# out of media/, which nginx serves publicly (staged files still carry their EXIF data).
+PORTFOLIO_UPLOAD_STAGING_ROOT = os.environ.get('PORTFOLIO_UPLOAD_STAGING_ROOT', os.getenv('PORTFOLIO_UPLOAD_STAGING_ROOT', os.path.join(BASE_DIR, 'var', 'staging')))
+
+# Batch uploads (POST /api/portfolio/<id>/images/batch/); keep in line with the nginx body limit
+# for that location. Larger sets go through the direct-upload flow instead.
+PORTFOLIO_BATCH_UPLOAD_MAX_FILES = int(os.environ.get('PORTFOLIO_BATCH_UPLOAD_MAX_FILES', os.getenv('PORTFOLIO_BATCH_UPLOAD_MAX_FILES', '10')))
+PORTFOLIO_UPLOAD_MAX_WORKERS = int(os.environ.get('PORTFOLIO_UPLOAD_MAX_WORKERS', os.getenv('PORTFOLIO_UPLOAD_MAX_WORKERS', '4')))
+# Django rejects multipart requests with more files than this before the view runs
+DATA_UPLOAD_MAX_NUMBER_FILES = PORTFOLIO_BATCH_UPLOAD_MAX_FILES
+
+# Direct-to-storage uploads (upload-url + complete endpoints)
+PORTFOLIO_DIRECT_UPLOAD_EXPIRY = 900  # seconds a signed upload URL stays valid
+PORTFOLIO_DIRECT_UPLOAD_MAX_SIZE = 5 * 1024 * 1024
+
+# Background jobs (python manage.py run_jobs)
+JOBS_RUN_EAGERLY = os.environ.get('JOBS_RUN_EAGERLY', os.getenv('JOBS_RUN_EAGERLY', 'False')) == 'True'
+JOBS_MAX_ATTEMPTS = 3
+JOBS_RETRY_BACKOFF = 10  # seconds, doubled on each retry
+JOBS_LOCK_TIMEOUT = 600  # seconds before a job claimed by a dead worker is retried
+
+# Cache Configuration
+# Local memory is per process; with several Gunicorn workers point
+# DJANGO_CACHE_BACKEND at a shared backend so invalidation reaches every worker.
+# docker-compose runs Redis for this (see environments/.env.prod.example):
+#   django.core.cache.backends.redis.RedisCache          + redis://redis:6379/1
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('DJANGO_CACHE_BACKEND', os.getenv('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache')),
+        'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', os.getenv('DJANGO_CACHE_LOCATION', '')),
+    }
+}
+
+PORTFOLIO_CACHE_ALIAS = 'default'
+PORTFOLIO_RESPONSE_CACHE_ENABLED = os.environ.get('PORTFOLIO_RESPONSE_CACHE_ENABLED', os.getenv('PORTFOLIO_RESPONSE_CACHE_ENABLED', 'True')) == 'True'
+PORTFOLIO_RESPONSE_CACHE_TIMEOUT = int(os.environ.get('PORTFOLIO_RESPONSE_CACHE_TIMEOUT', os.getenv('PORTFOLIO_RESPONSE_CACHE_TIMEOUT', '300')))
+# Compiled field plans for portfolio serializers (portfolios/representations.py)
+PORTFOLIO_FIELD_PLANS = os.environ.get('PORTFOLIO_FIELD_PLANS', os.getenv('PORTFOLIO_FIELD_PLANS', 'True')) == 'True'
+# Serve the public GET endpoints with the native async views (portfolios/async_views.py).
+# config/asgi.py turns this on; keep it off under WSGI, where async views run via async_to_sync.
+PORTFOLIO_ASYNC_VIEWS = os.environ.get('PORTFOLIO_ASYNC_VIEWS', os.getenv('PORTFOLIO_ASYNC_VIEWS', 'False')) == 'True'
+# The portfolio info document is rebuilt on save in a shared cache (never stored in locmem,
+# where other workers would miss the rebuild); the timeout only frees unused entries
+PORTFOLIO_INFO_DOCUMENT_TIMEOUT = int(os.environ.get('PORTFOLIO_INFO_DOCUMENT_TIMEOUT', os.getenv('PORTFOLIO_INFO_DOCUMENT_TIMEOUT', '3600')))
 
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'authentication.authentication.ClaimsJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.AllowAny',
     ),
+    # orjson-backed when installed, stdlib json otherwise (see config/renderers.py)
+    'DEFAULT_RENDERER_CLASSES': (
+        'config.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'config.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
 }
@@ -203,8 +309,9 @@ REST_FRAMEWORK = {
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
-    'ROTATE_REFRESH_TOKENS': False,
-    'BLACKLIST_AFTER_ROTATION': False,
+    'ROTATE_REFRESH_TOKENS': True,
+    # Rotated-out refresh tokens go to authentication.RevokedToken (see authentication/revocation.py)
+    'BLACKLIST_AFTER_ROTATION': True,
     'UPDATE_LAST_LOGIN': False,
 
     'ALGORITHM': 'HS256',
@@ -222,11 +329,26 @@ SIMPLE_JWT = {
     'USER_AUTHENTICATION_RULE': 'rest_framework_simplejwt.authentication.default_user_authentication_rule',
 
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
-    'TOKEN_USER_CLASS': 'rest_framework.authtoken.models.Token',
+    'TOKEN_USER_CLASS': 'rest_framework_simplejwt.models.TokenUser',
 
     'JTI_CLAIM': 'jti',
 }
 
+# Login: the API is JWT-only, so by default no session row is written on login.
+AUTH_LOGIN_CREATES_SESSION = os.environ.get('AUTH_LOGIN_CREATES_SESSION', os.getenv('AUTH_LOGIN_CREATES_SESSION', 'False')) == 'True'
+# Concurrent PBKDF2 verifications per process, and how long a login waits for a slot
+AUTH_PASSWORD_HASH_WORKERS = int(os.environ.get('AUTH_PASSWORD_HASH_WORKERS', os.getenv('AUTH_PASSWORD_HASH_WORKERS', '1')))
+AUTH_PASSWORD_HASH_TIMEOUT = 5  # seconds
+
+# ClaimsJWTAuthentication re-reads is_active/is_superuser/password at most this often per user
+JWT_USER_STATE_TTL = int(os.environ.get('JWT_USER_STATE_TTL', os.getenv('JWT_USER_STATE_TTL', '30')))
+JWT_USER_STATE_CACHE_SIZE = 1024
+
+# Revoked-token denylist: per-process bloom filter + LRU in front of authentication.RevokedToken
+JWT_DENYLIST_CAPACITY = 100000  # bloom filter size before it is rebuilt larger
+JWT_DENYLIST_LRU_SIZE = 4096
+JWT_DENYLIST_SYNC_INTERVAL = int(os.environ.get('JWT_DENYLIST_SYNC_INTERVAL', os.getenv('JWT_DENYLIST_SYNC_INTERVAL', '5')))  # seconds
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -239,4 +361,19 @@ LOGGING = {
         "handlers": ["console"],
         "level": "ERROR",
     },
-}
\ No newline at end of file
+    "loggers": {
+        # One JSON line per request while request profiling is enabled
+        "monitoring.requests": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
+}
+
+# Request profiling (monitoring app): Server-Timing headers, JSON log lines and
+# a per-view summary at /api/monitoring/requests/. Off by default.
+REQUEST_PROFILING_ENABLED = os.environ.get('REQUEST_PROFILING_ENABLED', os.getenv('REQUEST_PROFILING_ENABLED', 'False')) == 'True'
+REQUEST_PROFILING_LOG = os.environ.get('REQUEST_PROFILING_LOG', os.getenv('REQUEST_PROFILING_LOG', 'True')) == 'True'
+# Recent requests per view kept for the p50/p95 in the summary
+REQUEST_PROFILING_WINDOW = int(os.environ.get('REQUEST_PROFILING_WINDOW', os.getenv('REQUEST_PROFILING_WINDOW', '1000')))
\ No newline at end of file
@@ -0,0 +1,314 @@
+import os
+import re
+import subprocess
+import sys
+import time
+import uuid
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection, router
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from authentication.tokens import tokens_for_user
+from jobs.models import Job
+from portfolios.models import Portfolio
+
+from .middleware import PRIMARY_COOKIE, ReplicaRoutingMiddleware
+from .postgresql_pool.base import ConnectionPool, DatabaseWrapper, PoolTimeout
+from .routers import ReplicaRouter, replica_reads
+
+
+class FakeConnection:
+    """Stand-in for a psycopg2 connection"""
+
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTestCase(TestCase):
+    """Test the per-process connection pool behind DATABASE_POOL_MODE=process"""
+
+    def setUp(self):
+        """Set up a small pool and a counter of opened connections"""
+        self.pool = ConnectionPool(max_size=2, timeout=0.01, max_lifetime=3600)
+        self.opened = []
+
+    def connect(self):
+        """Open a new fake connection"""
+        connection = FakeConnection()
+        self.opened.append(connection)
+        return connection
+
+    def test_reuses_released_connections(self):
+        """Test that sequential requests share one connection"""
+        for _i in range(3):
+            connection = self.pool.acquire(self.connect)
+            self.pool.release(connection)
+
+        self.assertEqual(len(self.opened), 1)
+        self.assertEqual(self.pool.idle_count, 1)
+
+    def test_bounded(self):
+        """Test that a full pool times out instead of opening more connections"""
+        first = self.pool.acquire(self.connect)
+        self.pool.acquire(self.connect)
+
+        with self.assertRaises(PoolTimeout):
+            self.pool.acquire(self.connect)
+
+        self.pool.release(first)
+        self.assertIs(self.pool.acquire(self.connect), first)
+        self.assertEqual(len(self.opened), 2)
+
+    def test_failed_reset_discards(self):
+        """Test that a connection whose reset fails is closed, not reused"""
+        connection = self.pool.acquire(self.connect)
+
+        def reset(connection):
+            raise RuntimeError('broken')
+
+        self.pool.release(connection, reset)
+
+        self.assertTrue(connection.closed)
+        self.assertIsNot(self.pool.acquire(self.connect), connection)
+
+    def test_failed_check_opens_new_connection(self):
+        """Test that a reused connection failing its health check is replaced"""
+        stale = self.pool.acquire(self.connect)
+        self.pool.release(stale)
+
+        def check(connection):
+            raise RuntimeError('server closed the connection')
+
+        connection = self.pool.acquire(self.connect, check)
+
+        self.assertIsNot(connection, stale)
+        self.assertTrue(stale.closed)
+
+    def test_max_lifetime(self):
+        """Test that connections older than MAX_LIFETIME are closed on release"""
+        pool = ConnectionPool(max_size=1, max_lifetime=0)
+        connection = pool.acquire(self.connect)
+
+        pool.release(connection)
+
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.idle_count, 0)
+
+
+    def test_close_and_drain(self):
+        """Test that close() frees the slot and drain() closes idle connections"""
+        idle = self.pool.acquire(self.connect)
+        closing = self.pool.acquire(self.connect)
+        self.pool.release(idle)
+
+        self.pool.close(closing)
+        self.pool.drain()
+
+        self.assertTrue(closing.closed)
+        self.assertTrue(idle.closed)
+        self.assertEqual(self.pool.idle_count, 0)
+        self.pool.acquire(self.connect)
+        self.pool.acquire(self.connect)
+        self.assertEqual(len(self.opened), 4)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'needs PostgreSQL')
+class PostgresConnectionPoolTestCase(TestCase):
+    """Test the pooling backend (DATABASE_POOL_MODE=process) against the test database"""
+
+    def setUp(self):
+        """Tag this test's server connections with a unique application_name"""
+        self.application_name = f'pool-test-{uuid.uuid4().hex[:12]}'
+
+    def wrapper(self, **settings):
+        """A pooling DatabaseWrapper for the test database"""
+        settings_dict = {
+            **connection.settings_dict,
+            'ENGINE': 'config.postgresql_pool',
+            'CONN_MAX_AGE': 0,
+            'OPTIONS': {**connection.settings_dict['OPTIONS'], 'application_name': self.application_name},
+            'POOL': {'MAX_SIZE': 2, 'TIMEOUT': 1},
+            **settings,
+        }
+        wrapper = DatabaseWrapper(settings_dict, alias='pool_test')
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def query(self, wrapper, sql):
+        """Run a one-value query on ``wrapper``"""
+        with wrapper.cursor() as cursor:
+            cursor.execute(sql)
+            return cursor.fetchone()[0]
+
+    def open_server_connections(self):
+        """Count server backends with this test's application_name"""
+        with connection.cursor() as cursor:
+            for _i in range(50):
+                cursor.execute('SELECT pg_stat_clear_snapshot()')
+                cursor.execute('SELECT count(*) FROM pg_stat_activity WHERE application_name = %s', [self.application_name])
+                count = cursor.fetchone()[0]
+                if not count:
+                    break
+                # Backends exit shortly after the client disconnects
+                time.sleep(0.02)
+        return count
+
+    def test_end_of_request_close_reuses_server_connection(self):
+        """Test that the request-finished close hands the connection to the next request"""
+        wrapper = self.wrapper()
+        first_pid = self.query(wrapper, 'SELECT pg_backend_pid()')
+
+        wrapper.close_if_unusable_or_obsolete()
+
+        self.assertIsNone(wrapper.connection)
+        self.assertEqual(self.query(wrapper, 'SELECT pg_backend_pid()'), first_pid)
+
+    def test_explicit_close_leaves_no_connections(self):
+        """Test that close() closes the connection and drains the pool, as dropping a database needs"""
+        idle, closing = self.wrapper(), self.wrapper()
+        self.query(idle, 'SELECT 1')
+        self.query(closing, 'SELECT 1')
+        idle.close_if_unusable_or_obsolete()
+
+        closing.close()
+
+        self.assertEqual(self.open_server_connections(), 0)
+
+    def test_database_change_uses_another_pool(self):
+        """Test that a connection to one database is never reused for another"""
+        wrapper = self.wrapper()
+        self.query(wrapper, 'SELECT 1')
+        wrapper.close_if_unusable_or_obsolete()
+
+        other = self.wrapper(NAME='postgres')
+
+        self.assertEqual(self.query(other, 'SELECT current_database()'), 'postgres')
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1'], DATABASE_ROUTERS=['config.routers.ReplicaRouter'])
+class ReplicaRouterTestCase(TestCase):
+    """Test that only replica-enabled reads of the routed apps leave the primary"""
+
+    def setUp(self):
+        """Allow replica reads for the duration of each test"""
+        token = replica_reads.set(True)
+        self.addCleanup(replica_reads.reset, token)
+
+    def test_reads_go_to_replica(self):
+        """Test that routed apps read from the replica and others from the primary"""
+        self.assertEqual(Portfolio.objects.all().db, 'replica_1')
+        self.assertEqual(get_user_model().objects.all().db, 'replica_1')
+        self.assertEqual(Job.objects.all().db, 'default')
+
+    def test_reads_stay_on_primary_outside_requests(self):
+        """Test that reads use the primary unless replica reads are enabled"""
+        token = replica_reads.set(False)
+        try:
+            self.assertEqual(Portfolio.objects.all().db, 'default')
+        finally:
+            replica_reads.reset(token)
+
+    def test_writes_go_to_primary(self):
+        """Test that an instance loaded from a replica is saved to the primary"""
+        portfolio = Portfolio()
+        portfolio._state.db = 'replica_1'
+
+        self.assertEqual(router.db_for_write(Portfolio, instance=portfolio), 'default')
+
+    def test_replicas_are_not_migrated(self):
+        """Test that migrations only run on the primary"""
+        self.assertFalse(ReplicaRouter().allow_migrate('replica_1', 'portfolios'))
+        self.assertIsNone(ReplicaRouter().allow_migrate('default', 'portfolios'))
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1'], DATABASE_ROUTERS=['config.routers.ReplicaRouter'])
+class ReplicaRoutingMiddlewareTestCase(TestCase):
+    """Test which requests ReplicaRoutingMiddleware lets read from the replicas"""
+
+    def setUp(self):
+        """Set up a middleware whose view reports the alias portfolio reads use"""
+        self.factory = RequestFactory()
+        self.middleware = ReplicaRoutingMiddleware(lambda request: HttpResponse(Portfolio.objects.all().db))
+
+    def route(self, request):
+        """Run the request through the middleware and return the read alias"""
+        return self.middleware(request).content.decode()
+
+    def test_anonymous_get_reads_replica(self):
+        """Test that a plain GET reads from the replica"""
+        self.assertEqual(self.route(self.factory.get('/api/portfolio/')), 'replica_1')
+        self.assertFalse(replica_reads.get())
+
+    def test_write_pins_client_to_primary(self):
+        """Test that a write reads from the primary and pins the next reads there"""
+        response = self.middleware(self.factory.post('/api/portfolio/'))
+
+        self.assertEqual(response.content.decode(), 'default')
+        request = self.factory.get('/api/portfolio/')
+        request.COOKIES[PRIMARY_COOKIE] = response.cookies[PRIMARY_COOKIE].value
+        self.assertEqual(self.route(request), 'default')
+
+    def test_superuser_token_reads_primary(self):
+        """Test that the superuser claim pins reads to the primary and other tokens do not"""
+        User = get_user_model()
+        owner = User.objects.create_superuser(username='owner', email='owner@example.com', password='pass12345')
+        user = User.objects.create_user(username='testuser', email='testuser@example.com', password='pass12345')
+
+        def get(user):
+            token = tokens_for_user(user).access_token
+            return self.factory.get('/api/portfolio/', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+        self.assertEqual(self.route(get(owner)), 'default')
+        self.assertEqual(self.route(get(user)), 'replica_1')
+        self.assertEqual(self.route(self.factory.get('/api/portfolio/', HTTP_AUTHORIZATION='Bearer invalid')), 'replica_1')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_not_used_without_replicas(self):
+        """Test that the middleware removes itself without replicas"""
+        with self.assertRaises(MiddlewareNotUsed):
+            ReplicaRoutingMiddleware(lambda request: HttpResponse())
+
+
+class StartupImportTimeTestCase(TestCase):
+    """Test the import cost of starting a process (settings, apps and URLconf)"""
+
+    # Cumulative top-level import time; several times the measured cost, so
+    # only a real regression (a heavy import moved to startup) trips it
+    BUDGET_MS = 1500
+    # Loaded on first storage use, never at startup (portfolios/gcloud.py)
+    LAZY_PACKAGES = ('google.', 'storages.backends.gcloud')
+    IMPORT_LINE = re.compile(r'import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)')
+
+    def import_profile(self):
+        """Run ``python -X importtime`` on startup; return the top-level total (ms) and module names"""
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'config.settings'}
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', 'import django; django.setup(); import config.urls'],
+            capture_output=True, text=True, env=env, check=True,
+        )
+        total_us, modules = 0, []
+        for line in result.stderr.splitlines():
+            match = self.IMPORT_LINE.match(line)
+            if match:
+                modules.append(match.group(3))
+                if not match.group(2):
+                    total_us += int(match.group(1))
+        return total_us / 1000, modules
+
+    def test_startup_within_budget(self):
+        """Test that startup stays under the budget and does not load the GCS client"""
+        # Best of three, to absorb noise on busy machines
+        profiles = [self.import_profile() for _i in range(3)]
+        total_ms = min(total for total, _modules in profiles)
+        modules = profiles[0][1]
+
+        self.assertIn('config.urls', modules)
+        self.assertEqual([module for module in modules if module.startswith(self.LAZY_PACKAGES)], [])
+        self.assertLess(total_ms, self.BUDGET_MS, f'startup imports took {total_ms:.0f}ms')
@@ -5,5 +5,6 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/portfolio/', include('portfolios.urls')),
     path('api/auth/', include('authentication.urls')),
-    path('api/users/', include('users.urls'))
+    path('api/users/', include('users.urls')),
+    path('api/monitoring/', include('monitoring.urls')),
 ]
@@ -19,5 +19,11 @@ echo "- Postgres is up - continuing..."
 echo "- Running python manage.py migrate"
 python manage.py migrate
 
+# APP_SERVER=uvicorn serves config.asgi, where the public GET endpoints use the async views
+if [ "${APP_SERVER:-gunicorn}" = "uvicorn" ]; then
+  echo "- Starting Uvicorn server..."
+  exec uvicorn config.asgi:application --host 0.0.0.0 --port 8000 --workers 2
+fi
+
 echo "- Starting Gunicorn server..."
 exec gunicorn config.wsgi:application --bind 0.0.0.0:8000
\ No newline at end of file
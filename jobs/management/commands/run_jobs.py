@@ -0,0 +1,52 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.queue import run_pending
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (image processing, etc.) until stopped'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run every due job and exit instead of polling'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds to sleep when the queue is empty'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10,
+            help='Jobs claimed per database round trip'
+        )
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        if options['once']:
+            processed = run_pending(batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'Processed {processed} job(s)'))
+            return
+
+        self.stdout.write(self.style.SUCCESS('Job worker started'))
+        while not self.stopping:
+            # One batch at a time so a stop signal is honoured between batches
+            processed = run_pending(batch_size=options['batch_size'], max_jobs=options['batch_size'])
+            if processed:
+                self.stdout.write(f'Processed {processed} job(s)')
+            else:
+                time.sleep(options['poll_interval'])
+        self.stdout.write(self.style.SUCCESS('Job worker stopped'))
+
+    def stop(self, signum, frame):
+        self.stopping = True
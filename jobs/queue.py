@@ -0,0 +1,134 @@
+"""
+Minimal database-backed job queue.
+
+Handlers are registered by name with ``@register``; ``enqueue`` stores a Job
+row (inside the caller's transaction, so a job never runs before the data it
+refers to is committed) and the ``run_jobs`` management command claims and
+executes due jobs.
+"""
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+def register(name):
+    """Register ``handler(job)`` under ``name``."""
+    def decorator(handler):
+        _registry[name] = handler
+        return handler
+    return decorator
+
+
+def get_handler(name):
+    try:
+        return _registry[name]
+    except KeyError:
+        raise LookupError(f'No job handler registered for "{name}"')
+
+
+def enqueue(name, payload=None, delay=None, max_attempts=None) -> Job:
+    """Store a job; with JOBS_RUN_EAGERLY it runs as soon as the transaction commits."""
+    get_handler(name)
+    job = Job.objects.create(
+        name=name,
+        payload=payload or {},
+        run_after=timezone.now() + (delay or timedelta()),
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+    )
+    if settings.JOBS_RUN_EAGERLY:
+        transaction.on_commit(lambda: run_job(job.pk))
+    return job
+
+
+def bulk_enqueue(name, payloads, max_attempts=None) -> list:
+    """Store many jobs for the same handler with a single INSERT."""
+    get_handler(name)
+    now = timezone.now()
+    jobs = Job.objects.bulk_create([
+        Job(name=name, payload=payload, run_after=now, max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS)
+        for payload in payloads
+    ])
+    if settings.JOBS_RUN_EAGERLY:
+        transaction.on_commit(lambda: [run_job(job.pk) for job in jobs])
+    return jobs
+
+
+def claim(batch_size=10) -> list:
+    """
+    Atomically mark up to ``batch_size`` due jobs as running and return them.
+
+    Jobs stuck in "running" longer than JOBS_LOCK_TIMEOUT (a crashed worker)
+    are due again. On Postgres concurrent workers skip each other's rows.
+    """
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=settings.JOBS_LOCK_TIMEOUT)
+    with transaction.atomic():
+        queryset = Job.objects.filter(
+            Q(status=Job.STATUS_QUEUED) | Q(status=Job.STATUS_RUNNING, locked_at__lt=stale_before),
+            run_after__lte=now,
+        ).order_by('run_after', 'id')
+        if connection.features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+        ids = list(queryset.values_list('id', flat=True)[:batch_size])
+        Job.objects.filter(id__in=ids).update(status=Job.STATUS_RUNNING, locked_at=now)
+    return list(Job.objects.filter(id__in=ids).order_by('run_after', 'id'))
+
+
+def execute(job: Job) -> bool:
+    """Run one claimed job, recording success, retry or final failure."""
+    job.attempts += 1
+    try:
+        get_handler(job.name)(job)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.is_final_attempt:
+            job.status = Job.STATUS_FAILED
+            logger.error('Job %s failed permanently', job, exc_info=True)
+        else:
+            job.status = Job.STATUS_QUEUED
+            job.run_after = timezone.now() + timedelta(seconds=settings.JOBS_RETRY_BACKOFF * 2 ** (job.attempts - 1))
+            logger.warning('Job %s failed, retrying at %s', job, job.run_after, exc_info=True)
+        job.locked_at = None
+        job.save(update_fields=['attempts', 'status', 'run_after', 'locked_at', 'last_error', 'updated_at'])
+        return False
+
+    job.status = Job.STATUS_DONE
+    job.locked_at = None
+    job.last_error = None
+    job.save(update_fields=['attempts', 'status', 'locked_at', 'last_error', 'updated_at'])
+    return True
+
+
+def run_job(job_id) -> bool:
+    """Claim and run a single job by id (used in eager mode)."""
+    updated = Job.objects.filter(pk=job_id, status=Job.STATUS_QUEUED).update(
+        status=Job.STATUS_RUNNING, locked_at=timezone.now()
+    )
+    if not updated:
+        return False
+    return execute(Job.objects.get(pk=job_id))
+
+
+def run_pending(batch_size=10, max_jobs=None) -> int:
+    """Drain every due job; return how many ran."""
+    processed = 0
+    while max_jobs is None or processed < max_jobs:
+        limit = batch_size if max_jobs is None else min(batch_size, max_jobs - processed)
+        jobs = claim(limit)
+        if not jobs:
+            break
+        for job in jobs:
+            execute(job)
+            processed += 1
+    return processed
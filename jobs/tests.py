@@ -0,0 +1,104 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import Job
+from .queue import register, enqueue, claim, run_pending
+
+calls = []
+
+
+@register('tests.record')
+def record(job):
+    calls.append(job.payload)
+
+
+@register('tests.explode')
+def explode(job):
+    raise RuntimeError('boom')
+
+
+class JobQueueTestCase(TestCase):
+    """Test the database-backed job queue"""
+
+    def setUp(self):
+        """Reset recorded handler calls"""
+        calls.clear()
+
+    def test_enqueue_and_run(self):
+        """Test that an enqueued job runs once and is marked done"""
+        job = enqueue('tests.record', {'value': 1})
+
+        self.assertEqual(run_pending(), 1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_DONE)
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(calls, [{'value': 1}])
+        self.assertEqual(run_pending(), 0)
+
+    def test_unknown_handler_is_rejected(self):
+        """Test that enqueueing an unregistered name fails fast"""
+        with self.assertRaises(LookupError):
+            enqueue('tests.missing')
+
+    def test_delayed_job_waits(self):
+        """Test that jobs do not run before run_after"""
+        enqueue('tests.record', {'value': 1}, delay=timedelta(minutes=5))
+
+        self.assertEqual(run_pending(), 0)
+
+    def test_failed_job_is_retried_with_backoff(self):
+        """Test that a failing job is requeued in the future until attempts run out"""
+        job = enqueue('tests.explode', max_attempts=2)
+
+        run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_QUEUED)
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIn('boom', job.last_error)
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_stale_running_job_is_reclaimed(self):
+        """Test that jobs locked by a dead worker become due again"""
+        job = enqueue('tests.record', {'value': 2})
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.STATUS_RUNNING,
+            locked_at=timezone.now() - timedelta(hours=1)
+        )
+
+        self.assertEqual([claimed.pk for claimed in claim()], [job.pk])
+
+    def test_claimed_jobs_are_not_claimed_twice(self):
+        """Test that a running job is invisible to other workers"""
+        enqueue('tests.record', {'value': 3})
+
+        self.assertEqual(len(claim()), 1)
+        self.assertEqual(claim(), [])
+
+    @override_settings(JOBS_RUN_EAGERLY=True)
+    def test_eager_mode_runs_on_commit(self):
+        """Test that eager mode runs the job once the transaction commits"""
+        with self.captureOnCommitCallbacks(execute=True):
+            job = enqueue('tests.record', {'value': 4})
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_DONE)
+
+    def test_run_jobs_command_once(self):
+        """Test that run_jobs --once drains the queue"""
+        enqueue('tests.record', {'value': 5})
+        enqueue('tests.record', {'value': 6})
+        out = StringIO()
+
+        call_command('run_jobs', '--once', stdout=out)
+
+        self.assertIn('Processed 2 job(s)', out.getvalue())
@@ -0,0 +1,89 @@
+import json
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .profiling import RequestProfile, install_hooks, summary
+
+logger = logging.getLogger('monitoring.requests')
+
+
+class RequestProfilingMiddleware:
+    """
+    Profile every request: view, total time, SQL queries and DB time,
+    serializer and render time, response size and response-cache result.
+
+    Each request gets a ``Server-Timing`` header and one JSON log line on the
+    ``monitoring.requests`` logger, and is added to the summary served at
+    ``/api/monitoring/requests/``. Enable with ``REQUEST_PROFILING_ENABLED``;
+    when it is off, Django drops the middleware at startup.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        install_hooks()
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        profile = RequestProfile()
+        token = profile.activate()
+        try:
+            response = self.get_response(request)
+        finally:
+            RequestProfile.deactivate(token)
+        return self.finish(request, response, profile)
+
+    async def __acall__(self, request):
+        profile = RequestProfile()
+        token = profile.activate()
+        try:
+            response = await self.get_response(request)
+        finally:
+            RequestProfile.deactivate(token)
+        return self.finish(request, response, profile)
+
+    def finish(self, request, response, profile):
+        total = time.perf_counter() - profile.started
+        record = {
+            'view': self.get_view_name(request),
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 2),
+            'queries': profile.queries,
+            'db_ms': round(profile.db_time * 1000, 2),
+            'serialize_ms': round(profile.phases['serialize'] * 1000, 2),
+            'render_ms': round(profile.phases['render'] * 1000, 2),
+            'bytes': None if response.streaming else len(response.content),
+            'cache': response.get('X-Cache'),
+        }
+        summary.add(record)
+        if settings.REQUEST_PROFILING_LOG:
+            logger.info(json.dumps(record, separators=(',', ':')))
+
+        response['Server-Timing'] = ', '.join([
+            f'total;dur={record["total_ms"]}',
+            f'db;dur={record["db_ms"]};desc="{record["queries"]} queries"',
+            f'serialize;dur={record["serialize_ms"]}',
+            f'render;dur={record["render_ms"]}',
+            *([f'cache;desc={record["cache"]}'] if record['cache'] else []),
+        ])
+        return response
+
+    @staticmethod
+    def get_view_name(request):
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return 'unresolved'
+        return match.view_name or match._func_path
@@ -0,0 +1,192 @@
+"""
+Per-request profiles and the in-process summary behind the profiling middleware.
+
+The profile for the request being handled lives in a context variable.
+Query time, serializer ``.data`` time and DRF render time are added to it
+by hooks that ``install_hooks()`` sets up the first time the middleware is
+enabled; while it is disabled, nothing is wrapped.
+"""
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils import timezone
+
+_current = ContextVar('monitoring_request_profile', default=None)
+_hooks_lock = threading.Lock()
+_hooks_installed = False
+
+
+class RequestProfile:
+    """Measurements for one request; durations are in seconds."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.phases = {'serialize': 0.0, 'render': 0.0}
+        self._depth = {'serialize': 0, 'render': 0}
+
+    def activate(self):
+        return _current.set(self)
+
+    @staticmethod
+    def deactivate(token):
+        _current.reset(token)
+
+    def timed(self, phase, func, *args):
+        """Call ``func`` and add its duration to ``phase``, once for nested calls."""
+        if self._depth[phase]:
+            return func(*args)
+        self._depth[phase] += 1
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.phases[phase] += time.perf_counter() - start
+            self._depth[phase] -= 1
+
+
+def current_profile():
+    return _current.get()
+
+
+def _query_wrapper(execute, sql, params, many, context):
+    profile = _current.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.queries += 1
+        profile.db_time += time.perf_counter() - start
+
+
+def _install_query_wrapper(connection, **kwargs):
+    if _query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_query_wrapper)
+
+
+def _timed_property(prop, phase):
+    def fget(instance):
+        profile = _current.get()
+        if profile is None:
+            return prop.fget(instance)
+        return profile.timed(phase, prop.fget, instance)
+    return property(fget, doc=prop.__doc__)
+
+
+def install_hooks():
+    """Wrap DB execution, DRF serializer data and rendering (idempotent)."""
+    global _hooks_installed
+    with _hooks_lock:
+        if _hooks_installed:
+            return
+        from rest_framework.response import Response
+        from rest_framework.serializers import ListSerializer, Serializer
+
+        # Connections are per thread: wrap new ones as they open, and the ones already open
+        connection_created.connect(_install_query_wrapper, dispatch_uid='monitoring_query_wrapper')
+        for connection in connections.all(initialized_only=True):
+            _install_query_wrapper(connection)
+        for cls in (Serializer, ListSerializer):
+            cls.data = _timed_property(cls.data, 'serialize')
+        Response.rendered_content = _timed_property(Response.rendered_content, 'render')
+        _hooks_installed = True
+
+
+def _percentile(ordered, pct):
+    if not ordered:
+        return None
+    return ordered[max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))]
+
+
+class ViewStats:
+    """Running totals for one view, plus a window of recent durations for percentiles."""
+
+    def __init__(self, window):
+        self.requests = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.queries = 0
+        self.max_queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.render_time = 0.0
+        self.bytes = 0
+        self.cache = {'HIT': 0, 'MISS': 0}
+        self.recent = deque(maxlen=window)
+
+    def add(self, record):
+        self.requests += 1
+        self.errors += record['status'] >= 500
+        self.total_time += record['total_ms']
+        self.max_time = max(self.max_time, record['total_ms'])
+        self.queries += record['queries']
+        self.max_queries = max(self.max_queries, record['queries'])
+        self.db_time += record['db_ms']
+        self.serialize_time += record['serialize_ms']
+        self.render_time += record['render_ms']
+        self.bytes += record['bytes'] or 0
+        if record['cache'] in self.cache:
+            self.cache[record['cache']] += 1
+        self.recent.append(record['total_ms'])
+
+    def mean(self, total):
+        return round(total / self.requests, 2) if self.requests else None
+
+    def as_dict(self):
+        ordered = sorted(self.recent)
+        mean = self.mean
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'total_ms': {
+                'mean': mean(self.total_time),
+                'p50': _percentile(ordered, 50),
+                'p95': _percentile(ordered, 95),
+                'max': self.max_time,
+            },
+            'queries': {'mean': mean(self.queries), 'max': self.max_queries},
+            'db_ms': mean(self.db_time),
+            'serialize_ms': mean(self.serialize_time),
+            'render_ms': mean(self.render_time),
+            'bytes': mean(self.bytes),
+            'cache': {'hits': self.cache['HIT'], 'misses': self.cache['MISS']},
+        }
+
+
+class RequestSummary:
+    """Process-wide aggregate of request records, keyed by view name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._views = {}
+            self._since = timezone.now()
+
+    def add(self, record):
+        with self._lock:
+            stats = self._views.get(record['view'])
+            if stats is None:
+                stats = self._views[record['view']] = ViewStats(settings.REQUEST_PROFILING_WINDOW)
+            stats.add(record)
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                'since': self._since,
+                'views': {view: stats.as_dict() for view, stats in sorted(self._views.items())},
+            }
+
+
+summary = RequestSummary()
@@ -0,0 +1,102 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from authentication.tokens import tokens_for_user
+from portfolios.models import Portfolio
+from .middleware import RequestProfilingMiddleware
+from .profiling import summary
+
+User = get_user_model()
+
+
+class RequestProfilingDisabledTestCase(APITestCase):
+    """Test that profiling costs nothing when disabled"""
+
+    def test_middleware_not_used(self):
+        """Test that Django drops the middleware at startup"""
+        with self.assertRaises(MiddlewareNotUsed):
+            RequestProfilingMiddleware(lambda request: None)
+
+    def test_no_server_timing(self):
+        """Test that responses carry no profiling header"""
+        response = self.client.get('/api/portfolio/')
+
+        self.assertNotIn('Server-Timing', response)
+
+
+@override_settings(REQUEST_PROFILING_ENABLED=True)
+class RequestProfilingTestCase(APITestCase):
+    """Test the request profiling middleware and summary endpoint"""
+
+    def setUp(self):
+        """Set up a portfolio and start from an empty summary"""
+        caches['default'].clear()
+        summary.reset()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        Portfolio.objects.create(author=self.user, title='Sunset', body='Beach')
+
+    def get_logged(self, path):
+        """GET ``path`` and return the response and its parsed log record"""
+        with self.assertLogs('monitoring.requests', 'INFO') as logs:
+            response = self.client.get(path)
+        return response, json.loads(logs.records[-1].getMessage())
+
+    def test_log_record(self):
+        """Test the structured log line for a portfolio list request"""
+        with CaptureQueriesContext(connection) as ctx:
+            response, record = self.get_logged('/api/portfolio/')
+
+        self.assertEqual(record['view'], 'api_portfolio_list_create')
+        self.assertEqual(record['status'], 200)
+        self.assertEqual(record['queries'], len(ctx.captured_queries))
+        self.assertEqual(record['bytes'], len(response.content))
+        self.assertEqual(record['cache'], 'MISS')
+        self.assertGreater(record['serialize_ms'], 0)
+        self.assertGreater(record['render_ms'], 0)
+        self.assertGreaterEqual(record['total_ms'], record['db_ms'])
+
+    def test_server_timing_header(self):
+        """Test that each phase is reported in Server-Timing"""
+        self.client.get('/api/portfolio/')
+        response, record = self.get_logged('/api/portfolio/')
+
+        header = response['Server-Timing']
+        self.assertIn(f'total;dur={record["total_ms"]}', header)
+        self.assertIn(f'db;dur={record["db_ms"]};desc="{record["queries"]} queries"', header)
+        self.assertIn('serialize;dur=', header)
+        self.assertIn('cache;desc=HIT', header)
+
+    def test_summary_endpoint(self):
+        """Test that superusers read per-view aggregates and can reset them"""
+        self.client.get('/api/portfolio/')
+        self.client.get('/api/portfolio/')
+        admin = User.objects.create_superuser(username='owner', email='owner@example.com', password='ownerpass123')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens_for_user(admin).access_token}')
+
+        response = self.client.get('/api/monitoring/requests/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stats = response.data['views']['api_portfolio_list_create']
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['cache'], {'hits': 1, 'misses': 1})
+        self.assertIsNotNone(stats['total_ms']['p95'])
+
+        self.assertEqual(self.client.delete('/api/monitoring/requests/').status_code, status.HTTP_204_NO_CONTENT)
+        self.assertNotIn('api_portfolio_list_create', summary.as_dict()['views'])
+
+    def test_summary_requires_superuser(self):
+        """Test that other users cannot read the summary"""
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get('/api/monitoring/requests/')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
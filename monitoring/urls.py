@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .views import RequestSummaryView
+
+urlpatterns = [
+    path('requests/', RequestSummaryView.as_view(), name='api_monitoring_requests'),
+]
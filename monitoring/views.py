@@ -0,0 +1,20 @@
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from authentication.permissions import IsSuperUser
+from .profiling import summary
+
+
+class RequestSummaryView(APIView):
+    """Per-view request profile summary of this worker process (superusers only)."""
+    permission_classes = [IsAuthenticated, IsSuperUser]
+
+    def get(self, request):
+        return Response(summary.as_dict())
+
+    def delete(self, request):
+        """Start a new measurement window"""
+        summary.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
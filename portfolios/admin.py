@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import Portfolio, PortfolioInfo, Category
+from .search import is_full_text_supported, search_portfolios
 
 
 @admin.register(Category)
@@ -17,6 +18,12 @@ class PortfolioAdmin(admin.ModelAdmin):
     search_fields = ('title', 'body', 'author__username')
     list_filter = ('author', 'category')
 
+    def get_search_results(self, request, queryset, search_term):
+        # Use the GIN-indexed vector instead of unindexed icontains scans over body
+        if search_term and is_full_text_supported():
+            return search_portfolios(queryset, search_term), False
+        return super().get_search_results(request, queryset, search_term)
+
 
 @admin.register(PortfolioInfo)
 class PortfolioInfoAdmin(admin.ModelAdmin):
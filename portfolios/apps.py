@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class PortfoliosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'portfolios'
+
+    def ready(self):
+        from .signals import connect_signals
+        connect_signals()
+        # Register background job handlers
+        from . import tasks  # noqa: F401
@@ -0,0 +1,216 @@
+"""
+Native async implementations of the public read endpoints, used under ASGI.
+
+Each class answers anonymous JSON ``GET`` requests for one DRF view
+(``view_class``) with the async ORM and cache APIs, so a request never
+waits for a ``sync_to_async`` thread of its own while the database or cache
+is busy. The DRF view instance is still set up for every request and
+supplies the querysets, serializers, paginator, content negotiation,
+exception handling and response headers, so responses are the same as the
+synchronous ones: response cache, conditional GET, sparse fieldsets,
+compact languages and field plans all apply.
+
+Requests the async path does not cover (other methods, an ``Authorization``
+header, the browsable API, ``?cursor=`` pages) are handed to the DRF view.
+``portfolios/urls.py`` uses these views when ``PORTFOLIO_ASYNC_VIEWS`` is on,
+which ``config/asgi.py`` does by default.
+"""
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage
+from django.http import Http404, HttpResponse
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import NotAcceptable, NotFound
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .cache import acache_public_response
+from .conditional import aconditional_response, PORTFOLIO_AGGREGATES, CATEGORY_AGGREGATES
+from .documents import aget_info_document
+from .models import Category, Portfolio, PortfolioImage
+from .serializers import PortfolioImageSerializer
+from .views import (
+    CategoryListCreateView,
+    PortfolioImageListCreateView,
+    PortfolioImageRetrieveDestroyView,
+    PortfolioInfoView,
+    PortfolioListCreateView,
+    PortfolioRetrieveUpdateDestroyView,
+)
+
+
+class AsyncReadView:
+    """Async ``get()`` in front of the DRF view ``view_class``."""
+    view_class = None
+
+    @classmethod
+    def as_view(cls):
+        sync_view = cls.view_class.as_view()
+        fallback = sync_to_async(sync_view)
+
+        async def view(request, *args, **kwargs):
+            self = cls(request, *args, **kwargs)
+            if not self.handles_request():
+                return await fallback(request, *args, **kwargs)
+            return await self.dispatch(*args, **kwargs)
+
+        view.view_class = cls
+        view.csrf_exempt = sync_view.csrf_exempt
+        return view
+
+    def __init__(self, request, *args, **kwargs):
+        # What APIView.dispatch() does before calling the handler
+        self.view = self.view_class()
+        self.view.setup(request, *args, **kwargs)
+        self.view.format_kwarg = None
+        self.view.headers = self.view.default_response_headers
+        self.request = self.view.request = self.view.initialize_request(request, *args, **kwargs)
+
+    def handles_request(self) -> bool:
+        """True for anonymous GETs that negotiate a JSON renderer."""
+        request = self.request
+        if request.method != 'GET' or 'HTTP_AUTHORIZATION' in request.META:
+            return False
+        try:
+            renderer, media_type = self.view.perform_content_negotiation(request)
+        except NotAcceptable:
+            return False
+        if not isinstance(renderer, JSONRenderer):
+            return False
+        request.accepted_renderer, request.accepted_media_type = renderer, media_type
+        return True
+
+    async def dispatch(self, *args, **kwargs):
+        try:
+            response = await self.get(self.request, *args, **kwargs)
+        except Exception as exc:
+            response = self.view.handle_exception(exc)
+        response = self.view.finalize_response(self.request, response, *args, **kwargs)
+        if not isinstance(response, Response):
+            return response
+        # Render here: Django renders deferred responses in a worker thread
+        return HttpResponse(response.rendered_content, status=response.status_code, headers=response.headers)
+
+    async def get(self, request, *args, **kwargs):
+        raise NotImplementedError
+
+    async def get_object(self, queryset, **lookup):
+        """``get_object_or_404()`` with the async ORM."""
+        try:
+            return await queryset.aget(**lookup)
+        except queryset.model.DoesNotExist:
+            raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+
+    async def paginate_queryset(self, queryset):
+        """
+        ``PageNumberPagination.paginate_queryset()`` with the COUNT and page
+        query awaited; returns None when the view does not paginate.
+        """
+        paginator = self.view.paginator
+        if paginator is None:
+            return None
+        page_size = paginator.get_page_size(self.request)
+        if not page_size:
+            return None
+        paginator.request = self.request
+        django_paginator = paginator.django_paginator_class(queryset, page_size)
+        # Paginator.count is a cached_property; filling it in skips the sync COUNT
+        django_paginator.count = await queryset.acount()
+        page_number = paginator.get_page_number(self.request, django_paginator)
+        try:
+            paginator.page = django_paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(paginator.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        paginator.page.object_list = [obj async for obj in paginator.page.object_list]
+        return list(paginator.page)
+
+    async def list(self, queryset):
+        """``ListModelMixin.list()`` with the async ORM."""
+        queryset = self.view.filter_queryset(queryset)
+        page = await self.paginate_queryset(queryset)
+        if page is not None:
+            return self.view.get_paginated_response(self.view.get_serializer(page, many=True).data)
+        return Response(self.view.get_serializer([obj async for obj in queryset], many=True).data)
+
+
+class CategoryListView(AsyncReadView):
+    view_class = CategoryListCreateView
+
+    @aconditional_response
+    @acache_public_response
+    async def get(self, request, *args, **kwargs):
+        return await self.list(self.view.get_queryset())
+
+    async def get_fingerprint(self):
+        return await Category.objects.aaggregate(**CATEGORY_AGGREGATES)
+
+    async def paginate_queryset(self, queryset):
+        if self.request.query_params.get('no_pagination'):
+            return None
+        return await super().paginate_queryset(queryset)
+
+
+class PortfolioListView(AsyncReadView):
+    view_class = PortfolioListCreateView
+
+    def handles_request(self) -> bool:
+        return super().handles_request() and not self.view.uses_cursor_pagination()
+
+    @aconditional_response
+    @acache_public_response
+    async def get(self, request, *args, **kwargs):
+        return await self.list(self.view.get_queryset())
+
+    async def get_fingerprint(self):
+        return await self.view.filter_by_category(Portfolio.objects.all()).aaggregate(**PORTFOLIO_AGGREGATES)
+
+
+class PortfolioDetailView(AsyncReadView):
+    view_class = PortfolioRetrieveUpdateDestroyView
+
+    @aconditional_response
+    @acache_public_response
+    async def get(self, request, pk):
+        instance = await self.get_object(self.view.get_queryset(), pk=pk)
+        return Response(self.view.get_serializer(instance).data)
+
+    async def get_fingerprint(self, pk):
+        fingerprint = await Portfolio.objects.filter(pk=pk).aaggregate(**PORTFOLIO_AGGREGATES)
+        return fingerprint if fingerprint['count'] else None
+
+
+class PortfolioInfoDetailView(AsyncReadView):
+    view_class = PortfolioInfoView
+
+    async def get(self, request):
+        return self.view.document_response(request, await aget_info_document())
+
+
+class PortfolioImageListView(AsyncReadView):
+    view_class = PortfolioImageListCreateView
+
+    def handles_request(self) -> bool:
+        return super().handles_request() and not self.view.uses_cursor_pagination()
+
+    async def get(self, request, portfolio_id):
+        try:
+            portfolio = await Portfolio.objects.aget(pk=portfolio_id)
+        except Portfolio.DoesNotExist:
+            return Response({'detail': _('Portfolio not found')}, status=status.HTTP_404_NOT_FOUND)
+
+        images_qs = portfolio.images.all().order_by('-created_at').prefetch_related('variants')
+        page = await self.paginate_queryset(images_qs)
+        if page is not None:
+            return self.view.paginator.get_paginated_response(PortfolioImageSerializer(page, many=True).data)
+        return Response(PortfolioImageSerializer([image async for image in images_qs], many=True).data)
+
+
+class PortfolioImageDetailView(AsyncReadView):
+    view_class = PortfolioImageRetrieveDestroyView
+
+    async def get(self, request, portfolio_id, image_id):
+        try:
+            image = await PortfolioImage.objects.prefetch_related('variants').aget(pk=image_id, portfolio_id=portfolio_id)
+        except PortfolioImage.DoesNotExist:
+            return Response({'detail': _('Image not found')}, status=status.HTTP_404_NOT_FOUND)
+        return Response(PortfolioImageSerializer(image).data)
@@ -0,0 +1,189 @@
+"""
+Versioned response cache for the public portfolio read endpoints.
+
+Anonymous GET responses are stored under a key that embeds a global version
+number. Any write to the underlying models bumps the version (see signals.py),
+which orphans every stored entry at once instead of deleting keys one by one.
+"""
+import functools
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils.translation import get_language
+from rest_framework.response import Response
+
+VERSION_KEY = 'portfolios:response-cache:version'
+INVALIDATED_AT_KEY = 'portfolios:response-cache:invalidated-at'
+KEY_PREFIX = 'portfolios:response'
+
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+
+def get_cache():
+    return caches[settings.PORTFOLIO_CACHE_ALIAS]
+
+
+def is_shared() -> bool:
+    """
+    False when the cache lives in this process's memory (locmem).
+
+    Other workers then never see ``bump_version()``, so anything memoized
+    there can outlive a write made elsewhere.
+    """
+    return not isinstance(get_cache(), LocMemCache)
+
+
+def _new_version() -> int:
+    # Time-based so a version key lost to eviction never reuses an old number.
+    return time.time_ns()
+
+
+def get_version() -> int:
+    cache = get_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, _new_version(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+async def aget_version() -> int:
+    cache = get_cache()
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        await cache.aadd(VERSION_KEY, _new_version(), timeout=None)
+        version = await cache.aget(VERSION_KEY)
+    return version
+
+
+def bump_version() -> None:
+    """Invalidate every cached response."""
+    cache = get_cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, _new_version(), timeout=None)
+    if settings.DATABASE_REPLICAS:
+        cache.set(INVALIDATED_AT_KEY, time.time(), timeout=settings.DATABASE_REPLICA_LAG)
+
+
+def is_settled() -> bool:
+    """
+    False while the replicas may still lag behind the last write.
+
+    Reads from a replica during that window can return the data from before
+    the write; storing them under the new version would serve them until the
+    next write, so callers skip storing (see config/routers.py).
+    """
+    return not settings.DATABASE_REPLICAS or get_cache().get(INVALIDATED_AT_KEY) is None
+
+
+async def ais_settled() -> bool:
+    return not settings.DATABASE_REPLICAS or await get_cache().aget(INVALIDATED_AT_KEY) is None
+
+
+def build_cache_key(request, version: int) -> str:
+    """
+    Key on scheme, host, path, query string and the language negotiated from Accept-Language.
+
+    Paginated bodies embed absolute next/previous URLs, so a response built
+    for one host or scheme must not be served to another.
+    """
+    raw = '|'.join([
+        request.scheme,
+        request.get_host(),
+        request.path,
+        request.META.get('QUERY_STRING', ''),
+        get_language() or settings.LANGUAGE_CODE,
+    ])
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    return f'{KEY_PREFIX}:{version}:{digest}'
+
+
+def is_cacheable(request) -> bool:
+    return (
+        settings.PORTFOLIO_RESPONSE_CACHE_ENABLED
+        and request.method == 'GET'
+        and not request.user.is_authenticated
+    )
+
+
+def record(hit: bool) -> None:
+    with _stats_lock:
+        _stats['hits' if hit else 'misses'] += 1
+
+
+def get_stats() -> dict:
+    """Hit/miss counters of this worker process plus the current version."""
+    with _stats_lock:
+        stats = dict(_stats)
+    total = stats['hits'] + stats['misses']
+    stats['hit_ratio'] = round(stats['hits'] / total, 4) if total else None
+    stats['version'] = get_version()
+    return stats
+
+
+def reset_stats() -> None:
+    with _stats_lock:
+        _stats['hits'] = 0
+        _stats['misses'] = 0
+
+
+def cached_response(cached) -> Response:
+    data, status_code = cached
+    response = Response(data, status=status_code)
+    response['X-Cache'] = 'HIT'
+    return response
+
+
+def cache_public_response(view_method):
+    """Serve anonymous GET requests from the versioned response cache."""
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        if not is_cacheable(request):
+            return view_method(self, request, *args, **kwargs)
+
+        cache = get_cache()
+        # Read the version before touching the database so a concurrent write
+        # can only ever cause this response to be stored under a stale key.
+        key = build_cache_key(request, get_version())
+        cached = cache.get(key)
+        if cached is not None:
+            record(hit=True)
+            return cached_response(cached)
+
+        record(hit=False)
+        response = view_method(self, request, *args, **kwargs)
+        if response.status_code == 200 and is_settled():
+            cache.set(key, (response.data, response.status_code), settings.PORTFOLIO_RESPONSE_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return response
+    return wrapper
+
+
+def acache_public_response(view_method):
+    """``cache_public_response`` for async view methods, using the async cache API."""
+    @functools.wraps(view_method)
+    async def wrapper(self, request, *args, **kwargs):
+        if not is_cacheable(request):
+            return await view_method(self, request, *args, **kwargs)
+
+        cache = get_cache()
+        key = build_cache_key(request, await aget_version())
+        cached = await cache.aget(key)
+        if cached is not None:
+            record(hit=True)
+            return cached_response(cached)
+
+        record(hit=False)
+        response = await view_method(self, request, *args, **kwargs)
+        if response.status_code == 200 and await ais_settled():
+            await cache.aset(key, (response.data, response.status_code), settings.PORTFOLIO_RESPONSE_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return response
+    return wrapper
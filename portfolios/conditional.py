@@ -0,0 +1,135 @@
+"""
+Conditional GET support (ETag / Last-Modified / 304) for portfolio endpoints.
+
+Validators come from cheap aggregates (latest ``updated_at`` plus row counts)
+instead of the rendered body, so a matching ``If-None-Match`` or
+``If-Modified-Since`` is answered before anything is serialized. With a
+shared cache, aggregates are memoized under the response cache version,
+which every write bumps; with a per-process cache they are computed on every
+request, since a bump in another worker would never reach this one.
+"""
+import functools
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from django.utils.translation import get_language
+
+from .cache import aget_version, ais_settled, get_cache, get_version, is_settled, is_shared
+
+PORTFOLIO_AGGREGATES = {
+    'updated_at': Max('updated_at'),
+    'count': Count('id', distinct=True),
+    'images_created_at': Max('images__created_at'),
+    'images_updated_at': Max('images__updated_at'),
+    'images_count': Count('images', distinct=True),
+    'variants_count': Count('images__variants', distinct=True),
+    'category_updated_at': Max('category__updated_at'),
+}
+
+CATEGORY_AGGREGATES = {
+    'updated_at': Max('updated_at'),
+    'count': Count('id'),
+}
+
+FINGERPRINT_PREFIX = 'portfolios:fingerprint'
+
+
+def fingerprint_key(request, version) -> str:
+    raw = f"{request.path}|{request.META.get('QUERY_STRING', '')}"
+    return f'{FINGERPRINT_PREFIX}:{version}:{hashlib.md5(raw.encode("utf-8")).hexdigest()}'
+
+
+def get_fingerprint(request, compute):
+    """Return the aggregate dict for this URL, computing it at most once per cache version."""
+    if not is_shared():
+        return compute()
+    key = fingerprint_key(request, get_version())
+    cache = get_cache()
+    fingerprint = cache.get(key)
+    if fingerprint is None:
+        fingerprint = compute()
+        if is_settled():
+            cache.set(key, fingerprint)
+    return fingerprint
+
+
+async def aget_fingerprint(request, compute):
+    """``get_fingerprint`` where ``compute`` is a coroutine function."""
+    if not is_shared():
+        return await compute()
+    key = fingerprint_key(request, await aget_version())
+    cache = get_cache()
+    fingerprint = await cache.aget(key)
+    if fingerprint is None:
+        fingerprint = await compute()
+        if await ais_settled():
+            await cache.aset(key, fingerprint)
+    return fingerprint
+
+
+def build_validators(request, fingerprint):
+    """Derive a strong ETag and a Last-Modified timestamp from an aggregate dict."""
+    parts = [
+        request.path,
+        request.META.get('QUERY_STRING', ''),
+        get_language() or '',
+        getattr(request, 'accepted_media_type', '') or '',
+    ]
+    parts.extend(f'{name}={fingerprint[name]!r}' for name in sorted(fingerprint))
+    etag = '"%s"' % hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+    timestamps = [value for name, value in fingerprint.items() if name.endswith('_at') and value is not None]
+    last_modified = int(max(timestamps).timestamp()) if timestamps else None
+    return etag, last_modified
+
+
+def add_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, no_cache=True)
+    patch_vary_headers(response, ('Accept', 'Accept-Language'))
+    return response
+
+
+def conditional_response(view_method):
+    """
+    Answer If-None-Match / If-Modified-Since with 304 before the view runs.
+
+    The view must implement ``get_fingerprint(*args, **kwargs)`` returning an
+    aggregate dict, or None when the resource does not exist.
+    """
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        fingerprint = get_fingerprint(request, lambda: self.get_fingerprint(*args, **kwargs))
+        if fingerprint is None:
+            return view_method(self, request, *args, **kwargs)
+
+        etag, last_modified = build_validators(request, fingerprint)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        return add_validators(response, etag, last_modified)
+    return wrapper
+
+
+def aconditional_response(view_method):
+    """``conditional_response`` for async views; ``get_fingerprint`` must be async too."""
+    @functools.wraps(view_method)
+    async def wrapper(self, request, *args, **kwargs):
+        fingerprint = await aget_fingerprint(request, lambda: self.get_fingerprint(*args, **kwargs))
+        if fingerprint is None:
+            return await view_method(self, request, *args, **kwargs)
+
+        etag, last_modified = build_validators(request, fingerprint)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = await view_method(self, request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        return add_validators(response, etag, last_modified)
+    return wrapper
@@ -0,0 +1,164 @@
+"""
+Direct-to-storage uploads for PortfolioImage.
+
+The client asks for an upload slot, PUTs the bytes straight to storage with
+the returned URL and then calls the completion endpoint, so image bytes never
+pass through the Django workers. Backends hide how the URL is signed:
+GCS issues V4 signed URLs, the local backend signs a token for our own PUT
+endpoint so the flow works (and is testable) without a bucket.
+"""
+import os
+import tempfile
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.base import File
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from django.utils.text import get_valid_filename
+from django.utils.translation import gettext_lazy as _
+
+from .models import PortfolioImage
+
+ALLOWED_CONTENT_TYPES = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/webp': '.webp',
+    'image/gif': '.gif',
+}
+
+# Bytes read from the request stream at a time by the local PUT endpoint
+RECEIVE_CHUNK_SIZE = 64 * 1024
+
+SLOT_SALT = 'portfolios.direct_upload.slot'
+LOCAL_UPLOAD_SALT = 'portfolios.direct_upload.local'
+
+
+class DirectUploadBackend:
+    """Interface for issuing upload URLs and inspecting uploaded objects."""
+
+    def __init__(self, storage):
+        self.storage = storage
+
+    def create_upload(self, request, object_name, content_type, max_size, expires_in) -> dict:
+        """Return ``{'url', 'method', 'headers'}`` the client uses to send the bytes."""
+        raise NotImplementedError
+
+    def get_size(self, object_name):
+        """Size in bytes of the uploaded object, or None if it was never uploaded."""
+        raise NotImplementedError
+
+    def delete(self, object_name):
+        self.storage.delete(object_name)
+
+
+class GCSDirectUploadBackend(DirectUploadBackend):
+    """V4 signed PUT URLs straight to the media bucket."""
+
+    def blob(self, object_name):
+        from storages.utils import clean_name
+        return self.storage.bucket.blob(self.storage._normalize_name(clean_name(object_name)))
+
+    def create_upload(self, request, object_name, content_type, max_size, expires_in) -> dict:
+        # GCS rejects the PUT if the body is outside this range; the header is
+        # part of the signature so the client cannot drop it.
+        headers = {'Content-Type': content_type, 'x-goog-content-length-range': f'0,{max_size}'}
+        url = self.blob(object_name).generate_signed_url(
+            version='v4',
+            expiration=timedelta(seconds=expires_in),
+            method='PUT',
+            content_type=content_type,
+            headers={'x-goog-content-length-range': headers['x-goog-content-length-range']},
+        )
+        return {'url': url, 'method': 'PUT', 'headers': headers}
+
+    def get_size(self, object_name):
+        blob = self.storage.bucket.get_blob(self.blob(object_name).name)
+        return blob.size if blob is not None else None
+
+
+class LocalDirectUploadBackend(DirectUploadBackend):
+    """Signed tokens for ``PortfolioImageDirectUploadView``; for development and tests."""
+
+    def create_upload(self, request, object_name, content_type, max_size, expires_in) -> dict:
+        token = signing.dumps(
+            {'name': object_name, 'content_type': content_type, 'max_size': max_size},
+            salt=LOCAL_UPLOAD_SALT,
+        )
+        url = request.build_absolute_uri(reverse('api_portfolio_image_direct_upload', args=[token]))
+        return {'url': url, 'method': 'PUT', 'headers': {'Content-Type': content_type}}
+
+    def get_size(self, object_name):
+        if not self.storage.exists(object_name):
+            return None
+        return self.storage.size(object_name)
+
+    def receive(self, token, content_type, stream, content_length=None):
+        """
+        Store a PUT body for a token issued by ``create_upload``.
+
+        The body is read from ``stream`` in chunks rather than through
+        ``request.body``, which Django caps at DATA_UPLOAD_MAX_MEMORY_SIZE,
+        below the size the token allows. Raises ``signing.BadSignature`` for
+        forged or expired tokens and ValueError, with a translated message for
+        the client, when the body does not match what the token allows.
+        """
+        upload = signing.loads(token, salt=LOCAL_UPLOAD_SALT, max_age=settings.PORTFOLIO_DIRECT_UPLOAD_EXPIRY)
+        if content_type != upload['content_type']:
+            raise ValueError(_('Content-Type does not match the upload URL.'))
+        if content_length is not None and content_length > upload['max_size']:
+            raise ValueError(_('File is too large.'))
+        if self.storage.exists(upload['name']):
+            raise ValueError(_('This upload URL has already been used.'))
+        with tempfile.SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE) as body:
+            size = 0
+            while stream is not None:
+                chunk = stream.read(RECEIVE_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > upload['max_size']:
+                    raise ValueError(_('File is too large.'))
+                body.write(chunk)
+            body.seek(0)
+            return self.storage.save(upload['name'], File(body))
+
+
+def get_backend() -> DirectUploadBackend:
+    backend_class = import_string(settings.PORTFOLIO_DIRECT_UPLOAD_BACKEND)
+    return backend_class(PortfolioImage._meta.get_field('image').storage)
+
+
+def create_slot(request, portfolio, filename, content_type) -> dict:
+    """
+    Reserve an object name for a new image and sign an upload for it.
+
+    The returned ``token`` ties the object name to the portfolio; the
+    completion endpoint only accepts objects named by a valid token.
+    """
+    field = PortfolioImage._meta.get_field('image')
+    stem = get_valid_filename(os.path.splitext(filename)[0])[:100] or 'image'
+    object_name = field.generate_filename(None, f'{stem}_{uuid.uuid4().hex}{ALLOWED_CONTENT_TYPES[content_type]}')
+    expires_in = settings.PORTFOLIO_DIRECT_UPLOAD_EXPIRY
+    upload = get_backend().create_upload(
+        request, object_name, content_type, settings.PORTFOLIO_DIRECT_UPLOAD_MAX_SIZE, expires_in
+    )
+    token = signing.dumps({'portfolio_id': portfolio.pk, 'name': object_name}, salt=SLOT_SALT)
+    return {
+        'upload': upload,
+        'object_name': object_name,
+        'token': token,
+        'expires_at': timezone.now() + timedelta(seconds=expires_in),
+    }
+
+
+def load_slot(token, portfolio) -> str:
+    """Return the object name signed into ``token``; raises ``signing.BadSignature``."""
+    # Allow time for the upload itself after the URL expires
+    slot = signing.loads(token, salt=SLOT_SALT, max_age=settings.PORTFOLIO_DIRECT_UPLOAD_EXPIRY * 2)
+    if slot['portfolio_id'] != portfolio.pk:
+        raise signing.BadSignature('Token was issued for another portfolio.')
+    return slot['name']
@@ -0,0 +1,102 @@
+"""
+Precomputed PortfolioInfo document.
+
+The info endpoint is requested on every page load, and its payload only
+changes when the PortfolioInfo row or its owner is saved. The serialized
+document is therefore kept in the cache per language and rebuilt by the
+signals in signals.py, so steady-state requests never touch the database.
+That needs a cache shared by every worker: with a per-process cache
+(locmem) the rebuild would only reach the process that saved, so the
+document is built from the database on every request instead.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import translation
+
+from .cache import get_cache, is_shared, record
+
+INFO_DOCUMENT_PREFIX = 'portfolios:info-document'
+# Cached when there is no PortfolioInfo row, so 404s are not recomputed either
+MISSING = 'missing'
+
+
+def info_document_key(language) -> str:
+    try:
+        language = translation.get_supported_language_variant(language)
+    except LookupError:
+        language = settings.LANGUAGE_CODE
+    return f'{INFO_DOCUMENT_PREFIX}:{language}'
+
+
+def info_queryset():
+    from .models import PortfolioInfo
+
+    return PortfolioInfo.objects.select_related('user').order_by('pk')
+
+
+def serialize_info_document(portfolio_info):
+    """Serialize ``portfolio_info`` for the active language, or return MISSING for None."""
+    from .serializers import PortfolioInfoSerializer
+
+    if portfolio_info is None:
+        return MISSING
+    data = PortfolioInfoSerializer(portfolio_info).data
+    body = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+    etag = '"%s"' % hashlib.sha1(f'{translation.get_language()}|{body}'.encode('utf-8')).hexdigest()
+    return {'data': data, 'etag': etag}
+
+
+def build_info_document():
+    """Serialize the portfolio info for the active language, or return MISSING."""
+    return serialize_info_document(info_queryset().first())
+
+
+async def abuild_info_document():
+    return serialize_info_document(await info_queryset().afirst())
+
+
+def get_info_document():
+    """Return ``{'data', 'etag'}`` for the active language, or None if there is no info."""
+    if not is_shared():
+        record(hit=False)
+        document = build_info_document()
+        return None if document == MISSING else document
+    cache = get_cache()
+    key = info_document_key(translation.get_language() or settings.LANGUAGE_CODE)
+    document = cache.get(key)
+    record(hit=document is not None)
+    if document is None:
+        document = build_info_document()
+        # add(), not set(): a rebuild triggered by a save wins over a reader
+        # that may have serialized an older snapshot.
+        cache.add(key, document, settings.PORTFOLIO_INFO_DOCUMENT_TIMEOUT)
+    return None if document == MISSING else document
+
+
+async def aget_info_document():
+    """``get_info_document`` through the async cache and ORM APIs."""
+    if not is_shared():
+        record(hit=False)
+        document = await abuild_info_document()
+        return None if document == MISSING else document
+    cache = get_cache()
+    key = info_document_key(translation.get_language() or settings.LANGUAGE_CODE)
+    document = await cache.aget(key)
+    record(hit=document is not None)
+    if document is None:
+        document = await abuild_info_document()
+        await cache.aadd(key, document, settings.PORTFOLIO_INFO_DOCUMENT_TIMEOUT)
+    return None if document == MISSING else document
+
+
+def rebuild_info_documents():
+    """Recompute the document for every configured language."""
+    if not is_shared():
+        return
+    cache = get_cache()
+    for language, _name in settings.LANGUAGES:
+        with translation.override(language):
+            cache.set(info_document_key(language), build_info_document(), settings.PORTFOLIO_INFO_DOCUMENT_TIMEOUT)
@@ -0,0 +1,168 @@
+"""
+Sparse fieldsets and expandable fields.
+
+``?fields=id,title,category.slug`` limits a GET response to the listed fields.
+Dotted names reach into nested serializers. ``?expand=cover_image`` adds
+fields that are left out by default (``Meta.expandable_fields``), and dotted
+names expand fields of nested serializers the same way. Fields are
+pruned before any value is computed, and views pass the same selection to
+``Portfolio.objects.with_related()``, so unused columns and relations are
+never loaded. Names the serializers do not have, or cannot expand, are
+rejected with a 400, so a typo does not look like missing data.
+"""
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ValidationError
+
+
+def parse_fields(value):
+    """
+    Turn ``'id,category.slug'`` into ``{'id': None, 'category': {'slug': None}}``.
+
+    None means the whole field. Returns None when nothing was requested.
+    """
+    if not value:
+        return None
+    tree = {}
+    for path in value.split(','):
+        names = [name.strip() for name in path.split('.')]
+        if not all(names):
+            continue
+        node = tree
+        for name in names[:-1]:
+            if name in node and node[name] is None:
+                break  # the whole field was already requested
+            node = node.setdefault(name, {})
+        else:
+            node[names[-1]] = None
+    return tree or None
+
+
+def parse_names(value):
+    return frozenset(name.strip() for name in (value or '').split(',') if name.strip())
+
+
+class FieldSelection:
+    """Fields requested at one serializer level: ``fields`` (None for the default set) and ``expand``."""
+
+    def __init__(self, fields=None, expand=()):
+        self.fields = fields
+        self.expand = frozenset(expand)
+
+    @classmethod
+    def from_request(cls, request):
+        """Selection from the query string; writes always use the default set."""
+        if request is None or request.method not in ('GET', 'HEAD'):
+            return cls()
+        params = request.query_params
+        return cls(parse_fields(params.get('fields')), parse_names(params.get('expand')))
+
+    @property
+    def is_sparse(self) -> bool:
+        return self.fields is not None
+
+    def includes(self, name, expandable=False) -> bool:
+        if self.fields is not None:
+            return name in self.fields
+        return not expandable or name in self.expand
+
+    def nested(self, name) -> 'FieldSelection':
+        prefix = f'{name}.'
+        expand = [path[len(prefix):] for path in self.expand if path.startswith(prefix)]
+        return FieldSelection(self.fields.get(name) if self.fields else None, expand)
+
+    def columns(self, model, required=('id',)):
+        """Concrete model fields to pass to ``only()``, or None to load every column."""
+        if self.fields is None:
+            return None
+        concrete = {field.name for field in model._meta.concrete_fields}
+        return list(dict.fromkeys([*required, *(name for name in self.fields if name in concrete)]))
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin that drops unselected fields in ``get_fields()``.
+
+    Root serializers receive ``selection=`` from the view; nested sparse
+    serializers get their part of it from the parent.
+    """
+
+    def __init__(self, *args, selection=None, **kwargs):
+        self.selection = selection or FieldSelection()
+        super().__init__(*args, **kwargs)
+
+    def unknown_fields(self, prefix='') -> list:
+        """Selected names, dotted from the root, that this serializer or its nested ones do not have."""
+        if self.selection.fields is None:
+            return []
+        fields = super().get_fields()
+        unknown = []
+        for name, children in self.selection.fields.items():
+            if name not in fields:
+                unknown.append(prefix + name)
+            elif children is not None:
+                nested = getattr(fields[name], 'child', fields[name])
+                if isinstance(nested, SparseFieldsMixin):
+                    nested.selection = self.selection.nested(name)
+                    unknown.extend(nested.unknown_fields(f'{prefix}{name}.'))
+                else:
+                    # A plain field has no sub-fields to select
+                    unknown.extend(f'{prefix}{name}.{child}' for child in children)
+        return unknown
+
+    def unknown_expansions(self, prefix='') -> list:
+        """Names in ``expand``, dotted from the root, that are not expandable here or in the nested serializers."""
+        fields = super().get_fields()
+        expandable = getattr(self.Meta, 'expandable_fields', ())
+        unknown = []
+        for path in sorted(self.selection.expand):
+            name, _sep, rest = path.partition('.')
+            if not rest:
+                if name not in expandable:
+                    unknown.append(prefix + path)
+                continue
+            nested = getattr(fields.get(name), 'child', fields.get(name))
+            if isinstance(nested, SparseFieldsMixin):
+                nested.selection = FieldSelection(expand=[rest])
+                unknown.extend(nested.unknown_expansions(f'{prefix}{name}.'))
+            else:
+                unknown.append(prefix + path)
+        return unknown
+
+    def get_fields(self):
+        fields = super().get_fields()
+        expandable = getattr(self.Meta, 'expandable_fields', ())
+        for name in list(fields):
+            if not self.selection.includes(name, expandable=name in expandable):
+                del fields[name]
+            else:
+                nested = getattr(fields[name], 'child', fields[name])  # unwrap many=True
+                if isinstance(nested, SparseFieldsMixin):
+                    nested.selection = self.selection.nested(name)
+        return fields
+
+
+class SparseFieldsViewMixin:
+    """Generic view mixin that hands the request's field selection to the serializer."""
+
+    def get_field_selection(self) -> FieldSelection:
+        """The request's selection; raises ValidationError (400) naming any unknown or unexpandable fields."""
+        selection = getattr(self, '_field_selection', None)
+        if selection is None:
+            selection = FieldSelection.from_request(self.request)
+            errors = {}
+            if selection.is_sparse:
+                unknown = self.get_serializer_class()(selection=selection).unknown_fields()
+                if unknown:
+                    errors['fields'] = [_('Unknown fields: %(names)s.') % {'names': ', '.join(unknown)}]
+            if selection.expand:
+                unknown = self.get_serializer_class()(selection=selection).unknown_expansions()
+                if unknown:
+                    errors['expand'] = [_('Unknown fields: %(names)s.') % {'names': ', '.join(unknown)}]
+            if errors:
+                raise ValidationError(errors)
+            self._field_selection = selection
+        return selection
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('selection', self.get_field_selection())
+        return super().get_serializer(*args, **kwargs)
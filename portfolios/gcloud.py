@@ -0,0 +1,36 @@
+"""
+Google Cloud Storage backend for media, imported only on first storage use.
+
+Referenced by dotted path from ``STORAGES`` and never imported at startup
+(see ``MediaStorage`` in storage.py), so neither google-cloud-storage nor
+google-auth load until a file is actually read, written or linked.
+"""
+import json
+import logging
+
+from django.conf import settings
+from storages.backends.gcloud import GoogleCloudStorage
+
+logger = logging.getLogger(__name__)
+
+
+def load_credentials():
+    """Service account credentials from ``GCS_SERVICE_ACCOUNT_JSON``, or None for the default credentials."""
+    if not settings.GCS_SERVICE_ACCOUNT_JSON:
+        return None
+    from google.oauth2 import service_account
+    try:
+        return service_account.Credentials.from_service_account_info(json.loads(settings.GCS_SERVICE_ACCOUNT_JSON))
+    except Exception:
+        logger.warning('Failed to load GCS credentials from GCS_SERVICE_ACCOUNT_JSON', exc_info=True)
+        return None
+
+
+class GoogleCloudMediaStorage(GoogleCloudStorage):
+    """GoogleCloudStorage whose credentials are built when the storage is, not in settings."""
+
+    def get_default_settings(self):
+        defaults = super().get_default_settings()
+        if defaults['credentials'] is None:
+            defaults['credentials'] = load_credentials()
+        return defaults
@@ -0,0 +1,184 @@
+"""
+Image handling for PortfolioImage uploads.
+
+Dimensions are read from the file header only, and responsive variants are
+produced by resizing once per configured width and encoding as WebP and
+JPEG, so galleries can load a right-sized rendition through ``srcset``
+instead of the full original.
+"""
+import io
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps
+
+from .models import PortfolioImageVariant
+from .signals import invalidate_response_cache
+
+# EXIF orientations that rotate the image by 90 degrees, swapping width and height
+ROTATED_ORIENTATIONS = {5, 6, 7, 8}
+EXIF_ORIENTATION_TAG = 0x0112
+
+HEADER_FIRST_CHUNK = 8 * 1024
+# Large enough for EXIF blocks with embedded thumbnails (APP1 is capped at 64 KB)
+HEADER_READ_LIMIT = 512 * 1024
+
+# format -> (Pillow encoder, file extension, save options)
+ENCODERS = {
+    PortfolioImageVariant.FORMAT_WEBP: ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+    PortfolioImageVariant.FORMAT_JPEG: ('JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+class BlobRangeReader:
+    """Read-only file object that fetches byte ranges of a GCS blob on demand."""
+
+    def __init__(self, blob):
+        self.blob = blob
+        self.position = 0
+
+    def read(self, size):
+        try:
+            data = self.blob.download_as_bytes(start=self.position, end=self.position + size - 1)
+        except Exception as exc:
+            # 416: asked for bytes past the end of the object
+            if getattr(exc, 'code', None) == 416:
+                return b''
+            raise
+        self.position += len(data)
+        return data
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_header_stream(field_file):
+    """
+    Open a stored image for header reads.
+
+    django-storages downloads the whole object on the first read of a GCS
+    file, so for buckets read byte ranges straight from the blob instead.
+    """
+    storage = field_file.storage
+    bucket = getattr(storage, 'bucket', None)
+    if bucket is not None and hasattr(storage, '_normalize_name'):
+        from storages.utils import clean_name
+        return BlobRangeReader(bucket.blob(storage._normalize_name(clean_name(field_file.name))))
+    return storage.open(field_file.name, 'rb')
+
+
+def read_image_header(fileobj, first_chunk=HEADER_FIRST_CHUNK, limit=HEADER_READ_LIMIT):
+    """
+    Return ``(width, height, orientation)`` without decoding pixels.
+
+    Reads growing chunks until Pillow can parse the header (Image.open is
+    lazy and never allocates the pixel buffer). Width and height are the
+    displayed size, i.e. already swapped for 90-degree EXIF orientations.
+    Returns None when no header is found within ``limit`` bytes.
+    """
+    data = b''
+    chunk_size = first_chunk
+    while len(data) < limit:
+        chunk = fileobj.read(min(chunk_size, limit - len(data)))
+        if not chunk:
+            break
+        data += chunk
+        chunk_size *= 2
+        try:
+            with Image.open(io.BytesIO(data)) as image:
+                width, height = image.size
+                orientation = image.getexif().get(EXIF_ORIENTATION_TAG) or 1
+        except (OSError, EOFError, ValueError):
+            # Not enough bytes yet to get past the header
+            continue
+        if orientation in ROTATED_ORIENTATIONS:
+            width, height = height, width
+        return width, height, orientation
+    return None
+
+
+def target_widths(source_width: int) -> list:
+    """Configured widths smaller than the original; never upscale."""
+    widths = [width for width in settings.PORTFOLIO_IMAGE_VARIANT_WIDTHS if width < source_width]
+    return widths or [source_width]
+
+
+def _flatten(image: Image.Image) -> Image.Image:
+    """JPEG has no alpha channel; composite transparent images onto white."""
+    if image.mode in ('RGB', 'L'):
+        return image
+    if image.mode in ('RGBA', 'LA') or 'transparency' in image.info:
+        rgba = image.convert('RGBA')
+        background = Image.new('RGB', rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.split()[-1])
+        return background
+    return image.convert('RGB')
+
+
+def _encode(image: Image.Image, variant_format: str) -> bytes:
+    encoder, _, options = ENCODERS[variant_format]
+    if encoder == 'JPEG':
+        image = _flatten(image)
+    buffer = io.BytesIO()
+    image.save(buffer, format=encoder, **options)
+    return buffer.getvalue()
+
+
+def generate_variants(portfolio_image) -> list:
+    """
+    Create (or recreate) every variant of ``portfolio_image``.
+
+    Files are written through the variant field's storage, so this works the
+    same against GoogleCloudStorage in production and FileSystemStorage in tests.
+    """
+    formats = settings.PORTFOLIO_IMAGE_VARIANT_FORMATS
+
+    with portfolio_image.image.open('rb') as source_file:
+        source = Image.open(source_file)
+        source = ImageOps.exif_transpose(source)
+        source.load()
+
+    widths = target_widths(source.width)
+    stem = os.path.splitext(os.path.basename(portfolio_image.image.name))[0]
+
+    variants = []
+    # Resize from the largest width down, reusing the previous rendition as
+    # the next input: each step works on a much smaller image.
+    current = source
+    for width in sorted(widths, reverse=True):
+        height = max(1, round(source.height * width / source.width))
+        if (current.width, current.height) != (width, height):
+            current = current.resize((width, height), Image.LANCZOS)
+        for variant_format in formats:
+            extension = ENCODERS[variant_format][1]
+            variant = PortfolioImageVariant(
+                source=portfolio_image,
+                format=variant_format,
+                width=width,
+                height=height,
+            )
+            variant.image.save(f'{stem}_{width}w.{extension}', ContentFile(_encode(current, variant_format)), save=False)
+            variants.append(variant)
+
+    with transaction.atomic():
+        stale = list(portfolio_image.variants.all())
+        portfolio_image.variants.all().delete()
+        created = PortfolioImageVariant.objects.bulk_create(variants)
+    # bulk_create sends no post_save
+    invalidate_response_cache(sender=PortfolioImageVariant)
+
+    # Storages that overwrite in place (GCS) may have reused a stale name.
+    current_names = {variant.image.name for variant in created}
+    for variant in stale:
+        if variant.image.name not in current_names:
+            variant.image.delete(save=False)
+    return created
+
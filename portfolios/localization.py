@@ -0,0 +1,60 @@
+"""
+Compact, single-language representations for bilingual models.
+
+Translated attributes are stored twice (``name``/``name_ar``, ``bio``/``bio_ar``
+...). By default responses carry both. Clients can opt in to a compact
+payload that keeps one field per attribute, filled from the requested
+language:
+
+* ``?lang=ar`` / ``?lang=en`` picks the language explicitly;
+* ``?compact=1`` uses the language LocaleMiddleware negotiated from
+  ``Accept-Language``.
+
+Compact fields keep the base name (``name``), so clients read one key
+whatever the language. An empty Arabic value falls back to English.
+"""
+from django.utils import translation
+
+TRUE_VALUES = {'1', 'true', 'yes'}
+TRANSLATION_SUFFIXES = {'ar': '_ar'}
+
+
+def get_compact_language(request):
+    """Language code for a compact response, or None for the full bilingual one."""
+    if request is None:
+        return None
+    params = getattr(request, 'query_params', request.GET)
+    requested = params.get('lang')
+    if requested:
+        try:
+            return translation.get_supported_language_variant(requested)
+        except LookupError:
+            return None
+    if params.get('compact', '').lower() in TRUE_VALUES:
+        return translation.get_supported_language_variant(translation.get_language() or 'en')
+    return None
+
+
+def localize_data(data, localized_fields, language):
+    """Collapse each ``<field>``/``<field>_ar`` pair in ``data`` into ``<field>`` for ``language``."""
+    suffix = TRANSLATION_SUFFIXES.get(language)
+    for field in localized_fields:
+        translated = data.pop(f'{field}_ar', None)
+        if suffix and translated not in (None, ''):
+            data[field] = translated
+    return data
+
+
+class LocalizedFieldsMixin:
+    """
+    Serializer mixin for the compact representation.
+
+    List the base names of translated attributes in ``Meta.localized_fields``.
+    """
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        language = get_compact_language(self.context.get('request'))
+        if language is None:
+            return data
+        return localize_data(data, self.Meta.localized_fields, language)
@@ -0,0 +1,78 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from portfolios.imaging import open_header_stream, read_image_header
+from portfolios.models import PortfolioImage
+from portfolios.signals import invalidate_response_cache
+
+
+def probe(portfolio_image):
+    """Return (image, header) reading only the first bytes of the stored object."""
+    try:
+        with open_header_stream(portfolio_image.image) as stream:
+            return portfolio_image, read_image_header(stream)
+    except Exception as exc:
+        return portfolio_image, exc
+
+
+class Command(BaseCommand):
+    help = 'Fill in width, height and EXIF orientation of stored portfolio images from their headers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Rows loaded and updated per batch'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Parallel storage reads per batch'
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Re-probe every image, not just rows missing dimensions'
+        )
+
+    def handle(self, *args, **options):
+        queryset = PortfolioImage.objects.exclude(image='').order_by('id')
+        if not options['all']:
+            queryset = queryset.filter(Q(width__isnull=True) | Q(height__isnull=True) | Q(orientation__isnull=True))
+
+        updated_total = 0
+        failed_total = 0
+        last_id = 0
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            while True:
+                # Keyset over id so updated rows dropping out of the filter never skip others
+                batch = list(queryset.filter(id__gt=last_id).only('id', 'image')[:options['batch_size']])
+                if not batch:
+                    break
+                last_id = batch[-1].id
+
+                updated = []
+                for portfolio_image, result in executor.map(probe, batch):
+                    if isinstance(result, tuple):
+                        portfolio_image.width, portfolio_image.height, portfolio_image.orientation = result
+                        # bulk_update does not apply auto_now
+                        portfolio_image.updated_at = timezone.now()
+                        updated.append(portfolio_image)
+                    else:
+                        failed_total += 1
+                        reason = result if isinstance(result, Exception) else 'no image header found'
+                        self.stdout.write(self.style.WARNING(f'Image {portfolio_image.pk} ({portfolio_image.image.name}): {reason}'))
+
+                PortfolioImage.objects.bulk_update(updated, ['width', 'height', 'orientation', 'updated_at'])
+                updated_total += len(updated)
+                self.stdout.write(f'Processed up to id {last_id}: {updated_total} updated, {failed_total} failed')
+
+        if updated_total:
+            # bulk_update sends no post_save
+            invalidate_response_cache(sender=PortfolioImage)
+        self.stdout.write(self.style.SUCCESS(f'Backfilled dimensions for {updated_total} image(s)'))
@@ -0,0 +1,89 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from portfolios.models import Category, Portfolio, PortfolioImage
+from portfolios.views import (
+    CategoryListCreateView,
+    PortfolioListCreateView,
+    PortfolioRetrieveUpdateDestroyView,
+    PortfolioSearchView,
+)
+from portfolios.search import SEARCH_INDEX_NAME, is_full_text_supported
+
+
+def view_queryset(view_class, query=None, **kwargs):
+    """Build the queryset a view would run for a GET with the given query params."""
+    request = Request(APIRequestFactory().get('/', query or {}))
+    view = view_class()
+    view.setup(request, **kwargs)
+    view.request = request
+    view.format_kwarg = None
+    return view.get_queryset()
+
+
+class Command(BaseCommand):
+    help = 'Run EXPLAIN on the querysets behind the public views and optionally check that the expected indexes are used'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Exit with an error when a plan does not use its expected index'
+        )
+
+    def get_cases(self):
+        """Return (name, queryset, expected index) for each hot view query."""
+        category_id = Category.objects.values_list('id', flat=True).first() or 0
+        portfolio = Portfolio.objects.order_by('-created_at').first()
+        portfolio_id = portfolio.pk if portfolio else 0
+        page_size = 10
+
+        cursor_queryset = view_queryset(PortfolioListCreateView).order_by('-created_at', '-id')
+        if portfolio:
+            cursor_queryset = cursor_queryset.filter(created_at__lt=portfolio.created_at)
+
+        return [
+            ('portfolio_list', view_queryset(PortfolioListCreateView)[:page_size], 'portfolio_created_id_idx'),
+            ('portfolio_list_by_category',
+             view_queryset(PortfolioListCreateView, {'category_id': category_id})[:page_size],
+             'portfolio_category_created_idx'),
+            ('portfolio_list_cursor', cursor_queryset[:page_size + 1], 'portfolio_created_id_idx'),
+            ('portfolio_detail', view_queryset(PortfolioRetrieveUpdateDestroyView).filter(pk=portfolio_id), None),
+            ('portfolio_images',
+             PortfolioImage.objects.filter(portfolio_id=portfolio_id).order_by('-created_at')[:page_size],
+             'pimage_portfolio_created_idx'),
+            ('category_list', view_queryset(CategoryListCreateView)[:page_size], 'category_order_name_idx'),
+            # The substring fallback used off Postgres cannot use an index
+            ('portfolio_search',
+             view_queryset(PortfolioSearchView, {'q': 'portfolio'})[:page_size],
+             SEARCH_INDEX_NAME if is_full_text_supported() else None),
+        ]
+
+    def explain(self, queryset):
+        if connection.vendor == 'postgresql':
+            # Tiny CI tables make sequential scans look cheapest; steer the
+            # planner so the check reflects which index it *can* use.
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+                return queryset.explain()
+        return queryset.explain()
+
+    def handle(self, *args, **options):
+        failures = []
+        for name, queryset, expected_index in self.get_cases():
+            plan = self.explain(queryset)
+            self.stdout.write(self.style.MIGRATE_HEADING(f'== {name}'))
+            self.stdout.write(plan)
+
+            if expected_index and expected_index not in plan:
+                failures.append(name)
+                self.stdout.write(self.style.WARNING(f'Expected index "{expected_index}" is not used'))
+            elif expected_index:
+                self.stdout.write(self.style.SUCCESS(f'Uses index "{expected_index}"'))
+            self.stdout.write('')
+
+        if options['check'] and failures:
+            raise CommandError(f'Index regression in: {", ".join(failures)}')
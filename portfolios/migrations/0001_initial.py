@@ -3,7 +3,7 @@
 from django.conf import settings
 from django.db import migrations, models
 import django.db.models.deletion
-import storages.backends.gcloud
+import portfolios.storage
 
 
 class Migration(migrations.Migration):
@@ -20,7 +20,7 @@ class Migration(migrations.Migration):
             fields=[
                 ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
                 ('portfolio_title', models.CharField(max_length=200)),
-                ('background_image', models.ImageField(blank=True, help_text='Portfolio background image for website', null=True, storage=storages.backends.gcloud.GoogleCloudStorage(), upload_to='portfolio_background/')),
+                ('background_image', models.ImageField(blank=True, help_text='Portfolio background image for website', null=True, storage=portfolios.storage.get_media_storage, upload_to='portfolio_background/')),
                 ('created_at', models.DateTimeField(auto_now_add=True)),
                 ('updated_at', models.DateTimeField(auto_now=True)),
                 ('user', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='portfolio_info', to=settings.AUTH_USER_MODEL)),
@@ -36,7 +36,7 @@ class Migration(migrations.Migration):
                 ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
                 ('title', models.CharField(max_length=200)),
                 ('subtitle', models.CharField(blank=True, max_length=300, null=True)),
-                ('image', models.ImageField(blank=True, null=True, storage=storages.backends.gcloud.GoogleCloudStorage(), upload_to='portfolios/%Y/%m/%d/')),
+                ('image', models.ImageField(blank=True, null=True, storage=portfolios.storage.get_media_storage, upload_to='portfolios/%Y/%m/%d/')),
                 ('category', models.CharField(choices=[('photography', 'Photography'), ('video', 'Video Editing'), ('branding', 'Branding'), ('design', 'Design')], max_length=50, null=True)),
                 ('body', models.TextField()),
                 ('created_at', models.DateTimeField(auto_now_add=True)),
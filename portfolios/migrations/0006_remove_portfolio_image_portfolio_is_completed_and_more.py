@@ -2,7 +2,7 @@
 
 from django.db import migrations, models
 import django.db.models.deletion
-import storages.backends.gcloud
+import portfolios.storage
 
 
 class Migration(migrations.Migration):
@@ -25,7 +25,7 @@ class Migration(migrations.Migration):
             name='PortfolioImage',
             fields=[
                 ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
-                ('image', models.ImageField(storage=storages.backends.gcloud.GoogleCloudStorage(), upload_to='portfolios/%Y/%m/%d/')),
+                ('image', models.ImageField(storage=portfolios.storage.get_media_storage, upload_to='portfolios/%Y/%m/%d/')),
                 ('caption', models.CharField(blank=True, max_length=300, null=True)),
                 ('gcs_object_name', models.CharField(blank=True, help_text='Full object path/key in GCS for housekeeping', max_length=512, null=True)),
                 ('created_at', models.DateTimeField(auto_now_add=True)),
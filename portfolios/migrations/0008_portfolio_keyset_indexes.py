@@ -0,0 +1,21 @@
+# Generated by Django 4.2.26 on 2026-10-17 02:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolios', '0007_portfolioimage_height_portfolioimage_width'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='portfolio',
+            index=models.Index(fields=['-created_at', '-id'], name='portfolio_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='portfolioimage',
+            index=models.Index(fields=['portfolio', '-created_at', '-id'], name='pimage_portfolio_created_idx'),
+        ),
+    ]
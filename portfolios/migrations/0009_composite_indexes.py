@@ -0,0 +1,25 @@
+# Generated by Django 4.2.26 on 2026-10-17 02:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolios', '0008_portfolio_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['order', 'name'], name='category_order_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['user', 'order', 'name'], name='category_user_order_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='portfolio',
+            index=models.Index(fields=['category', '-created_at', '-id'], name='portfolio_category_created_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.26 on 2026-10-17 02:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+import portfolios.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolios', '0009_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PortfolioImageVariant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('image', models.ImageField(max_length=512, storage=portfolios.storage.get_media_storage, upload_to='portfolios/variants/%Y/%m/%d/')),
+                ('format', models.CharField(choices=[('webp', 'WebP'), ('jpeg', 'JPEG')], max_length=10)),
+                ('width', models.PositiveIntegerField()),
+                ('height', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('source', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='variants', to='portfolios.portfolioimage')),
+            ],
+            options={
+                'ordering': ['width'],
+                'unique_together': {('source', 'format', 'width')},
+            },
+        ),
+    ]
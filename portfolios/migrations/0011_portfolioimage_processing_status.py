@@ -0,0 +1,18 @@
+# Generated by Django 4.2.26 on 2026-10-17 02:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolios', '0010_portfolioimagevariant'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='portfolioimage',
+            name='processing_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='ready', help_text='Upload pipeline state; the image URL is empty until ready', max_length=10),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.26 on 2026-10-17 02:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolios', '0011_portfolioimage_processing_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='portfolioimage',
+            name='orientation',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='EXIF orientation (1-8); width/height are already corrected for it', null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.26 on 2026-10-17 02:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolios', '0012_portfolioimage_orientation'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='portfolioimage',
+            name='processing_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='ready', help_text='Upload pipeline state: pending (not in storage yet), processing (variants being built), ready or failed', max_length=10),
+        ),
+    ]
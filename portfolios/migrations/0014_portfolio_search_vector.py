@@ -0,0 +1,51 @@
+# Generated by Django 4.2.26 on 2026-10-17 02:47
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Frozen copy of portfolios.search.UPDATE_SEARCH_VECTOR_SQL at the time of this migration
+BACKFILL_SQL = """
+UPDATE portfolios_portfolio AS p SET search_vector =
+    setweight(to_tsvector('english', coalesce(p.title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(p.subtitle, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(c.name, '')), 'B') ||
+    setweight(to_tsvector('arabic', coalesce(c.name_ar, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(p.body, '')), 'C') ||
+    setweight(to_tsvector('english', coalesce((
+        SELECT string_agg(i.caption, ' ') FROM portfolios_portfolioimage AS i WHERE i.portfolio_id = p.id
+    ), '')), 'D')
+FROM portfolios_portfolio AS src LEFT JOIN portfolios_category AS c ON c.id = src.category_id
+WHERE src.id = p.id
+"""
+
+
+def create_search_index(apps, schema_editor):
+    # GIN indexes and tsvector functions only exist on Postgres
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS portfolio_search_vector_idx ON portfolios_portfolio USING gin (search_vector)'
+    )
+    schema_editor.execute(BACKFILL_SQL)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS portfolio_search_vector_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolios', '0013_alter_portfolioimage_processing_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='portfolio',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Postgres full-text vector, maintained by portfolios.search (GIN index created by migration)', null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
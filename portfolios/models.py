@@ -2,7 +2,10 @@ from django.db import models
 from django.conf import settings
 from django.utils.text import slugify
 from django.core.validators import MinValueValidator, MaxValueValidator
-from storages.backends.gcloud import GoogleCloudStorage
+from django.contrib.postgres.search import SearchVectorField
+
+from .fieldsets import FieldSelection
+from .storage import get_media_storage
 
 
 class Category(models.Model):
@@ -22,6 +25,11 @@ class Category(models.Model):
     class Meta:
         unique_together = [['user', 'slug']]
         ordering = ['order', 'name']
+        indexes = [
+            # Public category list sorts the whole table by (order, name)
+            models.Index(fields=['order', 'name'], name='category_order_name_idx'),
+            models.Index(fields=['user', 'order', 'name'], name='category_user_order_name_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         # Auto-generate slug from English name on creation only
@@ -33,6 +41,54 @@ class Category(models.Model):
         return f"{self.name} / {self.name_ar} ({self.user.username})"
 
 
+class PortfolioQuerySet(models.QuerySet):
+    def with_related(self, selection=None):
+        """
+        Join the category and prefetch images newest-first so serialization issues no extra queries.
+
+        A sparse ``selection`` (see fieldsets.py) limits this to the columns
+        and relations the response renders.
+        """
+        selection = selection or FieldSelection()
+        # search_vector is only used in WHERE/ORDER BY; never ship it to Python
+        queryset = self.defer('search_vector')
+        # created_at and id are what ordering and cursor pagination use
+        columns = selection.columns(Portfolio, required=('id', 'created_at'))
+
+        if selection.includes('category'):
+            queryset = queryset.select_related('category')
+            if columns is not None:
+                category_columns = selection.nested('category').columns(Category) or []
+                columns += ['category', *(f'category__{name}' for name in category_columns)]
+        if columns is not None:
+            queryset = queryset.only(*columns)
+
+        if selection.includes('images'):
+            queryset = queryset.prefetch_related(
+                models.Prefetch('images', queryset=PortfolioImage.objects.for_selection(selection.nested('images')))
+            )
+        if selection.includes('cover_image', expandable=True):
+            queryset = queryset.prefetch_related(models.Prefetch(
+                'images',
+                queryset=PortfolioImage.objects.for_selection(selection.nested('cover_image'))[:1],
+                to_attr='cover_images',
+            ))
+        return queryset
+
+
+class PortfolioImageQuerySet(models.QuerySet):
+    def for_selection(self, selection):
+        """Images newest-first, with the variants prefetched only if ``srcset`` is rendered."""
+        queryset = self.order_by('-created_at')
+        # portfolio_id is needed to attach prefetched rows to their portfolio
+        columns = selection.columns(PortfolioImage, required=('id', 'portfolio', 'created_at'))
+        if columns is not None:
+            queryset = queryset.only(*columns)
+        if selection.includes('srcset'):
+            queryset = queryset.prefetch_related('variants')
+        return queryset
+
+
 class Portfolio(models.Model):
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='portfolios')
     title = models.CharField(max_length=200)
@@ -42,9 +98,30 @@ class Portfolio(models.Model):
     body = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        help_text="Postgres full-text vector, maintained by portfolios.search (GIN index created by migration)"
+    )
+
+    objects = PortfolioQuerySet.as_manager()
+
+    @property
+    def cover_image(self):
+        """Newest image, or None; uses the ``cover_images`` prefetch from with_related() when present."""
+        images = getattr(self, 'cover_images', None)
+        if images is None:
+            images = self.images.all()[:1]
+        return images[0] if images else None
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination (see portfolios.pagination)
+            models.Index(fields=['-created_at', '-id'], name='portfolio_created_id_idx'),
+            # ?category_id= filter with the default ordering
+            models.Index(fields=['category', '-created_at', '-id'], name='portfolio_category_created_idx'),
+        ]
 
     def __str__(self) -> str:
         return self.title
@@ -52,10 +129,21 @@ class Portfolio(models.Model):
 
 class PortfolioImage(models.Model):
     """Multiple images per portfolio with GCS object tracking."""
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_READY = 'ready'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_PROCESSING, 'Processing'),
+        (STATUS_READY, 'Ready'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
     portfolio = models.ForeignKey(Portfolio, on_delete=models.CASCADE, related_name='images')
     image = models.ImageField(
         upload_to='portfolios/%Y/%m/%d/',
-        storage=GoogleCloudStorage(),
+        storage=get_media_storage,
         blank=False,
         null=False,
     )
@@ -72,16 +160,62 @@ class PortfolioImage(models.Model):
         validators=[MinValueValidator(100), MaxValueValidator(4000)],
         help_text="Image height in pixels (100-4000)"
     )
+    orientation = models.PositiveSmallIntegerField(
+        blank=True,
+        null=True,
+        help_text="EXIF orientation (1-8); width/height are already corrected for it"
+    )
     gcs_object_name = models.CharField(max_length=512, blank=True, null=True, help_text="Full object path/key in GCS for housekeeping")
+    processing_status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_READY,
+        help_text="Upload pipeline state: pending (not in storage yet), processing (variants being built), ready or failed"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = PortfolioImageQuerySet.as_manager()
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Per-portfolio listing and keyset pagination
+            models.Index(fields=['portfolio', '-created_at', '-id'], name='pimage_portfolio_created_idx'),
+        ]
 
     def __str__(self) -> str:
         return f"{self.portfolio.title} image ({self.pk})"
 
 
+class PortfolioImageVariant(models.Model):
+    """Resized rendition of a PortfolioImage used to build responsive srcsets."""
+    FORMAT_WEBP = 'webp'
+    FORMAT_JPEG = 'jpeg'
+    FORMAT_CHOICES = [
+        (FORMAT_WEBP, 'WebP'),
+        (FORMAT_JPEG, 'JPEG'),
+    ]
+
+    source = models.ForeignKey(PortfolioImage, on_delete=models.CASCADE, related_name='variants')
+    image = models.ImageField(
+        upload_to='portfolios/variants/%Y/%m/%d/',
+        storage=get_media_storage,
+        max_length=512,
+    )
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['width']
+        unique_together = [['source', 'format', 'width']]
+
+    def __str__(self) -> str:
+        return f"{self.source} {self.width}w {self.format}"
+
+
 class PortfolioInfo(models.Model):
     """Store portfolio owner's information linked to a User"""
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='portfolio_info', null=True, blank=True)
@@ -91,7 +225,7 @@ class PortfolioInfo(models.Model):
         upload_to='portfolio_background/',
         blank=True,
         null=True,
-        storage=GoogleCloudStorage(),
+        storage=get_media_storage,
         help_text='Portfolio background image for website'
     )
     created_at = models.DateTimeField(auto_now_add=True)
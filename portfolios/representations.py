@@ -0,0 +1,108 @@
+"""
+Field plans: a faster ``to_representation`` for read-heavy serializers.
+
+DRF's ``Serializer.to_representation`` walks every field for every row:
+``get_attribute()`` with its mapping and callable checks, then
+``to_representation()``, even when the model already holds the final
+value. A plan is compiled once per serializer instance, so once per request
+since ListSerializer reuses its child. Each readable field becomes a
+``(name, getter, convert)`` step:
+
+* plain model columns are read with ``attrgetter``, and CharField,
+  IntegerField, BooleanField and JSONField values that already have the
+  right type are copied as they are;
+* everything else (datetimes, files, choices, relations, nested
+  serializers, method fields) keeps DRF's own ``get_attribute`` and
+  ``to_representation``.
+
+The output is identical to DRF's. ``PORTFOLIO_FIELD_PLANS = False`` turns
+the plans off.
+"""
+from operator import attrgetter
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import fields as drf_fields
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+
+# Field class -> type whose values need no conversion. Subclasses that
+# change to_representation (e.g. DecimalField) are not listed.
+PASSTHROUGH_TYPES = {
+    drf_fields.CharField: str,
+    drf_fields.EmailField: str,
+    drf_fields.SlugField: str,
+    drf_fields.URLField: str,
+    drf_fields.IntegerField: int,
+    drf_fields.BooleanField: bool,
+}
+
+
+def _passthrough(python_type, to_representation):
+    def convert(value):
+        return value if type(value) is python_type else to_representation(value)
+    return convert
+
+
+def _identity(value):
+    return value
+
+
+def _column_getter(serializer, field):
+    """``attrgetter`` for a field that reads a plain model column, else None."""
+    model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+    if model is None or len(field.source_attrs) != 1:
+        return None
+    try:
+        model_field = model._meta.get_field(field.source_attrs[0])
+    except FieldDoesNotExist:
+        return None
+    if model_field.is_relation or not model_field.concrete:
+        return None
+    return attrgetter(field.source_attrs[0])
+
+
+def compile_plan(serializer):
+    """List of ``(name, getter, convert, field)`` steps; a None getter means ``field.get_attribute``."""
+    plan = []
+    for field in serializer._readable_fields:
+        getter = _column_getter(serializer, field)
+        convert = field.to_representation
+        if getter is not None:
+            if type(field) is drf_fields.JSONField and not field.binary:
+                convert = _identity
+            elif type(field) in PASSTHROUGH_TYPES:
+                convert = _passthrough(PASSTHROUGH_TYPES[type(field)], field.to_representation)
+        plan.append((field.field_name, getter, convert, field))
+    return plan
+
+
+class FieldPlanMixin:
+    """
+    Serializer mixin that renders rows through a compiled field plan.
+
+    Put it after mixins that post-process ``to_representation()``, such as
+    LocalizedFieldsMixin, so they still see its output.
+    """
+
+    def to_representation(self, instance):
+        if not settings.PORTFOLIO_FIELD_PLANS:
+            return super().to_representation(instance)
+        plan = getattr(self, '_field_plan', None)
+        if plan is None:
+            plan = self._field_plan = compile_plan(self)
+
+        ret = {}
+        for name, getter, convert, field in plan:
+            if getter is not None:
+                attribute = getter(instance)
+            else:
+                try:
+                    attribute = field.get_attribute(instance)
+                except SkipField:
+                    continue
+                if isinstance(attribute, PKOnlyObject):
+                    ret[name] = None if attribute.pk is None else convert(attribute)
+                    continue
+            ret[name] = None if attribute is None else convert(attribute)
+        return ret
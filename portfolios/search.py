@@ -0,0 +1,82 @@
+"""
+Full-text search over portfolios.
+
+On Postgres every portfolio has a weighted ``search_vector``, indexed with
+GIN and rebuilt by the signals in signals.py. Weights are: title A; subtitle
+and category names B; body C; image captions D. English text uses the
+'english' configuration and Arabic category names use 'arabic'. Other
+databases (SQLite in tests and local development) fall back to
+case-insensitive substring matching with a coarse rank.
+"""
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import Case, Exists, F, FloatField, OuterRef, Q, Value, When
+
+from .models import PortfolioImage
+
+SEARCH_INDEX_NAME = 'portfolio_search_vector_idx'
+
+# One set-based statement, so category names and captions need no extra round trips.
+UPDATE_SEARCH_VECTOR_SQL = """
+UPDATE portfolios_portfolio AS p SET search_vector =
+    setweight(to_tsvector('english', coalesce(p.title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(p.subtitle, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(c.name, '')), 'B') ||
+    setweight(to_tsvector('arabic', coalesce(c.name_ar, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(p.body, '')), 'C') ||
+    setweight(to_tsvector('english', coalesce((
+        SELECT string_agg(i.caption, ' ') FROM portfolios_portfolioimage AS i WHERE i.portfolio_id = p.id
+    ), '')), 'D')
+FROM portfolios_portfolio AS src LEFT JOIN portfolios_category AS c ON c.id = src.category_id
+WHERE src.id = p.id
+"""
+
+
+def is_full_text_supported() -> bool:
+    return connection.vendor == 'postgresql'
+
+
+def update_search_vectors(portfolio_ids=None):
+    """Recompute ``search_vector`` for the given portfolios (all of them when None)."""
+    if not is_full_text_supported():
+        return
+    sql, params = UPDATE_SEARCH_VECTOR_SQL, []
+    if portfolio_ids is not None:
+        portfolio_ids = [pk for pk in portfolio_ids if pk is not None]
+        if not portfolio_ids:
+            return
+        sql += ' AND p.id = ANY(%s)'
+        params = [portfolio_ids]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+def search_portfolios(queryset, query):
+    """Filter ``queryset`` to matches for ``query``, best first, with a ``rank`` annotation."""
+    if is_full_text_supported():
+        # websearch syntax: quoted phrases, OR and -exclusions, never a syntax error
+        search_query = (
+            SearchQuery(query, config='english', search_type='websearch')
+            | SearchQuery(query, config='arabic', search_type='websearch')
+        )
+        return (
+            queryset.filter(search_vector=search_query)
+            .annotate(rank=SearchRank(F('search_vector'), search_query))
+            .order_by('-rank', '-created_at', '-id')
+        )
+
+    for term in query.split():
+        queryset = queryset.filter(
+            Q(title__icontains=term)
+            | Q(subtitle__icontains=term)
+            | Q(body__icontains=term)
+            | Q(category__name__icontains=term)
+            | Q(category__name_ar__icontains=term)
+            | Exists(PortfolioImage.objects.filter(portfolio=OuterRef('pk'), caption__icontains=term))
+        )
+    return queryset.annotate(rank=Case(
+        When(title__icontains=query, then=Value(1.0)),
+        When(Q(subtitle__icontains=query) | Q(category__name__icontains=query) | Q(category__name_ar__icontains=query), then=Value(0.4)),
+        default=Value(0.1),
+        output_field=FloatField(),
+    )).order_by('-rank', '-created_at', '-id')
@@ -5,14 +5,18 @@ from django.utils.text import format_lazy
 
 from .models import Portfolio, PortfolioInfo, Category, PortfolioImage
 from authentication.serializers import UserSerializer
+from .localization import LocalizedFieldsMixin
+from .fieldsets import SparseFieldsMixin
+from .representations import FieldPlanMixin
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(LocalizedFieldsMixin, SparseFieldsMixin, FieldPlanMixin, serializers.ModelSerializer):
     """Serializer for user-scoped portfolio categories with immutable slug."""
     
     class Meta:
         model = Category
         fields = ['id', 'name', 'name_ar', 'slug', 'icon', 'description', 'description_ar', 'features', 'order', 'created_at', 'updated_at']
         read_only_fields = ['id', 'slug', 'created_at', 'updated_at']
+        localized_fields = ['name', 'description']
 
     def validate_name(self, value):
         """Ensure category name contains only English alphabetical characters and spaces."""
@@ -28,7 +32,7 @@ class CategorySerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         """Auto-generate slug from name on creation."""
-        validated_data['user'] = self.context['request'].user
+        validated_data['user_id'] = self.context['request'].user.id
         return super().create(validated_data)
 
     def update(self, instance, validated_data):
@@ -45,20 +49,43 @@ class CategorySerializer(serializers.ModelSerializer):
         return instance
 
 
-class PortfolioSerializer(serializers.ModelSerializer):
+class PortfolioImageSerializer(SparseFieldsMixin, FieldPlanMixin, serializers.ModelSerializer):
+    srcset = serializers.SerializerMethodField()
+
+    class Meta:
+        model = PortfolioImage
+        fields = ['id', 'image', 'caption', 'width', 'height', 'orientation', 'gcs_object_name', 'srcset', 'processing_status', 'created_at']
+        read_only_fields = ['orientation', 'gcs_object_name', 'srcset', 'processing_status', 'created_at', 'id']
+
+    def get_srcset(self, obj):
+        """Responsive srcset per format, e.g. {'webp': 'a.webp 320w, b.webp 640w', 'jpeg': ...}"""
+        srcset = {}
+        for variant in obj.variants.all():
+            srcset.setdefault(variant.format, []).append(f'{variant.image.url} {variant.width}w')
+        return {variant_format: ', '.join(candidates) for variant_format, candidates in srcset.items()}
+
+    def validate_image(self, value):
+        max_size = 5 * 1024 * 1024
+        if value and hasattr(value, 'size') and value.size > max_size:
+            raise serializers.ValidationError('Image size must be less than 5MB.')
+        return value
+
+
+class PortfolioSerializer(SparseFieldsMixin, FieldPlanMixin, serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     category_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
 
     class Meta:
         model = Portfolio
-        fields = ['id', 'title', 'subtitle', 'category', 'category_id', 'body', 'created_at', 'updated_at', 'images', 'is_completed']
-        read_only_fields = ['id', 'created_at', 'updated_at', 'images']
-
-    images = serializers.SerializerMethodField()
+        fields = ['id', 'title', 'subtitle', 'category', 'category_id', 'body', 'created_at', 'updated_at', 'images', 'cover_image', 'is_completed']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'images', 'cover_image']
+        # Only rendered when named in ?expand= or ?fields=
+        expandable_fields = ['cover_image']
 
-    def get_images(self, obj):
-        qs = obj.images.all().order_by('-created_at')
-        return PortfolioImageSerializer(qs, many=True, context=self.context).data
+    # Both read the prefetch cache when the view used Portfolio.objects.with_related();
+    # otherwise they fall back to PortfolioImage's default '-created_at' ordering.
+    images = PortfolioImageSerializer(many=True, read_only=True)
+    cover_image = PortfolioImageSerializer(read_only=True)
 
     def validate_category_id(self, value):
         """Ensure category belongs to the authenticated user."""
@@ -68,7 +95,7 @@ class PortfolioSerializer(serializers.ModelSerializer):
         if not request or not request.user.is_authenticated:
             raise serializers.ValidationError(_('Category selection requires authentication.'))
         try:
-            Category.objects.get(id=value, user=request.user)
+            Category.objects.get(id=value, user_id=request.user.id)
         except Category.DoesNotExist:
             raise serializers.ValidationError(_('Category does not exist or does not belong to you.'))
         return value
@@ -91,20 +118,21 @@ class PortfolioSerializer(serializers.ModelSerializer):
         return instance
 
 
-class PortfolioImageSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = PortfolioImage
-        fields = ['id', 'image', 'caption', 'width', 'height', 'gcs_object_name', 'created_at']
-        read_only_fields = ['gcs_object_name', 'created_at', 'id']
+class DirectUploadSlotSerializer(serializers.Serializer):
+    """Request body for a signed direct upload URL."""
+    filename = serializers.CharField(max_length=255)
+    content_type = serializers.ChoiceField(choices=['image/jpeg', 'image/png', 'image/webp', 'image/gif'])
 
-    def validate_image(self, value):
-        max_size = 5 * 1024 * 1024
-        if value and hasattr(value, 'size') and value.size > max_size:
-            raise serializers.ValidationError('Image size must be less than 5MB.')
-        return value
+
+class DirectUploadCompleteSerializer(serializers.Serializer):
+    """Request body confirming a direct upload finished."""
+    token = serializers.CharField()
+    caption = serializers.CharField(max_length=300, required=False, allow_blank=True, allow_null=True)
+    width = serializers.IntegerField(min_value=100, max_value=4000, required=False)
+    height = serializers.IntegerField(min_value=100, max_value=4000, required=False)
 
 
-class PortfolioInfoSerializer(serializers.ModelSerializer):
+class PortfolioInfoSerializer(LocalizedFieldsMixin, serializers.ModelSerializer):
     full_name = serializers.SerializerMethodField()
     email = serializers.SerializerMethodField()
     job_title = serializers.SerializerMethodField()
@@ -119,6 +147,7 @@ class PortfolioInfoSerializer(serializers.ModelSerializer):
         model = PortfolioInfo
         fields = ['id', 'portfolio_title', 'portfolio_title_ar', 'full_name', 'email', 'job_title', 'phone_number', 'location', 'bio', 'bio_ar', 'about_me', 'about_me_ar', 'background_image', 'created_at', 'updated_at']
         read_only_fields = ['id', 'full_name', 'email', 'job_title', 'phone_number', 'location', 'bio', 'bio_ar', 'about_me', 'about_me_ar', 'created_at', 'updated_at']
+        localized_fields = ['portfolio_title', 'bio', 'about_me']
 
     def get_full_name(self, obj):
         """Get full name from related User"""
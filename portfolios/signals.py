@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.apps import apps
+
+from .cache import bump_version
+
+# Saves that never change anything the public endpoints render.
+IGNORED_UPDATE_FIELDS = {'last_login'}
+
+
+def invalidate_response_cache(sender, **kwargs):
+    update_fields = kwargs.get('update_fields')
+    if update_fields and set(update_fields) <= IGNORED_UPDATE_FIELDS:
+        return
+    # Bump now so readers stop serving old entries, and again after commit to
+    # drop anything cached from a snapshot taken before the write was visible.
+    bump_version()
+    transaction.on_commit(bump_version)
+
+
+def refresh_info_document(sender, **kwargs):
+    update_fields = kwargs.get('update_fields')
+    if update_fields and set(update_fields) <= IGNORED_UPDATE_FIELDS:
+        return
+    from .documents import rebuild_info_documents
+    # Rebuild from committed data only; readers keep the previous document until then.
+    transaction.on_commit(rebuild_info_documents)
+
+
+def refresh_portfolio_search(sender, instance, **kwargs):
+    from .search import is_full_text_supported, update_search_vectors
+    if not is_full_text_supported():
+        return
+    update_fields = kwargs.get('update_fields')
+    model_name = sender._meta.model_name
+    if model_name == 'portfolio':
+        update_search_vectors([instance.pk])
+    elif model_name == 'portfolioimage':
+        if update_fields and 'caption' not in update_fields:
+            return
+        update_search_vectors([instance.portfolio_id])
+    elif model_name == 'category':
+        update_search_vectors(list(instance.portfolios.values_list('pk', flat=True)))
+
+
+def connect_signals():
+    senders = [
+        apps.get_model('portfolios', 'Portfolio'),
+        apps.get_model('portfolios', 'PortfolioImage'),
+        apps.get_model('portfolios', 'PortfolioImageVariant'),
+        apps.get_model('portfolios', 'Category'),
+        apps.get_model('portfolios', 'PortfolioInfo'),
+        apps.get_model(settings.AUTH_USER_MODEL),
+    ]
+    for sender in senders:
+        post_save.connect(invalidate_response_cache, sender=sender, dispatch_uid=f'response_cache_save_{sender.__name__}')
+        post_delete.connect(invalidate_response_cache, sender=sender, dispatch_uid=f'response_cache_delete_{sender.__name__}')
+
+    for sender in [apps.get_model('portfolios', 'PortfolioInfo'), apps.get_model(settings.AUTH_USER_MODEL)]:
+        post_save.connect(refresh_info_document, sender=sender, dispatch_uid=f'info_document_save_{sender.__name__}')
+        post_delete.connect(refresh_info_document, sender=sender, dispatch_uid=f'info_document_delete_{sender.__name__}')
+
+    # Full-text vectors (Postgres only; a no-op elsewhere)
+    search_senders = [
+        apps.get_model('portfolios', 'Portfolio'),
+        apps.get_model('portfolios', 'PortfolioImage'),
+        apps.get_model('portfolios', 'Category'),
+    ]
+    for sender in search_senders:
+        post_save.connect(refresh_portfolio_search, sender=sender, dispatch_uid=f'portfolio_search_save_{sender.__name__}')
+    post_delete.connect(refresh_portfolio_search, sender=search_senders[1], dispatch_uid='portfolio_search_delete_PortfolioImage')
@@ -0,0 +1,83 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, Storage, storages
+
+
+def _backend_method(name):
+    def method(self, *args, **kwargs):
+        return getattr(self.backend, name)(*args, **kwargs)
+    method.__name__ = name
+    return method
+
+
+class MediaStorage(Storage):
+    """
+    The storage under ``PORTFOLIO_MEDIA_STORAGE_ALIAS``, looked up on each use.
+
+    Image fields hold this proxy, so importing the models never imports the
+    backend; for GCS that is the whole google-cloud client stack.
+    ``storages[alias]`` builds the backend on the first file operation.
+    Unlike a LazyObject, the proxy is a real Storage, so FileField's
+    isinstance check does not resolve it.
+    """
+    # Storage implements these on top of each other; every call goes to the backend
+    open = _backend_method('open')
+    save = _backend_method('save')
+    get_valid_name = _backend_method('get_valid_name')
+    get_alternative_name = _backend_method('get_alternative_name')
+    get_available_name = _backend_method('get_available_name')
+    generate_filename = _backend_method('generate_filename')
+    path = _backend_method('path')
+    delete = _backend_method('delete')
+    exists = _backend_method('exists')
+    listdir = _backend_method('listdir')
+    size = _backend_method('size')
+    url = _backend_method('url')
+    get_accessed_time = _backend_method('get_accessed_time')
+    get_created_time = _backend_method('get_created_time')
+    get_modified_time = _backend_method('get_modified_time')
+
+    @property
+    def backend(self):
+        return storages[settings.PORTFOLIO_MEDIA_STORAGE_ALIAS]
+
+    def __getattr__(self, name):
+        # Backend-specific API such as GoogleCloudStorage.bucket
+        if name.startswith('__') or name == 'backend':
+            raise AttributeError(name)
+        return getattr(self.backend, name)
+
+
+media_storage = MediaStorage()
+
+
+def get_media_storage():
+    """``storage`` callable of the image fields; referenced by name in migrations."""
+    return media_storage
+
+
+def get_staging_storage():
+    """Local disk where uploads wait until the job worker moves them to media storage."""
+    return FileSystemStorage(location=settings.PORTFOLIO_UPLOAD_STAGING_ROOT)
+
+
+def save_uploads(field, uploads, max_workers=None) -> list:
+    """
+    Write several uploads to ``field``'s storage concurrently.
+
+    Storage writes are network-bound, so a small thread pool overlaps them.
+    Returns one entry per upload, in order: the stored name, or the
+    exception raised while saving it.
+    """
+    def save(upload):
+        try:
+            return field.storage.save(field.generate_filename(None, upload.name), upload, max_length=field.max_length)
+        except Exception as exc:
+            return exc
+
+    if not uploads:
+        return []
+    workers = min(max_workers or settings.PORTFOLIO_UPLOAD_MAX_WORKERS, len(uploads))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(save, uploads))
@@ -0,0 +1,81 @@
+"""Background job handlers for the portfolios app (run by ``manage.py run_jobs``)."""
+from jobs.queue import register
+
+from .imaging import generate_variants, read_image_header
+from .models import PortfolioImage
+from .storage import get_staging_storage
+
+PROCESS_IMAGE = 'portfolios.process_image'
+GENERATE_VARIANTS = 'portfolios.generate_variants'
+
+
+def set_status(portfolio_image, processing_status):
+    """Save a new processing status (and updated_at, which the ETag fingerprint reads)."""
+    portfolio_image.processing_status = processing_status
+    portfolio_image.save(update_fields=['processing_status', 'updated_at'])
+
+
+@register(PROCESS_IMAGE)
+def process_image(job):
+    """
+    Move a staged upload to media storage, fill in its dimensions and build variants.
+
+    Each step is skipped when already done, so a retried job resumes where
+    the previous attempt stopped.
+    """
+    staging = get_staging_storage()
+    staged_name = job.payload['staged_name']
+
+    try:
+        portfolio_image = PortfolioImage.objects.get(pk=job.payload['image_id'])
+    except PortfolioImage.DoesNotExist:
+        # Deleted while queued; nothing left to process.
+        staging.delete(staged_name)
+        return
+
+    try:
+        set_status(portfolio_image, PortfolioImage.STATUS_PROCESSING)
+
+        update_fields = []
+        if not portfolio_image.image:
+            with staging.open(staged_name, 'rb') as staged_file:
+                if portfolio_image.width is None or portfolio_image.height is None:
+                    header = read_image_header(staged_file)
+                    staged_file.seek(0)
+                    if header:
+                        portfolio_image.width, portfolio_image.height, portfolio_image.orientation = header
+                        update_fields += ['width', 'height', 'orientation']
+                portfolio_image.image.save(job.payload['original_name'], staged_file, save=False)
+            portfolio_image.gcs_object_name = portfolio_image.image.name
+            update_fields += ['image', 'gcs_object_name']
+        if update_fields:
+            portfolio_image.save(update_fields=update_fields + ['updated_at'])
+
+        generate_variants(portfolio_image)
+    except Exception:
+        if job.is_final_attempt:
+            set_status(portfolio_image, PortfolioImage.STATUS_FAILED)
+            # No retry will read it again
+            staging.delete(staged_name)
+        raise
+
+    set_status(portfolio_image, PortfolioImage.STATUS_READY)
+    staging.delete(staged_name)
+
+
+@register(GENERATE_VARIANTS)
+def build_variants(job):
+    """Build variants for an image that is already in media storage (batch uploads)."""
+    try:
+        portfolio_image = PortfolioImage.objects.get(pk=job.payload['image_id'])
+    except PortfolioImage.DoesNotExist:
+        return
+
+    try:
+        generate_variants(portfolio_image)
+    except Exception:
+        if job.is_final_attempt:
+            set_status(portfolio_image, PortfolioImage.STATUS_FAILED)
+        raise
+
+    set_status(portfolio_image, PortfolioImage.STATUS_READY)
@@ -1,18 +1,67 @@
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.files.storage import FileSystemStorage
+from django.test import override_settings
+from django.conf import settings
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django.utils.translation import activate, get_language
 from django.utils.text import format_lazy
 from django.utils.translation import gettext_lazy as _
 from rest_framework.test import APIClient, APITestCase
 from rest_framework import status
+import asyncio
 import io
+import shutil
+import tempfile
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock, skipUnless
 from PIL import Image
+from asgiref.sync import async_to_sync
 
-from .models import Category, Portfolio
+from .models import Category, Portfolio, PortfolioImage, PortfolioImageVariant, PortfolioInfo
+from .serializers import PortfolioSerializer
+from config.renderers import orjson
+from .imaging import generate_variants, read_image_header, BlobRangeReader
+from jobs.models import Job
+from jobs.queue import run_pending
+from .cache import INVALIDATED_AT_KEY, get_version, is_settled, reset_stats
 
 User = get_user_model()
 
 
+class FileSystemStorageMixin:
+    """Swap the GoogleCloudStorage-backed image fields for a temporary FileSystemStorage"""
+
+    def use_filesystem_storage(self):
+        """Patch media storages and return the FileSystemStorage in use"""
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        storage = FileSystemStorage(location=location, base_url='/media/')
+        staging = override_settings(PORTFOLIO_UPLOAD_STAGING_ROOT=tempfile.mkdtemp(dir=location))
+        staging.enable()
+        self.addCleanup(staging.disable)
+        for model in (PortfolioImage, PortfolioImageVariant):
+            patcher = mock.patch.object(model._meta.get_field('image'), 'storage', storage)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        return storage
+
+    def create_image_file(self, width=1000, height=600, image_format='JPEG', mode='RGB', name='photo.jpg'):
+        """Create an in-memory image upload"""
+        image = Image.new(mode, (width, height), color='red' if mode == 'RGB' else (255, 0, 0, 128))
+        image_io = io.BytesIO()
+        image.save(image_io, format=image_format)
+        image_io.name = name
+        image_io.seek(0)
+        return image_io
+
+
 class TranslationTestCase(TestCase):
     """Test cases for Arabic translation functionality"""
 
@@ -286,3 +335,1610 @@ class PasswordChangeTranslationTestCase(APITestCase):
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('تم تغيير كلمة المرور', str(response.data))
+
+
+class PortfolioListQueryCountTestCase(APITestCase):
+    """Test that portfolio list/detail issue a fixed number of queries"""
+
+    def setUp(self):
+        """Set up a category and a storage URL stub for image serialization"""
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.category = Category.objects.create(
+            user=self.user,
+            name='Photography',
+            name_ar='التصوير'
+        )
+        url_patcher = mock.patch(
+            'storages.backends.gcloud.GoogleCloudStorage.url',
+            side_effect=lambda name, *args, **kwargs: f'https://storage.example.com/{name}'
+        )
+        url_patcher.start()
+        self.addCleanup(url_patcher.stop)
+
+    def create_portfolios(self, count, images_per_portfolio=2):
+        """Create portfolios with images without touching storage"""
+        for index in range(count):
+            portfolio = Portfolio.objects.create(
+                author=self.user,
+                title=f'Portfolio {index}',
+                body='Body',
+                category=self.category
+            )
+            PortfolioImage.objects.bulk_create([
+                PortfolioImage(portfolio=portfolio, image=f'portfolios/{index}-{n}.jpg')
+                for n in range(images_per_portfolio)
+            ])
+
+    def test_list_query_count_is_constant(self):
+        """Test that query count does not grow with the number of rows on the page"""
+        self.create_portfolios(2)
+        with CaptureQueriesContext(connection) as small_page:
+            response = self.client.get('/api/portfolio/')
+        self.assertEqual(len(response.data['results']), 2)
+
+        self.create_portfolios(8)
+        with CaptureQueriesContext(connection) as full_page:
+            response = self.client.get('/api/portfolio/')
+        self.assertEqual(len(response.data['results']), 10)
+
+        # Conditional GET aggregate, COUNT, portfolios joined with category, images and variants prefetch
+        self.assertEqual(len(small_page), 5)
+        self.assertEqual(len(full_page), len(small_page))
+
+    def test_list_images_are_newest_first(self):
+        """Test that prefetched images keep the '-created_at' ordering"""
+        self.create_portfolios(1, images_per_portfolio=3)
+        response = self.client.get('/api/portfolio/')
+
+        created = [image['created_at'] for image in response.data['results'][0]['images']]
+        self.assertEqual(created, sorted(created, reverse=True))
+
+    def test_detail_query_count(self):
+        """Test that portfolio detail loads category and images in two queries"""
+        self.create_portfolios(1, images_per_portfolio=5)
+        portfolio = Portfolio.objects.get()
+
+        # Conditional GET aggregate, portfolio joined with category, images and variants prefetch
+        with self.assertNumQueries(4):
+            response = self.client.get(f'/api/portfolio/{portfolio.pk}/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['category']['id'], self.category.id)
+        self.assertEqual(len(response.data['images']), 5)
+
+
+class ResponseCacheTestCase(APITestCase):
+    """Test the versioned response cache on public read endpoints"""
+
+    def setUp(self):
+        """Set up a clean cache, a superuser and one portfolio"""
+        caches['default'].clear()
+        reset_stats()
+        self.client = APIClient()
+        self.user = User.objects.create_superuser(
+            username='owner',
+            email='owner@example.com',
+            password='adminpass123'
+        )
+        self.category = Category.objects.create(
+            user=self.user,
+            name='Photography',
+            name_ar='التصوير'
+        )
+        self.portfolio = Portfolio.objects.create(
+            author=self.user,
+            title='First',
+            body='Body',
+            category=self.category
+        )
+
+    def test_second_anonymous_get_is_served_from_cache(self):
+        """Test that a repeated anonymous GET hits the cache without serializer queries"""
+        first = self.client.get('/api/portfolio/')
+        self.assertEqual(first['X-Cache'], 'MISS')
+
+        # Only the conditional GET aggregate, which is not memoized in locmem
+        with self.assertNumQueries(1):
+            second = self.client.get('/api/portfolio/')
+
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.data, first.data)
+
+    def test_save_invalidates_cached_responses(self):
+        """Test that saving a portfolio bumps the version and refreshes the list"""
+        self.client.get(f'/api/portfolio/{self.portfolio.pk}/')
+
+        self.portfolio.title = 'Renamed'
+        self.portfolio.save()
+
+        response = self.client.get(f'/api/portfolio/{self.portfolio.pk}/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['title'], 'Renamed')
+
+    def test_related_model_delete_invalidates(self):
+        """Test that deleting a category invalidates the category list"""
+        other = Category.objects.create(user=self.user, name='Video', name_ar='فيديو')
+        self.client.get('/api/portfolio/categories/')
+
+        other.delete()
+
+        response = self.client.get('/api/portfolio/categories/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['count'], 1)
+
+    def test_last_login_update_does_not_invalidate(self):
+        """Test that last_login-only saves keep cached responses"""
+        self.client.get('/api/portfolio/')
+        version = get_version()
+
+        self.user.save(update_fields=['last_login'])
+
+        self.assertEqual(get_version(), version)
+        self.assertEqual(self.client.get('/api/portfolio/')['X-Cache'], 'HIT')
+
+    def test_cache_key_varies_on_language_and_query(self):
+        """Test that language and query string produce separate entries"""
+        self.client.get('/api/portfolio/')
+
+        arabic = self.client.get('/api/portfolio/', HTTP_ACCEPT_LANGUAGE='ar')
+        filtered = self.client.get('/api/portfolio/', {'category_id': self.category.id})
+
+        self.assertEqual(arabic['X-Cache'], 'MISS')
+        self.assertEqual(filtered['X-Cache'], 'MISS')
+
+    @override_settings(ALLOWED_HOSTS=['testserver', 'api.example.com'])
+    def test_cache_key_varies_on_host_and_scheme(self):
+        """Test that absolute pagination links are never served to another host or scheme"""
+        for i in range(10):
+            Portfolio.objects.create(author=self.user, title=f'More {i}', body='Body', category=self.category)
+        self.client.get('/api/portfolio/')
+
+        other_host = self.client.get('/api/portfolio/', HTTP_HOST='api.example.com')
+        https = self.client.get('/api/portfolio/', secure=True)
+
+        self.assertEqual(other_host['X-Cache'], 'MISS')
+        self.assertTrue(other_host.data['next'].startswith('http://api.example.com/'))
+        self.assertEqual(https['X-Cache'], 'MISS')
+        self.assertTrue(https.data['next'].startswith('https://testserver/'))
+
+    def test_authenticated_requests_bypass_cache(self):
+        """Test that authenticated GETs are never cached"""
+        self.client.force_authenticate(user=self.user)
+        self.client.get('/api/portfolio/')
+        response = self.client.get('/api/portfolio/')
+
+        self.assertNotIn('X-Cache', response)
+
+    @override_settings(DATABASE_REPLICAS=['replica_1'])
+    def test_responses_not_stored_while_replicas_lag(self):
+        """Test that with replicas, responses built right after a write are not cached"""
+        self.portfolio.title = 'Renamed'
+        self.portfolio.save()
+
+        self.assertFalse(is_settled())
+        self.client.get('/api/portfolio/')
+        self.assertEqual(self.client.get('/api/portfolio/')['X-Cache'], 'MISS')
+
+        caches['default'].delete(INVALIDATED_AT_KEY)
+
+        self.assertTrue(is_settled())
+        self.client.get('/api/portfolio/')
+        self.assertEqual(self.client.get('/api/portfolio/')['X-Cache'], 'HIT')
+
+    def test_stats_endpoint_reports_counters(self):
+        """Test that hit/miss counters are exposed to superusers only"""
+        self.client.get('/api/portfolio/info/')
+        self.client.get('/api/portfolio/')
+        self.client.get('/api/portfolio/')
+
+        self.assertEqual(self.client.get('/api/portfolio/cache/stats/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/api/portfolio/cache/stats/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['hits'], 1)
+        self.assertEqual(response.data['misses'], 2)
+
+
+class ConditionalGetTestCase(APITestCase):
+    """Test ETag / Last-Modified handling on portfolio and category endpoints"""
+
+    def setUp(self):
+        """Set up a clean cache, a category and a portfolio"""
+        caches['default'].clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.category = Category.objects.create(
+            user=self.user,
+            name='Photography',
+            name_ar='التصوير'
+        )
+        self.portfolio = Portfolio.objects.create(
+            author=self.user,
+            title='First',
+            body='Body',
+            category=self.category
+        )
+
+    def test_responses_carry_validators(self):
+        """Test that list and detail responses include ETag and Last-Modified"""
+        for url in ['/api/portfolio/', f'/api/portfolio/{self.portfolio.pk}/',
+                    '/api/portfolio/categories/', f'/api/portfolio/categories/{self.category.pk}/']:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, url)
+            self.assertTrue(response['ETag'].startswith('"'), url)
+            self.assertIn('Last-Modified', response, url)
+
+    def test_if_none_match_returns_304_after_one_query(self):
+        """Test that a matching ETag is answered with 304 from the aggregate query alone"""
+        etag = self.client.get('/api/portfolio/')['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/portfolio/', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_process_local_cache_never_answers_from_memoized_fingerprint(self):
+        """Test that with locmem a write this process never saw still changes the ETag"""
+        etag = self.client.get('/api/portfolio/')['ETag']
+
+        # No signal, as if the write and its version bump happened in another worker
+        Portfolio.objects.filter(pk=self.portfolio.pk).update(updated_at=timezone.now() + timedelta(seconds=5))
+
+        response = self.client.get('/api/portfolio/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_shared_cache_memoizes_fingerprint(self):
+        """Test that with a shared cache a matching ETag is answered without queries"""
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location}}
+        with override_settings(CACHES=shared):
+            etag = self.client.get('/api/portfolio/')['ETag']
+
+            with self.assertNumQueries(0):
+                response = self.client.get('/api/portfolio/', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_if_modified_since_returns_304(self):
+        """Test that If-Modified-Since at or after Last-Modified returns 304"""
+        last_modified = self.client.get(f'/api/portfolio/categories/{self.category.pk}/')['Last-Modified']
+
+        response = self.client.get(
+            f'/api/portfolio/categories/{self.category.pk}/',
+            HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_etag_changes_when_image_is_added(self):
+        """Test that adding an image to a portfolio changes the detail ETag"""
+        url = f'/api/portfolio/{self.portfolio.pk}/'
+        etag = self.client.get(url)['ETag']
+
+        PortfolioImage.objects.create(portfolio=self.portfolio, image='portfolios/new.jpg')
+
+        with mock.patch('storages.backends.gcloud.GoogleCloudStorage.url', return_value='https://storage.example.com/new.jpg'):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_changes_when_image_caption_changes(self):
+        """Test that editing an existing image invalidates the old detail ETag"""
+        url = f'/api/portfolio/{self.portfolio.pk}/'
+        image = PortfolioImage.objects.create(portfolio=self.portfolio, image='portfolios/new.jpg', caption='Before')
+
+        with mock.patch('storages.backends.gcloud.GoogleCloudStorage.url', return_value='https://storage.example.com/new.jpg'):
+            etag = self.client.get(url)['ETag']
+            image.caption = 'After'
+            image.save()
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['images'][0]['caption'], 'After')
+
+    def test_etag_varies_on_language(self):
+        """Test that each language gets its own ETag"""
+        english = self.client.get('/api/portfolio/categories/')['ETag']
+        arabic = self.client.get('/api/portfolio/categories/', HTTP_ACCEPT_LANGUAGE='ar')['ETag']
+
+        self.assertNotEqual(english, arabic)
+
+    def test_missing_detail_returns_404(self):
+        """Test that unknown objects skip validators and return 404"""
+        response = self.client.get('/api/portfolio/999999/')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn('ETag', response)
+
+
+class CursorPaginationTestCase(APITestCase):
+    """Test opt-in keyset pagination on portfolio and image listings"""
+
+    def setUp(self):
+        """Set up 25 portfolios with distinct creation times"""
+        caches['default'].clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.base_time = timezone.now() - timedelta(days=1)
+        for index in range(25):
+            self.create_portfolio(f'Portfolio {index}', self.base_time + timedelta(minutes=index))
+
+    def create_portfolio(self, title, created_at):
+        """Create a portfolio and pin its created_at"""
+        portfolio = Portfolio.objects.create(author=self.user, title=title, body='Body')
+        Portfolio.objects.filter(pk=portfolio.pk).update(created_at=created_at)
+        return portfolio
+
+    def collect_ids(self, url):
+        """Follow next links and return every id seen"""
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+        return seen
+
+    def test_cursor_mode_has_no_count(self):
+        """Test that cursor mode returns next/previous links without a count"""
+        response = self.client.get('/api/portfolio/', {'cursor': ''})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', response.data)
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertIsNone(response.data['previous'])
+        self.assertIsNotNone(response.data['next'])
+
+    def test_cursor_mode_runs_no_count_query(self):
+        """Test that no COUNT(*) is issued in cursor mode"""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/portfolio/', {'cursor': ''})
+
+        self.assertFalse(any('COUNT(' in query['sql'] and 'MAX(' not in query['sql'] for query in queries))
+
+    def test_pages_are_stable_under_concurrent_inserts(self):
+        """Test that rows inserted while scrolling never duplicate or skip items"""
+        expected = list(Portfolio.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+
+        first_page = self.client.get('/api/portfolio/', {'cursor': ''})
+        seen = [item['id'] for item in first_page.data['results']]
+
+        # New portfolios arrive at the top of the feed mid-scroll
+        for index in range(3):
+            self.create_portfolio(f'New {index}', timezone.now() + timedelta(minutes=index))
+
+        seen.extend(self.collect_ids(first_page.data['next']))
+
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(seen, expected)
+
+    def test_ties_on_created_at_are_broken_by_id(self):
+        """Test that rows sharing created_at are paged by id without loss"""
+        Portfolio.objects.update(created_at=self.base_time)
+
+        seen = self.collect_ids('/api/portfolio/?cursor=')
+
+        self.assertEqual(seen, sorted(seen, reverse=True))
+        self.assertEqual(len(seen), 25)
+
+    def test_previous_link_returns_prior_page(self):
+        """Test that the previous link walks back to the same items"""
+        first = self.client.get('/api/portfolio/', {'cursor': ''})
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+
+        self.assertEqual(
+            [item['id'] for item in back.data['results']],
+            [item['id'] for item in first.data['results']]
+        )
+
+    def test_invalid_cursor_returns_404(self):
+        """Test that tampered cursors are rejected"""
+        response = self.client.get('/api/portfolio/', {'cursor': 'not-a-cursor'})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_mode_is_unchanged(self):
+        """Test that requests without ?cursor keep page-number pagination"""
+        response = self.client.get('/api/portfolio/')
+
+        self.assertEqual(response.data['count'], 25)
+
+    def test_image_listing_supports_cursor_mode(self):
+        """Test that portfolio images can be paged by cursor"""
+        portfolio = Portfolio.objects.first()
+        PortfolioImage.objects.bulk_create([
+            PortfolioImage(portfolio=portfolio, image=f'portfolios/{n}.jpg') for n in range(12)
+        ])
+
+        with mock.patch('storages.backends.gcloud.GoogleCloudStorage.url', return_value='https://storage.example.com/x.jpg'):
+            seen = self.collect_ids(f'/api/portfolio/{portfolio.pk}/images/?cursor=')
+
+        self.assertEqual(len(set(seen)), 12)
+
+
+class ExplainQuerysetsCommandTestCase(TestCase):
+    """Test the explain_querysets index regression check"""
+
+    def setUp(self):
+        """Set up a category with portfolios and images"""
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        category = Category.objects.create(user=self.user, name='Design', name_ar='تصميم')
+        for index in range(3):
+            portfolio = Portfolio.objects.create(author=self.user, title=f'P{index}', body='Body', category=category)
+            PortfolioImage.objects.create(portfolio=portfolio, image=f'portfolios/{index}.jpg')
+
+    def test_check_passes_with_expected_indexes(self):
+        """Test that every hot view query uses its composite index"""
+        out = io.StringIO()
+        call_command('explain_querysets', '--check', stdout=out)
+
+        self.assertIn('portfolio_category_created_idx', out.getvalue())
+        self.assertNotIn('is not used', out.getvalue())
+
+
+class ImageVariantTestCase(FileSystemStorageMixin, APITestCase):
+    """Test responsive variant generation for uploaded images"""
+
+    def setUp(self):
+        """Set up a superuser, a portfolio and filesystem media storage"""
+        caches['default'].clear()
+        self.storage = self.use_filesystem_storage()
+        self.client = APIClient()
+        self.user = User.objects.create_superuser(
+            username='owner',
+            email='owner@example.com',
+            password='ownerpass123'
+        )
+        self.portfolio = Portfolio.objects.create(author=self.user, title='Shoot', body='Body')
+
+    def create_portfolio_image(self, **kwargs):
+        """Store an image through the patched storage"""
+        portfolio_image = PortfolioImage(portfolio=self.portfolio)
+        upload = self.create_image_file(**kwargs)
+        portfolio_image.image.save(upload.name, upload, save=True)
+        return portfolio_image
+
+    @override_settings(PORTFOLIO_IMAGE_VARIANT_WIDTHS=[320, 640, 1280, 2048])
+    def test_upload_generates_variants_and_srcset(self):
+        """Test that uploading an image creates WebP/JPEG variants below the original width"""
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(
+            f'/api/portfolio/{self.portfolio.pk}/images/',
+            {'image': self.create_image_file(width=1000, height=600)},
+            format='multipart'
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        run_pending()
+        response = self.client.get(f'/api/portfolio/{self.portfolio.pk}/images/{response.data["id"]}/')
+
+        variants = PortfolioImageVariant.objects.filter(source_id=response.data['id'])
+        self.assertEqual(
+            sorted((variant.format, variant.width, variant.height) for variant in variants),
+            [('jpeg', 320, 192), ('jpeg', 640, 384), ('webp', 320, 192), ('webp', 640, 384)]
+        )
+        for variant in variants:
+            self.assertTrue(self.storage.exists(variant.image.name))
+        self.assertIn('320w', response.data['srcset']['webp'])
+        self.assertIn('640w', response.data['srcset']['jpeg'])
+
+    def test_variants_are_encoded_in_their_format(self):
+        """Test that stored variant files decode as WebP and JPEG"""
+        variants = generate_variants(self.create_portfolio_image(width=700, height=700))
+
+        for variant in variants:
+            with self.storage.open(variant.image.name) as stored:
+                self.assertEqual(Image.open(stored).format, {'webp': 'WEBP', 'jpeg': 'JPEG'}[variant.format])
+
+    def test_small_images_are_not_upscaled(self):
+        """Test that images narrower than every width keep their own size"""
+        variants = generate_variants(self.create_portfolio_image(width=200, height=100))
+
+        self.assertEqual({variant.width for variant in variants}, {200})
+
+    def test_transparent_png_is_flattened_for_jpeg(self):
+        """Test that RGBA sources still produce JPEG variants"""
+        variants = generate_variants(self.create_portfolio_image(
+            width=400, height=400, image_format='PNG', mode='RGBA', name='alpha.png'
+        ))
+
+        self.assertIn('jpeg', {variant.format for variant in variants})
+
+    def test_regeneration_replaces_variants(self):
+        """Test that generating twice leaves one set of variants"""
+        portfolio_image = self.create_portfolio_image(width=700, height=500)
+        generate_variants(portfolio_image)
+        generate_variants(portfolio_image)
+
+        self.assertEqual(portfolio_image.variants.count(), 4)
+
+
+class BackgroundImageProcessingTestCase(FileSystemStorageMixin, APITestCase):
+    """Test that uploads return immediately and are finished by the job worker"""
+
+    def setUp(self):
+        """Set up a superuser, a portfolio and filesystem media storage"""
+        caches['default'].clear()
+        self.storage = self.use_filesystem_storage()
+        self.client = APIClient()
+        self.user = User.objects.create_superuser(
+            username='owner',
+            email='owner@example.com',
+            password='ownerpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.portfolio = Portfolio.objects.create(author=self.user, title='Shoot', body='Body')
+
+    def upload(self, **kwargs):
+        """Post one image to the portfolio"""
+        return self.client.post(
+            f'/api/portfolio/{self.portfolio.pk}/images/',
+            {'image': self.create_image_file(**kwargs), 'caption': 'Sunset'},
+            format='multipart'
+        )
+
+    def test_upload_returns_202_with_pending_status(self):
+        """Test that the upload is accepted before any storage work happens"""
+        response = self.upload()
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['processing_status'], PortfolioImage.STATUS_PENDING)
+        self.assertIsNone(response.data['image'])
+        self.assertEqual(response.data['caption'], 'Sunset')
+        job = Job.objects.get()
+        self.assertEqual(job.payload['image_id'], response.data['id'])
+
+    def test_worker_moves_upload_to_storage(self):
+        """Test that running the job stores the file, probes dimensions and builds variants"""
+        response = self.upload(width=800, height=500)
+
+        self.assertEqual(run_pending(), 1)
+
+        portfolio_image = PortfolioImage.objects.get(pk=response.data['id'])
+        self.assertEqual(portfolio_image.processing_status, PortfolioImage.STATUS_READY)
+        self.assertTrue(self.storage.exists(portfolio_image.image.name))
+        self.assertEqual(portfolio_image.gcs_object_name, portfolio_image.image.name)
+        self.assertEqual((portfolio_image.width, portfolio_image.height), (800, 500))
+        self.assertTrue(portfolio_image.variants.exists())
+        staging = FileSystemStorage(location=settings.PORTFOLIO_UPLOAD_STAGING_ROOT)
+        self.assertEqual(staging.listdir('')[1], [])
+
+    def test_client_supplied_dimensions_are_kept(self):
+        """Test that width/height sent by the client are not overwritten"""
+        response = self.client.post(
+            f'/api/portfolio/{self.portfolio.pk}/images/',
+            {'image': self.create_image_file(width=800, height=500), 'width': 400, 'height': 250},
+            format='multipart'
+        )
+        run_pending()
+
+        portfolio_image = PortfolioImage.objects.get(pk=response.data['id'])
+        self.assertEqual((portfolio_image.width, portfolio_image.height), (400, 250))
+
+    def test_final_failure_marks_image_failed(self):
+        """Test that an image whose job exhausts its retries is marked failed and its staged file removed"""
+        response = self.upload()
+        Job.objects.update(max_attempts=1)
+
+        with mock.patch('portfolios.tasks.generate_variants', side_effect=OSError('disk full')):
+            run_pending()
+
+        portfolio_image = PortfolioImage.objects.get(pk=response.data['id'])
+        self.assertEqual(portfolio_image.processing_status, PortfolioImage.STATUS_FAILED)
+        self.assertEqual(Job.objects.get().status, Job.STATUS_FAILED)
+        staging = FileSystemStorage(location=settings.PORTFOLIO_UPLOAD_STAGING_ROOT)
+        self.assertEqual(staging.listdir('')[1], [])
+
+
+class ImageHeaderTestCase(FileSystemStorageMixin, APITestCase):
+    """Test header-only dimension extraction and the backfill command"""
+
+    def setUp(self):
+        """Set up a superuser, a portfolio and filesystem media storage"""
+        caches['default'].clear()
+        self.storage = self.use_filesystem_storage()
+        self.client = APIClient()
+        self.user = User.objects.create_superuser(
+            username='owner',
+            email='owner@example.com',
+            password='ownerpass123'
+        )
+        self.portfolio = Portfolio.objects.create(author=self.user, title='Shoot', body='Body')
+
+    def create_rotated_jpeg(self, width=600, height=400, orientation=6):
+        """Create a JPEG whose EXIF orientation rotates it by 90 degrees"""
+        exif = Image.Exif()
+        exif[0x0112] = orientation
+        image_io = io.BytesIO()
+        Image.new('RGB', (width, height), color='blue').save(image_io, format='JPEG', exif=exif.tobytes())
+        image_io.name = 'rotated.jpg'
+        image_io.seek(0)
+        return image_io
+
+    def test_header_reports_size_and_orientation(self):
+        """Test that 90-degree EXIF orientations swap width and height"""
+        self.assertEqual(read_image_header(self.create_rotated_jpeg()), (400, 600, 6))
+        self.assertEqual(read_image_header(self.create_image_file(width=300, height=200)), (300, 200, 1))
+
+    def test_header_read_stops_early(self):
+        """Test that only the first chunk of a large image is read"""
+        noise = Image.effect_noise((1200, 1200), 100).convert('RGB')
+        image_io = io.BytesIO()
+        noise.save(image_io, format='JPEG', quality=95)
+        size = image_io.tell()
+        image_io.seek(0)
+
+        self.assertEqual(read_image_header(image_io)[:2], (1200, 1200))
+        self.assertLess(image_io.tell(), size // 10)
+
+    def test_blob_range_reader_fetches_only_needed_ranges(self):
+        """Test that GCS reads use ranged downloads instead of the whole object"""
+        data = self.create_image_file(width=640, height=480).getvalue()
+        requested = []
+
+        class FakeBlob:
+            def download_as_bytes(self, start, end):
+                requested.append((start, end))
+                return data[start:end + 1]
+
+        self.assertEqual(read_image_header(BlobRangeReader(FakeBlob())), (640, 480, 1))
+        self.assertEqual(requested[0], (0, 8 * 1024 - 1))
+
+    def test_non_image_returns_none(self):
+        """Test that unreadable data yields no header"""
+        self.assertIsNone(read_image_header(io.BytesIO(b'not an image' * 10)))
+
+    def test_upload_records_dimensions_immediately(self):
+        """Test that the 202 upload response already carries probed dimensions"""
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(
+            f'/api/portfolio/{self.portfolio.pk}/images/',
+            {'image': self.create_rotated_jpeg(width=900, height=300)},
+            format='multipart'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual((response.data['width'], response.data['height']), (300, 900))
+        self.assertEqual(response.data['orientation'], 6)
+
+    def test_backfill_command_fills_missing_dimensions(self):
+        """Test that the backfill command probes stored images in parallel batches"""
+        for index in range(5):
+            portfolio_image = PortfolioImage(portfolio=self.portfolio)
+            portfolio_image.image.save(f'photo{index}.jpg', self.create_rotated_jpeg(width=500 + index), save=True)
+        broken = PortfolioImage(portfolio=self.portfolio)
+        broken.image.save('broken.jpg', io.BytesIO(b'garbage'), save=True)
+        out = io.StringIO()
+
+        call_command('backfill_image_dimensions', '--batch-size', '2', '--workers', '3', stdout=out)
+
+        filled = PortfolioImage.objects.exclude(pk=broken.pk).order_by('id')
+        self.assertEqual(
+            [(image.width, image.height, image.orientation) for image in filled],
+            [(400, 500 + index, 6) for index in range(5)]
+        )
+        self.assertIsNone(PortfolioImage.objects.get(pk=broken.pk).width)
+        self.assertIn('Backfilled dimensions for 5 image(s)', out.getvalue())
+
+
+class BatchImageUploadTestCase(FileSystemStorageMixin, APITestCase):
+    """Test the multi-file image upload endpoint"""
+
+    def setUp(self):
+        """Set up a superuser, a portfolio and filesystem media storage"""
+        caches['default'].clear()
+        self.storage = self.use_filesystem_storage()
+        self.client = APIClient()
+        self.user = User.objects.create_superuser(
+            username='owner',
+            email='owner@example.com',
+            password='ownerpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.portfolio = Portfolio.objects.create(author=self.user, title='Shoot', body='Body')
+        self.url = f'/api/portfolio/{self.portfolio.pk}/images/batch/'
+
+    def test_batch_upload_creates_all_images_in_one_insert(self):
+        """Test that every file is stored and the rows are created with a single INSERT"""
+        files = [self.create_image_file(width=400 + index, height=300, name=f'photo{index}.jpg') for index in range(3)]
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(self.url, {'images': files, 'captions': ['One', 'Two', 'Three']}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        image_inserts = [q for q in ctx.captured_queries if q['sql'].startswith('INSERT INTO "portfolios_portfolioimage"')]
+        self.assertEqual(len(image_inserts), 1)
+        self.assertEqual([result['status'] for result in response.data['results']], [201, 201, 201])
+        images = PortfolioImage.objects.order_by('id')
+        self.assertEqual([image.caption for image in images], ['One', 'Two', 'Three'])
+        self.assertEqual([image.width for image in images], [400, 401, 402])
+        for image in images:
+            self.assertTrue(self.storage.exists(image.image.name))
+            self.assertEqual(image.processing_status, PortfolioImage.STATUS_PROCESSING)
+        self.assertEqual(Job.objects.count(), 3)
+
+    def test_worker_builds_variants_for_batch(self):
+        """Test that the queued jobs build variants and mark the images ready"""
+        files = [self.create_image_file(name=f'photo{index}.jpg') for index in range(2)]
+        self.client.post(self.url, {'images': files}, format='multipart')
+
+        self.assertEqual(run_pending(), 2)
+
+        for image in PortfolioImage.objects.all():
+            self.assertEqual(image.processing_status, PortfolioImage.STATUS_READY)
+            self.assertTrue(image.variants.exists())
+
+    def test_partial_failure_returns_207(self):
+        """Test that invalid files are reported per file while valid ones are created"""
+        broken = io.BytesIO(b'not an image')
+        broken.name = 'notes.txt'
+        files = [self.create_image_file(name='good.jpg'), broken]
+
+        response = self.client.post(self.url, {'images': files}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        good, bad = response.data['results']
+        self.assertEqual((good['filename'], good['status']), ('good.jpg', 201))
+        self.assertEqual(good['image']['id'], PortfolioImage.objects.get().pk)
+        self.assertEqual((bad['filename'], bad['status']), ('notes.txt', 400))
+        self.assertIn('image', bad['errors'])
+
+    def test_storage_failure_is_reported_per_file(self):
+        """Test that a file that cannot be written is reported without failing the batch"""
+        files = [self.create_image_file(name='good.jpg'), self.create_image_file(name='flaky.jpg')]
+        original_save = self.storage.save
+
+        def flaky_save(name, content, max_length=None):
+            if 'flaky' in name:
+                raise OSError('connection reset')
+            return original_save(name, content, max_length=max_length)
+
+        with mock.patch.object(self.storage, 'save', side_effect=flaky_save):
+            response = self.client.post(self.url, {'images': files}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([result['status'] for result in response.data['results']], [201, 502])
+        self.assertEqual(PortfolioImage.objects.count(), 1)
+
+    def test_all_invalid_returns_400(self):
+        """Test that a batch with no valid files creates nothing"""
+        broken = io.BytesIO(b'not an image')
+        broken.name = 'notes.txt'
+
+        response = self.client.post(self.url, {'images': [broken]}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(PortfolioImage.objects.exists())
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(PORTFOLIO_BATCH_UPLOAD_MAX_FILES=2)
+    def test_batch_size_is_limited(self):
+        """Test that batches over the configured limit are rejected"""
+        files = [self.create_image_file(name=f'photo{index}.jpg') for index in range(3)]
+
+        response = self.client.post(self.url, {'images': files}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(PortfolioImage.objects.exists())
+
+    def test_requires_superuser(self):
+        """Test that anonymous users cannot upload"""
+        self.client.force_authenticate(user=None)
+
+        response = self.client.post(self.url, {'images': [self.create_image_file()]}, format='multipart')
+
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+
+@override_settings(PORTFOLIO_DIRECT_UPLOAD_BACKEND='portfolios.direct_upload.LocalDirectUploadBackend')
+class DirectUploadTestCase(FileSystemStorageMixin, APITestCase):
+    """Test the signed upload URL flow with the local backend"""
+
+    def setUp(self):
+        """Set up a superuser, a portfolio and filesystem media storage"""
+        caches['default'].clear()
+        self.storage = self.use_filesystem_storage()
+        self.client = APIClient()
+        self.user = User.objects.create_superuser(
+            username='owner',
+            email='owner@example.com',
+            password='ownerpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.portfolio = Portfolio.objects.create(author=self.user, title='Shoot', body='Body')
+
+    def request_slot(self, content_type='image/jpeg'):
+        """Ask for an upload URL"""
+        response = self.client.post(
+            f'/api/portfolio/{self.portfolio.pk}/images/upload-url/',
+            {'filename': 'sunset.jpg', 'content_type': content_type},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data
+
+    def put_bytes(self, slot, body, content_type='image/jpeg'):
+        """Send the file to the signed URL without credentials"""
+        return APIClient().put(slot['upload']['url'], body, content_type=content_type)
+
+    def complete(self, slot, **extra):
+        """Confirm the upload"""
+        return self.client.post(
+            f'/api/portfolio/{self.portfolio.pk}/images/complete/',
+            {'token': slot['token'], **extra},
+            format='json'
+        )
+
+    def test_two_step_upload_creates_image(self):
+        """Test that an uploaded object becomes a PortfolioImage on completion"""
+        slot = self.request_slot()
+        self.assertEqual(slot['upload']['method'], 'PUT')
+        self.assertTrue(slot['object_name'].startswith('portfolios/'))
+
+        put_response = self.put_bytes(slot, self.create_image_file(width=800, height=500).read())
+        self.assertEqual(put_response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(self.storage.exists(slot['object_name']))
+
+        response = self.complete(slot, caption='Sunset')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        portfolio_image = PortfolioImage.objects.get(pk=response.data['id'])
+        self.assertEqual(portfolio_image.gcs_object_name, slot['object_name'])
+        self.assertEqual(portfolio_image.image.name, slot['object_name'])
+        self.assertEqual((portfolio_image.width, portfolio_image.height), (800, 500))
+        self.assertEqual(portfolio_image.caption, 'Sunset')
+
+        run_pending()
+        portfolio_image.refresh_from_db()
+        self.assertEqual(portfolio_image.processing_status, PortfolioImage.STATUS_READY)
+        self.assertTrue(portfolio_image.variants.exists())
+
+    def test_complete_without_upload_fails(self):
+        """Test that completion verifies the object exists"""
+        slot = self.request_slot()
+
+        response = self.complete(slot)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(PortfolioImage.objects.exists())
+
+    def test_complete_rejects_non_images(self):
+        """Test that an object that is not an image is deleted and refused"""
+        slot = self.request_slot()
+        self.put_bytes(slot, b'not an image')
+
+        response = self.complete(slot)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(self.storage.exists(slot['object_name']))
+
+    def test_complete_twice_conflicts(self):
+        """Test that a token can only create one image"""
+        slot = self.request_slot()
+        self.put_bytes(slot, self.create_image_file().read())
+        self.complete(slot)
+
+        response = self.complete(slot)
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(PortfolioImage.objects.count(), 1)
+
+    def test_token_is_bound_to_portfolio(self):
+        """Test that a token issued for one portfolio cannot complete on another"""
+        slot = self.request_slot()
+        self.put_bytes(slot, self.create_image_file().read())
+        other = Portfolio.objects.create(author=self.user, title='Other', body='Body')
+
+        response = self.client.post(f'/api/portfolio/{other.pk}/images/complete/', {'token': slot['token']}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_put_rejects_tampered_token_and_wrong_type(self):
+        """Test that the local PUT endpoint enforces the signed constraints"""
+        slot = self.request_slot()
+        body = self.create_image_file().read()
+
+        self.assertEqual(self.put_bytes(slot, body, content_type='image/png').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(APIClient().put('/api/portfolio/uploads/forged/', body, content_type='image/jpeg').status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(self.storage.exists(slot['object_name']))
+
+    def test_put_streams_bodies_over_memory_limit(self):
+        """Test that the local PUT accepts bodies above DATA_UPLOAD_MAX_MEMORY_SIZE up to the slot size"""
+        slot = self.request_slot()
+        body = self.create_image_file().read()
+        body += b'\0' * (3 * 1024 * 1024 - len(body))
+        self.assertGreater(len(body), settings.DATA_UPLOAD_MAX_MEMORY_SIZE)
+
+        response = self.put_bytes(slot, body)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.storage.size(slot['object_name']), len(body))
+
+    @override_settings(PORTFOLIO_DIRECT_UPLOAD_MAX_SIZE=1024)
+    def test_put_rejects_bodies_over_slot_size(self):
+        """Test that the local PUT refuses bodies larger than the signed max size"""
+        slot = self.request_slot()
+
+        response = self.put_bytes(slot, b'\0' * 2048)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(self.storage.exists(slot['object_name']))
+
+    def test_rejects_unsupported_content_type(self):
+        """Test that only image content types get an upload URL"""
+        response = self.client.post(
+            f'/api/portfolio/{self.portfolio.pk}/images/upload-url/',
+            {'filename': 'notes.txt', 'content_type': 'text/plain'},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_gcs_backend_signs_put_with_size_limit(self):
+        """Test that the GCS backend requests a V4 signed PUT bound to type and size"""
+        from .direct_upload import GCSDirectUploadBackend
+        storage = mock.Mock()
+        storage._normalize_name.side_effect = lambda name: f'media/{name}'
+        storage.bucket.blob.return_value.generate_signed_url.return_value = 'https://storage.googleapis.com/signed'
+
+        upload = GCSDirectUploadBackend(storage).create_upload(None, 'portfolios/images/a.jpg', 'image/jpeg', 1024, 60)
+
+        storage.bucket.blob.assert_called_once_with('media/portfolios/images/a.jpg')
+        kwargs = storage.bucket.blob.return_value.generate_signed_url.call_args.kwargs
+        self.assertEqual((kwargs['version'], kwargs['method'], kwargs['content_type']), ('v4', 'PUT', 'image/jpeg'))
+        self.assertEqual(kwargs['headers'], {'x-goog-content-length-range': '0,1024'})
+        self.assertEqual(upload['url'], 'https://storage.googleapis.com/signed')
+        self.assertEqual(upload['headers']['x-goog-content-length-range'], '0,1024')
+
+
+class PortfolioInfoDocumentTestCase(APITestCase):
+    """Test the precomputed portfolio info document"""
+
+    def setUp(self):
+        """Set up a shared cache, the owner, and point the migrated portfolio info at them"""
+        # File-based, so the document is cached as it is in Redis rather than rebuilt per request
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        shared_cache = override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location,
+        }})
+        shared_cache.enable()
+        self.addCleanup(shared_cache.disable)
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='owner',
+            email='owner@example.com',
+            password='ownerpass123',
+            first_name='Sara',
+            last_name='Ali',
+            job_title='Photographer'
+        )
+        self.info = PortfolioInfo.objects.order_by('pk').first()
+        self.info.user = self.user
+        self.info.save()
+
+    def test_steady_state_runs_no_queries(self):
+        """Test that once built the document is served without touching the database"""
+        first = self.client.get('/api/portfolio/info/')
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/portfolio/info/')
+
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(response.data, first.data)
+        self.assertEqual(response.data['full_name'], 'Sara Ali')
+        self.assertEqual(response.data['job_title'], 'Photographer')
+
+    def test_first_build_is_a_single_query(self):
+        """Test that building the document fetches the info and its user together"""
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get('/api/portfolio/info/')
+
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_user_save_rebuilds_document(self):
+        """Test that saving the owner refreshes every language after commit"""
+        self.client.get('/api/portfolio/info/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.job_title = 'Designer'
+            self.user.save()
+
+        with CaptureQueriesContext(connection) as ctx:
+            english = self.client.get('/api/portfolio/info/')
+            arabic = self.client.get('/api/portfolio/info/', HTTP_ACCEPT_LANGUAGE='ar')
+
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(english.data['job_title'], 'Designer')
+        self.assertEqual(arabic.data['job_title'], 'Designer')
+
+    def test_last_login_update_does_not_rebuild(self):
+        """Test that logins do not trigger a rebuild"""
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.user.save(update_fields=['last_login'])
+
+        self.assertEqual(callbacks, [])
+
+    def test_info_save_rebuilds_document(self):
+        """Test that saving PortfolioInfo refreshes the document"""
+        self.client.get('/api/portfolio/info/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.info.portfolio_title = 'New Title'
+            self.info.save()
+
+        self.assertEqual(self.client.get('/api/portfolio/info/').data['portfolio_title'], 'New Title')
+
+    def test_etag_comes_from_document(self):
+        """Test that a matching If-None-Match gets a 304 and changes after a save"""
+        etag = self.client.get('/api/portfolio/info/')['ETag']
+
+        self.assertEqual(self.client.get('/api/portfolio/info/', HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.info.portfolio_title = 'New Title'
+            self.info.save()
+
+        response = self.client.get('/api/portfolio/info/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_process_local_cache_never_serves_stale_document(self):
+        """Test that with locmem a change this process never rebuilt is served at once"""
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            self.client.get('/api/portfolio/info/')
+
+            # No signal, as if the save and its rebuild happened in another worker
+            PortfolioInfo.objects.filter(pk=self.info.pk).update(portfolio_title='New Title')
+
+            self.assertEqual(self.client.get('/api/portfolio/info/').data['portfolio_title'], 'New Title')
+
+    def test_missing_info_returns_404(self):
+        """Test that deleting the info is reflected as a 404"""
+        with self.captureOnCommitCallbacks(execute=True):
+            PortfolioInfo.objects.all().delete()
+
+        self.assertEqual(self.client.get('/api/portfolio/info/').status_code, status.HTTP_404_NOT_FOUND)
+
+
+class PortfolioSearchTestCase(APITestCase):
+    """Test the search endpoint (substring fallback on SQLite)"""
+
+    def setUp(self):
+        """Set up portfolios with text in different fields"""
+        caches['default'].clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.category = Category.objects.create(user=self.user, name='Weddings', name_ar='أعراس')
+        self.in_title = Portfolio.objects.create(author=self.user, title='Sunset wedding', body='Beach')
+        self.in_body = Portfolio.objects.create(author=self.user, title='Coast', body='A sunset over the sea')
+        self.in_category = Portfolio.objects.create(author=self.user, title='Ceremony', body='Hall', category=self.category)
+        self.in_caption = Portfolio.objects.create(author=self.user, title='Mountains', body='Snow')
+        PortfolioImage.objects.create(portfolio=self.in_caption, caption='Alpine sunset')
+        Portfolio.objects.create(author=self.user, title='Studio', body='Portraits')
+
+    def search(self, query):
+        """Run a search and return the ids in result order"""
+        response = self.client.get('/api/portfolio/search/', {'q': query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['id'] for item in response.data['results']]
+
+    def test_matches_title_body_and_captions_ranked(self):
+        """Test that title matches rank above body and caption matches"""
+        ids = self.search('sunset')
+
+        self.assertEqual(ids[0], self.in_title.pk)
+        self.assertCountEqual(ids, [self.in_title.pk, self.in_body.pk, self.in_caption.pk])
+
+    def test_matches_arabic_category_name(self):
+        """Test that Arabic category names are searchable"""
+        self.assertEqual(self.search('أعراس'), [self.in_category.pk])
+
+    def test_all_terms_must_match(self):
+        """Test that multi-word queries require every word"""
+        self.assertEqual(self.search('sunset wedding'), [self.in_title.pk])
+
+    def test_results_are_paginated(self):
+        """Test that results use the standard page envelope"""
+        response = self.client.get('/api/portfolio/search/', {'q': 'sunset'})
+
+        self.assertEqual(response.data['count'], 3)
+        self.assertIn('next', response.data)
+
+    def test_query_is_required(self):
+        """Test that an empty query is rejected"""
+        response = self.client.get('/api/portfolio/search/', {'q': '  '})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_vector_maintenance_is_skipped_off_postgres(self):
+        """Test that saves do not run tsvector updates on SQLite"""
+        with CaptureQueriesContext(connection) as ctx:
+            self.in_title.title = 'Renamed'
+            self.in_title.save()
+
+        self.assertFalse(any('to_tsvector' in q['sql'] for q in ctx.captured_queries))
+
+    def test_postgres_query_uses_vector_and_rank(self):
+        """Test that on Postgres the search filters and ranks by the tsvector in both languages"""
+        from . import search
+
+        with mock.patch.object(search, 'is_full_text_supported', return_value=True):
+            sql = str(search.search_portfolios(Portfolio.objects.all(), 'sunset').query)
+
+        self.assertIn('"search_vector" @@', sql)
+        self.assertIn('ts_rank(', sql)
+        self.assertIn('websearch_to_tsquery(english::regconfig', sql)
+        self.assertIn('websearch_to_tsquery(arabic::regconfig', sql)
+
+
+class CompactRepresentationTestCase(APITestCase):
+    """Test the opt-in single-language representation"""
+
+    def setUp(self):
+        """Set up a bilingual category and portfolio info"""
+        caches['default'].clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='owner',
+            email='owner@example.com',
+            password='ownerpass123',
+            bio='Photographer in Riyadh',
+            bio_ar='مصورة في الرياض',
+            about_me='About me'
+        )
+        self.info = PortfolioInfo.objects.order_by('pk').first()
+        self.info.user = self.user
+        self.info.portfolio_title = 'My Work'
+        self.info.portfolio_title_ar = 'أعمالي'
+        self.info.save()
+        self.category = Category.objects.create(
+            user=self.user,
+            name='Photography',
+            name_ar='التصوير',
+            description='Photos'
+        )
+
+    def get_category(self, response):
+        """Return the test category from a category list response"""
+        return next(item for item in response.data['results'] if item['id'] == self.category.pk)
+
+    def test_default_keeps_both_languages(self):
+        """Test that responses are unchanged without the opt-in"""
+        response = self.client.get('/api/portfolio/categories/')
+
+        category = self.get_category(response)
+        self.assertEqual(category['name'], 'Photography')
+        self.assertEqual(category['name_ar'], 'التصوير')
+
+    def test_lang_parameter_selects_language(self):
+        """Test that ?lang= emits one field per attribute in that language"""
+        english = self.get_category(self.client.get('/api/portfolio/categories/?lang=en'))
+        arabic = self.get_category(self.client.get('/api/portfolio/categories/?lang=ar'))
+
+        self.assertEqual(english['name'], 'Photography')
+        self.assertEqual(arabic['name'], 'التصوير')
+        self.assertNotIn('name_ar', english)
+        self.assertNotIn('name_ar', arabic)
+        self.assertNotIn('description_ar', arabic)
+
+    def test_empty_translation_falls_back_to_english(self):
+        """Test that a missing Arabic value keeps the English one"""
+        arabic = self.get_category(self.client.get('/api/portfolio/categories/?lang=ar'))
+
+        self.assertEqual(arabic['description'], 'Photos')
+
+    def test_compact_uses_accept_language(self):
+        """Test that ?compact=1 follows the negotiated language and caches per language"""
+        arabic = self.client.get('/api/portfolio/categories/?compact=1', HTTP_ACCEPT_LANGUAGE='ar')
+        english = self.client.get('/api/portfolio/categories/?compact=1', HTTP_ACCEPT_LANGUAGE='en')
+
+        self.assertEqual(self.get_category(arabic)['name'], 'التصوير')
+        self.assertEqual(self.get_category(english)['name'], 'Photography')
+        self.assertEqual(english['X-Cache'], 'MISS')
+
+    def test_info_compact_document(self):
+        """Test that the info document is localized with its own ETag"""
+        full = self.client.get('/api/portfolio/info/')
+        arabic = self.client.get('/api/portfolio/info/?lang=ar')
+        english = self.client.get('/api/portfolio/info/?lang=en')
+
+        self.assertEqual(arabic.data['portfolio_title'], 'أعمالي')
+        self.assertEqual(arabic.data['bio'], 'مصورة في الرياض')
+        self.assertEqual(arabic.data['about_me'], 'About me')
+        self.assertNotIn('bio_ar', arabic.data)
+        self.assertEqual(english.data['portfolio_title'], 'My Work')
+        self.assertIn('bio_ar', full.data)
+        self.assertEqual(len({full['ETag'], arabic['ETag'], english['ETag']}), 3)
+
+        cached = self.client.get('/api/portfolio/info/?lang=ar', HTTP_IF_NONE_MATCH=arabic['ETag'])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class SparseFieldsetTestCase(APITestCase):
+    """Test ?fields= and ?expand= on the portfolio endpoints"""
+
+    def setUp(self):
+        """Set up portfolios with a category and images"""
+        caches['default'].clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.category = Category.objects.create(
+            user=self.user,
+            name='Photography',
+            name_ar='التصوير',
+            features=['Editing']
+        )
+        self.portfolio = Portfolio.objects.create(author=self.user, title='Grid', body='Long body', category=self.category)
+        self.old_image = PortfolioImage.objects.create(portfolio=self.portfolio, caption='Old')
+        self.new_image = PortfolioImage.objects.create(portfolio=self.portfolio, caption='New')
+        PortfolioImage.objects.filter(pk=self.old_image.pk).update(created_at=timezone.now() - timedelta(days=1))
+        Portfolio.objects.create(author=self.user, title='Empty', body='No images')
+
+    def test_default_representation_unchanged(self):
+        """Test that without parameters every default field is returned and cover_image is not"""
+        response = self.client.get(f'/api/portfolio/{self.portfolio.pk}/')
+
+        self.assertIn('body', response.data)
+        self.assertEqual(len(response.data['images']), 2)
+        self.assertEqual(response.data['category']['features'], ['Editing'])
+        self.assertNotIn('cover_image', response.data)
+
+    def test_grid_fields(self):
+        """Test the grid selection renders only the requested fields"""
+        response = self.client.get('/api/portfolio/', {'fields': 'id,title,category.slug,cover_image.caption'})
+
+        item = next(item for item in response.data['results'] if item['id'] == self.portfolio.pk)
+        self.assertEqual(item, {
+            'id': self.portfolio.pk,
+            'title': 'Grid',
+            'category': {'slug': 'photography'},
+            'cover_image': {'caption': 'New'},
+        })
+        empty = next(item for item in response.data['results'] if item['id'] != self.portfolio.pk)
+        self.assertIsNone(empty['cover_image'])
+
+    def test_grid_fields_skip_unused_columns_and_relations(self):
+        """Test that unselected columns and relations are never queried"""
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get('/api/portfolio/', {'fields': 'id,title,category.slug,cover_image.caption'})
+
+        # The first query is the conditional GET fingerprint
+        sql = '\n'.join(query['sql'] for query in ctx.captured_queries[1:])
+        self.assertNotIn('"body"', sql)
+        self.assertNotIn('"features"', sql)
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn('portfolioimagevariant', sql)
+
+    def test_expand_adds_cover_image(self):
+        """Test that ?expand= adds expandable fields to the default set"""
+        response = self.client.get(f'/api/portfolio/{self.portfolio.pk}/', {'expand': 'cover_image'})
+
+        self.assertIn('body', response.data)
+        self.assertEqual(response.data['cover_image']['id'], self.new_image.pk)
+
+    def test_query_count_with_sparse_fields(self):
+        """Test that a sparse list without images runs only the count and page queries"""
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/portfolio/', {'fields': 'id,title,category'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(ctx.captured_queries), 3)
+
+    def test_unknown_fields_are_rejected(self):
+        """Test that unknown top-level names fail with 400 listing them"""
+        response = self.client.get('/api/portfolio/', {'fields': 'id,nope'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('nope', str(response.data['fields']))
+
+    def test_unknown_nested_fields_are_rejected(self):
+        """Test that unknown nested names and sub-fields of plain fields fail with 400"""
+        response = self.client.get(f'/api/portfolio/{self.portfolio.pk}/', {'fields': 'id,category.nope,title.x'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        message = str(response.data['fields'])
+        self.assertIn('category.nope', message)
+        self.assertIn('title.x', message)
+
+    def test_unknown_expand_names_are_rejected(self):
+        """Test that ?expand= names outside Meta.expandable_fields, nested or not, fail with 400"""
+        response = self.client.get(f'/api/portfolio/{self.portfolio.pk}/', {'expand': 'cover_image,nope,title,category.nope'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['expand'], ['Unknown fields: category.nope, nope, title.'])
+
+    def test_unknown_fields_rejected_on_empty_page(self):
+        """Test that validation does not depend on rows being serialized"""
+        response = self.client.get('/api/portfolio/', {'fields': 'nope', 'category_id': 999999})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class FastJSONRendererTestCase(APITestCase):
+    """Test that the orjson-backed renderer and parser match DRF's JSON classes"""
+
+    def setUp(self):
+        """Set up a portfolio payload plus values that need the DRF encoder"""
+        from config.renderers import FastJSONRenderer
+        from rest_framework.renderers import JSONRenderer
+
+        self.fast = FastJSONRenderer()
+        self.stdlib = JSONRenderer()
+        user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        category = Category.objects.create(user=user, name='Photography', name_ar='التصوير', features=['Editing'])
+        portfolio = Portfolio.objects.create(author=user, title='Sunset line', body='Beach', category=category)
+        PortfolioImage.objects.create(portfolio=portfolio, caption='Alpine')
+        self.payload = {
+            'results': PortfolioSerializer(Portfolio.objects.with_related(), many=True).data,
+            'detail': _('Portfolio info not found'),
+            'price': Decimal('12.50'),
+            'at': timezone.now(),
+            'day': timezone.now().date(),
+            'token': uuid.uuid4(),
+            'ids': {1: 'one'},
+        }
+
+    def test_output_matches_drf(self):
+        """Test byte-for-byte equality with JSONRenderer"""
+        self.assertEqual(self.fast.render(self.payload), self.stdlib.render(self.payload))
+        self.assertIn(b'\\u2028', self.fast.render(self.payload))
+
+    @skipUnless(orjson, 'orjson is not installed')
+    def test_orjson_renders_without_stdlib(self):
+        """Test that supported payloads never reach json.dumps"""
+        with mock.patch('rest_framework.renderers.json.dumps', side_effect=AssertionError):
+            self.fast.render(self.payload)
+
+    def test_unsupported_values_fall_back(self):
+        """Test that integers beyond 64 bits are rendered by DRF"""
+        payload = {'huge': 2 ** 70}
+        self.assertEqual(self.fast.render(payload), self.stdlib.render(payload))
+
+    def test_stdlib_fallback(self):
+        """Test that the renderer still works without orjson installed"""
+        with mock.patch('config.renderers.orjson', None):
+            self.assertEqual(self.fast.render(self.payload), self.stdlib.render(self.payload))
+
+    def test_indent_uses_drf(self):
+        """Test that indented output is rendered by DRF"""
+        self.assertEqual(
+            self.fast.render(self.payload, 'application/json; indent=2'),
+            self.stdlib.render(self.payload, 'application/json; indent=2'),
+        )
+
+    def test_parser(self):
+        """Test parsing, and that malformed JSON and NaN are rejected"""
+        from config.renderers import FastJSONParser
+        from rest_framework.exceptions import ParseError
+
+        parser = FastJSONParser()
+        self.assertEqual(parser.parse(io.BytesIO('{"name": "تصميم"}'.encode('utf-8'))), {'name': 'تصميم'})
+        for body in (b'{"name":', b'{"value": NaN}'):
+            with self.assertRaises(ParseError):
+                parser.parse(io.BytesIO(body))
+
+    def test_api_uses_fast_renderer(self):
+        """Test that API requests and JSON bodies go through the configured classes"""
+        response = self.client.get('/api/portfolio/')
+
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(type(response.accepted_renderer).__name__, 'FastJSONRenderer')
+
+
+@override_settings(PORTFOLIO_RESPONSE_CACHE_ENABLED=False)
+class FieldPlanParityTestCase(FileSystemStorageMixin, APITestCase):
+    """Test that compiled field plans render exactly what DRF renders"""
+
+    def setUp(self):
+        """Set up portfolios with a category, images and variants"""
+        self.use_filesystem_storage()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        self.category = Category.objects.create(
+            user=self.user,
+            name='Photography',
+            name_ar='التصوير',
+            description='Photos',
+            features=['Editing', {'name': 'Prints'}]
+        )
+        self.portfolio = Portfolio.objects.create(
+            author=self.user, title='Sunset', subtitle=None, body='Beach', category=self.category, is_completed=True
+        )
+        image = PortfolioImage.objects.create(
+            portfolio=self.portfolio, image='portfolios/2025/01/01/a.jpg', caption='غروب', width=1200, height=800
+        )
+        for variant_format in ('webp', 'jpeg'):
+            PortfolioImageVariant.objects.create(
+                source=image, format=variant_format, width=320, height=213,
+                image=f'portfolios/variants/2025/01/01/a-320.{variant_format}'
+            )
+        PortfolioImage.objects.create(portfolio=self.portfolio, caption='')
+        Portfolio.objects.create(author=self.user, title='Empty', body='No category')
+
+    def assert_parity(self, url, **extra):
+        """Fetch ``url`` with plans on and off and compare the bodies"""
+        with override_settings(PORTFOLIO_FIELD_PLANS=True):
+            planned = self.client.get(url, **extra)
+        with override_settings(PORTFOLIO_FIELD_PLANS=False):
+            drf = self.client.get(url, **extra)
+        self.assertEqual(planned.status_code, status.HTTP_200_OK)
+        self.assertEqual(planned.content, drf.content)
+        return planned
+
+    def test_list_and_detail(self):
+        """Test the list and detail responses, including image URLs and srcsets"""
+        response = self.assert_parity('/api/portfolio/')
+        self.assert_parity(f'/api/portfolio/{self.portfolio.pk}/')
+        self.assertIn(b'a-320.webp 320w', response.content)
+
+    def test_sparse_expanded_and_compact(self):
+        """Test ?fields=, ?expand= and ?lang= responses"""
+        self.assert_parity('/api/portfolio/?fields=id,title,category.slug,cover_image.image')
+        self.assert_parity(f'/api/portfolio/{self.portfolio.pk}/?expand=cover_image&lang=ar')
+        self.assert_parity('/api/portfolio/categories/?compact=1', HTTP_ACCEPT_LANGUAGE='ar')
+
+    def test_plan_is_compiled_once_per_list(self):
+        """Test that the list child compiles its plan once and reuses it for every row"""
+        from .representations import compile_plan as real_compile_plan
+
+        with mock.patch('portfolios.representations.compile_plan', side_effect=real_compile_plan) as compile_plan:
+            PortfolioSerializer(Portfolio.objects.with_related(), many=True).data
+
+        # one plan each for the portfolio child, nested category and image serializers
+        self.assertEqual(compile_plan.call_count, 3)
+
+
+class AsyncURLConf:
+    """Project URLs with the async read views, as config/asgi.py serves them"""
+    from django.urls import include, path
+    from config.urls import urlpatterns as project_urlpatterns
+    from .urls import get_urlpatterns
+
+    urlpatterns = [path('api/portfolio/', include(get_urlpatterns(async_views_enabled=True))), *project_urlpatterns]
+
+
+class AsyncReadViewTestCase(FileSystemStorageMixin, APITestCase):
+    """Test that the async read views answer exactly like the DRF views"""
+
+    compared_headers = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Vary', 'Allow', 'X-Cache')
+
+    def setUp(self):
+        """Set up portfolios with a category, images and variants"""
+        caches['default'].clear()
+        self.use_filesystem_storage()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        self.category = Category.objects.create(user=self.user, name='Photography', name_ar='التصوير', description='Photos')
+        self.portfolio = Portfolio.objects.create(author=self.user, title='Sunset', body='Beach', category=self.category)
+        self.image = PortfolioImage.objects.create(
+            portfolio=self.portfolio, image='portfolios/2025/01/01/a.jpg', caption='غروب', width=1200, height=800
+        )
+        PortfolioImageVariant.objects.create(
+            source=self.image, format='webp', width=320, height=213, image='portfolios/variants/2025/01/01/a-320.webp'
+        )
+        Portfolio.objects.create(author=self.user, title='Empty', body='No category')
+
+    def get_async(self, url, **kwargs):
+        """GET ``url`` through the ASGI handler with the async views routed"""
+        with override_settings(ROOT_URLCONF=AsyncURLConf):
+            return async_to_sync(self.async_client.get)(url, **kwargs)
+
+    def assert_same_response(self, url, **kwargs):
+        """Fetch ``url`` from the DRF and async views, each with a cold cache, and compare"""
+        caches['default'].clear()
+        expected = self.client.get(url, **kwargs)
+        caches['default'].clear()
+        response = self.get_async(url, **kwargs)
+        self.assertEqual(response.status_code, expected.status_code, url)
+        self.assertEqual(response.content, expected.content, url)
+        for header in self.compared_headers:
+            self.assertEqual(response.get(header), expected.get(header), f'{header} of {url}')
+        return response
+
+    def test_views_are_async(self):
+        """Test that the public GET routes resolve to coroutine functions"""
+        from django.urls import resolve
+
+        for url in ('/api/portfolio/', f'/api/portfolio/{self.portfolio.pk}/', '/api/portfolio/categories/',
+                    '/api/portfolio/info/', f'/api/portfolio/{self.portfolio.pk}/images/'):
+            self.assertTrue(asyncio.iscoroutinefunction(resolve(url, urlconf=AsyncURLConf).func), url)
+        self.assertFalse(asyncio.iscoroutinefunction(resolve('/api/portfolio/search/', urlconf=AsyncURLConf).func))
+
+    def test_portfolio_responses(self):
+        """Test the list and detail responses, with filters, sparse fields and compact languages"""
+        pk = self.portfolio.pk
+        response = self.assert_same_response('/api/portfolio/')
+        self.assertEqual(response.json()['count'], 2)
+        self.assert_same_response(f'/api/portfolio/?category_id={self.category.pk}&recent=1')
+        self.assert_same_response('/api/portfolio/?fields=id,title,category.slug&expand=cover_image')
+        self.assertEqual(self.assert_same_response('/api/portfolio/?fields=id,category.nope').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.assert_same_response('/api/portfolio/?expand=category.nope').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assert_same_response(f'/api/portfolio/{pk}/?expand=cover_image&lang=ar')
+        self.assert_same_response('/api/portfolio/?compact=1', headers={'Accept-Language': 'ar'})
+
+    def test_other_responses(self):
+        """Test categories, portfolio info and images"""
+        self.assert_same_response('/api/portfolio/categories/')
+        self.assert_same_response('/api/portfolio/categories/?no_pagination=1&compact=1', headers={'Accept-Language': 'ar'})
+        self.assert_same_response('/api/portfolio/info/')
+        self.assert_same_response('/api/portfolio/info/?lang=ar')
+        self.assert_same_response(f'/api/portfolio/{self.portfolio.pk}/images/')
+        self.assert_same_response(f'/api/portfolio/{self.portfolio.pk}/images/{self.image.pk}/')
+
+    def test_error_responses(self):
+        """Test 404s for missing objects and pages"""
+        for url in ('/api/portfolio/?page=3', '/api/portfolio/999999/', '/api/portfolio/999999/images/',
+                    f'/api/portfolio/{self.portfolio.pk}/images/999999/'):
+            response = self.assert_same_response(url)
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_response_cache_and_conditional_get(self):
+        """Test that the async views share the response cache and answer If-None-Match"""
+        first = self.get_async('/api/portfolio/')
+        second = self.get_async('/api/portfolio/')
+        self.assertEqual((first['X-Cache'], second['X-Cache']), ('MISS', 'HIT'))
+        self.assertEqual(first.content, self.client.get('/api/portfolio/').content)
+
+        response = self.get_async('/api/portfolio/', headers={'If-None-Match': first['ETag']})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_other_requests_use_drf_views(self):
+        """Test that writes, authenticated requests and cursor pages fall back to DRF"""
+        with override_settings(ROOT_URLCONF=AsyncURLConf):
+            post = async_to_sync(self.async_client.post)('/api/portfolio/', {'title': 'New'}, content_type='application/json')
+        self.assertEqual(post.status_code, status.HTTP_401_UNAUTHORIZED)
+        invalid_token = self.get_async('/api/portfolio/', headers={'Authorization': 'Bearer invalid'})
+        self.assertEqual(invalid_token.status_code, status.HTTP_401_UNAUTHORIZED)
+        cursor = self.assert_same_response('/api/portfolio/?cursor=')
+        self.assertNotIn('count', cursor.json())
+
+
+class AsyncWhiteNoiseMiddlewareTestCase(TestCase):
+    """Test that WhiteNoise does not force the middleware chain into sync mode"""
+
+    def test_async_chain(self):
+        """Test that the middleware is a coroutine function when the handler below it is"""
+        from config.middleware import AsyncWhiteNoiseMiddleware
+
+        async def get_response(request):
+            return 'response'
+
+        middleware = AsyncWhiteNoiseMiddleware(get_response)
+
+        self.assertTrue(asyncio.iscoroutinefunction(middleware))
+        request = mock.Mock(path_info='/api/portfolio/')
+        self.assertEqual(async_to_sync(middleware)(request), 'response')
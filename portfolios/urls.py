@@ -1,25 +1,49 @@
+from django.conf import settings
 from django.urls import path
 
+from . import async_views
 from .views import (
     CategoryListCreateView,
     CategoryRetrieveUpdateDestroyView,
     PortfolioListCreateView,
     PortfolioRetrieveUpdateDestroyView,
+    PortfolioSearchView,
     PortfolioInfoView,
+    ResponseCacheStatsView,
     PortfolioImageListCreateView,
+    PortfolioImageBatchCreateView,
+    PortfolioImageUploadUrlView,
+    PortfolioImageUploadCompleteView,
+    PortfolioImageDirectUploadView,
     PortfolioImageRetrieveDestroyView,
 )
 
-urlpatterns = [
-    # Category CRUD
-    path('categories/', CategoryListCreateView.as_view(), name='api_category_list_create'),
-    path('categories/<int:pk>/', CategoryRetrieveUpdateDestroyView.as_view(), name='api_category_detail'),
-    # Portfolio CRUD
-    path('', PortfolioListCreateView.as_view(), name='api_portfolio_list_create'),
-    path('<int:pk>/', PortfolioRetrieveUpdateDestroyView.as_view(), name='api_portfolio_detail'),
-    # Portfolio Info (public metadata)
-    path('info/', PortfolioInfoView.as_view(), name='portfolio_info'),
-    # Portfolio Images
-    path('<int:portfolio_id>/images/', PortfolioImageListCreateView.as_view(), name='api_portfolio_image_list_create'),
-    path('<int:portfolio_id>/images/<int:image_id>/', PortfolioImageRetrieveDestroyView.as_view(), name='api_portfolio_image_detail'),
-]
+
+def get_urlpatterns(async_views_enabled):
+    """Routes with the public GET endpoints served by the async views when enabled."""
+    def read_view(view_class, async_view_class):
+        return async_view_class.as_view() if async_views_enabled else view_class.as_view()
+
+    return [
+        # Category CRUD
+        path('categories/', read_view(CategoryListCreateView, async_views.CategoryListView), name='api_category_list_create'),
+        path('categories/<int:pk>/', CategoryRetrieveUpdateDestroyView.as_view(), name='api_category_detail'),
+        # Portfolio CRUD
+        path('', read_view(PortfolioListCreateView, async_views.PortfolioListView), name='api_portfolio_list_create'),
+        path('search/', PortfolioSearchView.as_view(), name='api_portfolio_search'),
+        path('<int:pk>/', read_view(PortfolioRetrieveUpdateDestroyView, async_views.PortfolioDetailView), name='api_portfolio_detail'),
+        # Portfolio Info (public metadata)
+        path('info/', read_view(PortfolioInfoView, async_views.PortfolioInfoDetailView), name='portfolio_info'),
+        # Response cache counters (superuser only)
+        path('cache/stats/', ResponseCacheStatsView.as_view(), name='api_portfolio_cache_stats'),
+        # Portfolio Images
+        path('<int:portfolio_id>/images/', read_view(PortfolioImageListCreateView, async_views.PortfolioImageListView), name='api_portfolio_image_list_create'),
+        path('<int:portfolio_id>/images/batch/', PortfolioImageBatchCreateView.as_view(), name='api_portfolio_image_batch_create'),
+        path('<int:portfolio_id>/images/upload-url/', PortfolioImageUploadUrlView.as_view(), name='api_portfolio_image_upload_url'),
+        path('<int:portfolio_id>/images/complete/', PortfolioImageUploadCompleteView.as_view(), name='api_portfolio_image_upload_complete'),
+        path('uploads/<str:token>/', PortfolioImageDirectUploadView.as_view(), name='api_portfolio_image_direct_upload'),
+        path('<int:portfolio_id>/images/<int:image_id>/', read_view(PortfolioImageRetrieveDestroyView, async_views.PortfolioImageDetailView), name='api_portfolio_image_detail'),
+    ]
+
+
+urlpatterns = get_urlpatterns(settings.PORTFOLIO_ASYNC_VIEWS)
@@ -1,9 +1,12 @@
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.models import User
+from django.conf import settings
+from django.core import signing
 from django.db.models import QuerySet
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 from django.utils.text import format_lazy
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
 
 from rest_framework import generics, status
 from rest_framework.views import APIView
@@ -16,8 +19,23 @@ from .serializers import (
     PortfolioSerializer,
     PortfolioInfoSerializer,
     CategorySerializer,
+    DirectUploadSlotSerializer,
+    DirectUploadCompleteSerializer,
 )
 from .permissions import IsOwner, IsCategoryOwner
+from .cache import cache_public_response, get_stats
+from .documents import get_info_document
+from .localization import get_compact_language, localize_data
+from .pagination import CursorPaginationOptInMixin
+from .fieldsets import SparseFieldsViewMixin
+from .storage import get_staging_storage, save_uploads
+from .imaging import read_image_header, open_header_stream
+from .direct_upload import LocalDirectUploadBackend, create_slot, get_backend, load_slot
+from .tasks import PROCESS_IMAGE, GENERATE_VARIANTS
+from .signals import invalidate_response_cache
+from .search import search_portfolios, update_search_vectors
+from jobs.queue import enqueue, bulk_enqueue
+from .conditional import conditional_response, PORTFOLIO_AGGREGATES, CATEGORY_AGGREGATES
 from authentication.permissions import IsSuperUser
 
 class CategoryListCreateView(generics.ListCreateAPIView):
@@ -31,6 +49,14 @@ class CategoryListCreateView(generics.ListCreateAPIView):
             permission_classes = [AllowAny]
         return [permission() for permission in permission_classes]
 
+    @conditional_response
+    @cache_public_response
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def get_fingerprint(self):
+        return Category.objects.aggregate(**CATEGORY_AGGREGATES)
+
     def get_queryset(self) -> QuerySet[Category]:
         return Category.objects.all()
 
@@ -41,7 +67,7 @@ class CategoryListCreateView(generics.ListCreateAPIView):
         return super().paginate_queryset(queryset)
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.id)
 
 
 class CategoryRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
@@ -55,6 +81,14 @@ class CategoryRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
             permission_classes = [IsAuthenticated, IsSuperUser]
         return [permission() for permission in permission_classes]
 
+    @conditional_response
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def get_fingerprint(self, pk):
+        fingerprint = Category.objects.filter(pk=pk).aggregate(**CATEGORY_AGGREGATES)
+        return fingerprint if fingerprint['count'] else None
+
     def get_queryset(self) -> QuerySet[Category]:
         return Category.objects.all()
 
@@ -73,7 +107,7 @@ class CategoryRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
             )
 
 
-class PortfolioListCreateView(generics.ListCreateAPIView):
+class PortfolioListCreateView(SparseFieldsViewMixin, CursorPaginationOptInMixin, generics.ListCreateAPIView):
     serializer_class = PortfolioSerializer
     pagination_class = PageNumberPagination
 
@@ -84,27 +118,61 @@ class PortfolioListCreateView(generics.ListCreateAPIView):
             permission_classes = [AllowAny]
         return [permission() for permission in permission_classes]
 
-    def get_queryset(self) -> QuerySet[Portfolio]:
-        queryset = Portfolio.objects.all()
-        
+    @conditional_response
+    @cache_public_response
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def get_fingerprint(self):
+        return self.filter_by_category(Portfolio.objects.all()).aggregate(**PORTFOLIO_AGGREGATES)
+
+    def filter_by_category(self, queryset):
         # Filter by category if ?category query parameter is present
         category_id = self.request.query_params.get('category_id')
         if category_id:
             queryset = queryset.filter(category_id=category_id)
+        return queryset
+
+    def get_queryset(self) -> QuerySet[Portfolio]:
+        queryset = self.filter_by_category(Portfolio.objects.with_related(self.get_field_selection()))
         
         # Filter latest 6 portfolios if ?recent query parameter is present
-        if self.request.query_params.get('recent'):
+        # (ignored in cursor mode, which pages through everything instead)
+        if self.request.query_params.get('recent') and not self.uses_cursor_pagination():
             queryset = queryset.order_by('-created_at')[:6]
         
         return queryset
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user)
+        serializer.save(author_id=self.request.user.id)
+
+
+class PortfolioSearchView(SparseFieldsViewMixin, generics.ListAPIView):
+    """Ranked full-text search over portfolios: ``?q=`` (required), paginated."""
+    serializer_class = PortfolioSerializer
+    pagination_class = PageNumberPagination
+    permission_classes = [AllowAny]
+    max_query_length = 200
+
+    @cache_public_response
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'q': [_('This query parameter is required.')]}, status=status.HTTP_400_BAD_REQUEST)
+        if len(query) > self.max_query_length:
+            return Response(
+                {'q': [format_lazy(_('Ensure this value has at most {} characters.'), self.max_query_length)]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return super().get(request, *args, **kwargs)
+
+    def get_queryset(self) -> QuerySet[Portfolio]:
+        return search_portfolios(Portfolio.objects.with_related(self.get_field_selection()), self.request.query_params.get('q', '').strip())
 
 
-class PortfolioRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class PortfolioRetrieveUpdateDestroyView(SparseFieldsViewMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = PortfolioSerializer
-    queryset = Portfolio.objects.all()
+    queryset = Portfolio.objects.with_related()
 
     def get_permissions(self):
         if self.request.method == 'GET':
@@ -113,33 +181,56 @@ class PortfolioRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
             permission_classes = [IsAuthenticated, IsSuperUser]
         return [permission() for permission in permission_classes]
 
+    @conditional_response
+    @cache_public_response
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def get_fingerprint(self, pk):
+        fingerprint = Portfolio.objects.filter(pk=pk).aggregate(**PORTFOLIO_AGGREGATES)
+        return fingerprint if fingerprint['count'] else None
+
     def get_queryset(self) -> QuerySet[Portfolio]:
         # Also filter queryset to user portfolios for list safety
-        return Portfolio.objects.all()
+        return Portfolio.objects.with_related(self.get_field_selection())
 
 
 class PortfolioInfoView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request):
-        """Retrieve portfolio info"""
-        try:
-            portfolio_info = PortfolioInfo.objects.first()
-            if not portfolio_info:
-                return Response(
-                    {'detail': _('Portfolio info not found')},
-                    status=status.HTTP_404_NOT_FOUND
-                )
-            serializer = PortfolioInfoSerializer(portfolio_info)
-            return Response(serializer.data)
-        except Exception as e:
+        """Retrieve portfolio info from the precomputed document"""
+        return self.document_response(request, get_info_document())
+
+    def document_response(self, request, document):
+        if document is None:
             return Response(
-                {'error': str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                {'detail': _('Portfolio info not found')},
+                status=status.HTTP_404_NOT_FOUND
             )
+        data, etag = document['data'], document['etag']
+        language = get_compact_language(request)
+        if language is not None:
+            data = localize_data(dict(data), PortfolioInfoSerializer.Meta.localized_fields, language)
+            etag = f'{etag[:-1]}-{language}"'
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = Response(data)
+        response['ETag'] = etag
+        patch_cache_control(response, no_cache=True)
+        patch_vary_headers(response, ('Accept', 'Accept-Language'))
+        return response
+
+
+class ResponseCacheStatsView(APIView):
+    """Expose response cache hit/miss counters to superusers."""
+    permission_classes = [IsAuthenticated, IsSuperUser]
+
+    def get(self, request):
+        return Response(get_stats())
 
 
-class PortfolioImageListCreateView(APIView):
+class PortfolioImageListCreateView(CursorPaginationOptInMixin, APIView):
     """List and upload images for a specific portfolio."""
     pagination_class = PageNumberPagination
 
@@ -156,10 +247,10 @@ class PortfolioImageListCreateView(APIView):
         except Portfolio.DoesNotExist:
             return Response({'detail': _('Portfolio not found')}, status=status.HTTP_404_NOT_FOUND)
 
-        images_qs = portfolio.images.all().order_by('-created_at')
+        images_qs = portfolio.images.all().order_by('-created_at').prefetch_related('variants')
 
         # Optional pagination
-        paginator = self.pagination_class()
+        paginator = self.paginator
         page = paginator.paginate_queryset(images_qs, request)
         from .serializers import PortfolioImageSerializer
         if page is not None:
@@ -177,18 +268,199 @@ class PortfolioImageListCreateView(APIView):
         from .serializers import PortfolioImageSerializer
         serializer = PortfolioImageSerializer(data=request.data)
         if serializer.is_valid():
-            image_instance = serializer.save(portfolio=portfolio)
-            # Capture GCS object name after save
-            try:
-                # The storage backend sets the final path in image.name
-                image_instance.gcs_object_name = image_instance.image.name
-                image_instance.save(update_fields=['gcs_object_name'])
-            except Exception:
-                pass
-            return Response(PortfolioImageSerializer(image_instance).data, status=status.HTTP_201_CREATED)
+            # Stage the bytes locally and let the job worker do the slow part
+            # (storage upload, dimension probing, variants) off the request thread.
+            upload = serializer.validated_data.pop('image')
+            dimensions = {}
+            header = read_image_header(upload)
+            upload.seek(0)
+            if header and 'width' not in serializer.validated_data and 'height' not in serializer.validated_data:
+                dimensions = dict(zip(('width', 'height', 'orientation'), header))
+            staged_name = get_staging_storage().save(upload.name, upload)
+            with transaction.atomic():
+                image_instance = serializer.save(
+                    portfolio=portfolio,
+                    processing_status=PortfolioImage.STATUS_PENDING,
+                    **dimensions
+                )
+                enqueue(PROCESS_IMAGE, {
+                    'image_id': image_instance.pk,
+                    'staged_name': staged_name,
+                    'original_name': upload.name,
+                })
+            return Response(PortfolioImageSerializer(image_instance).data, status=status.HTTP_202_ACCEPTED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class PortfolioImageBatchCreateView(APIView):
+    """
+    Upload many images to a portfolio in one multipart request.
+
+    Files are sent as repeated ``images`` parts, with optional ``captions``
+    matched by position. Valid files are written to storage in parallel and
+    inserted with a single query; the response reports every file separately.
+    """
+    permission_classes = [IsAuthenticated, IsSuperUser]
+
+    def post(self, request, portfolio_id):
+        try:
+            portfolio = Portfolio.objects.get(pk=portfolio_id)
+        except Portfolio.DoesNotExist:
+            return Response({'detail': _('Portfolio not found')}, status=status.HTTP_404_NOT_FOUND)
+
+        uploads = request.FILES.getlist('images')
+        captions = request.data.getlist('captions') if hasattr(request.data, 'getlist') else []
+        if not uploads:
+            return Response({'images': [_('No files were submitted.')]}, status=status.HTTP_400_BAD_REQUEST)
+        max_files = settings.PORTFOLIO_BATCH_UPLOAD_MAX_FILES
+        if len(uploads) > max_files:
+            return Response(
+                {'images': [format_lazy(_('A batch may contain at most {} files.'), max_files)]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        from .serializers import PortfolioImageSerializer
+        results = []
+        accepted = []
+        for index, upload in enumerate(uploads):
+            caption = captions[index] if index < len(captions) else ''
+            serializer = PortfolioImageSerializer(data={'image': upload, 'caption': caption})
+            result = {'index': index, 'filename': upload.name}
+            results.append(result)
+            if not serializer.is_valid():
+                result.update(status=status.HTTP_400_BAD_REQUEST, errors=serializer.errors)
+                continue
+            header = read_image_header(upload)
+            upload.seek(0)
+            dimensions = dict(zip(('width', 'height', 'orientation'), header)) if header else {}
+            accepted.append((result, upload, PortfolioImage(
+                portfolio=portfolio,
+                caption=serializer.validated_data.get('caption', ''),
+                processing_status=PortfolioImage.STATUS_PROCESSING,
+                **dimensions
+            )))
+
+        stored_names = save_uploads(PortfolioImage._meta.get_field('image'), [upload for _result, upload, _image in accepted])
+        instances = []
+        for (result, upload, image_instance), stored_name in zip(accepted, stored_names):
+            if isinstance(stored_name, Exception):
+                result.update(status=status.HTTP_502_BAD_GATEWAY, errors={'image': [_('Could not store the file.')]})
+                continue
+            image_instance.image.name = stored_name
+            image_instance.gcs_object_name = stored_name
+            instances.append((result, image_instance))
+
+        if instances:
+            with transaction.atomic():
+                created = PortfolioImage.objects.bulk_create([image_instance for _result, image_instance in instances])
+                # bulk_create skips post_save, so invalidate and enqueue explicitly
+                invalidate_response_cache(sender=PortfolioImage)
+                update_search_vectors([portfolio.pk])
+                bulk_enqueue(GENERATE_VARIANTS, [{'image_id': image_instance.pk} for image_instance in created])
+            for result, image_instance in instances:
+                result.update(status=status.HTTP_201_CREATED, image=PortfolioImageSerializer(image_instance).data)
+
+        if len(instances) == len(results):
+            response_status = status.HTTP_201_CREATED
+        elif instances:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({'results': results}, status=response_status)
+
+
+class PortfolioImageUploadUrlView(APIView):
+    """Issue a signed URL for uploading an image straight to storage."""
+    permission_classes = [IsAuthenticated, IsSuperUser]
+
+    def post(self, request, portfolio_id):
+        try:
+            portfolio = Portfolio.objects.get(pk=portfolio_id)
+        except Portfolio.DoesNotExist:
+            return Response({'detail': _('Portfolio not found')}, status=status.HTTP_404_NOT_FOUND)
+
+        serializer = DirectUploadSlotSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        slot = create_slot(request, portfolio, **serializer.validated_data)
+        return Response(slot, status=status.HTTP_201_CREATED)
+
+
+class PortfolioImageUploadCompleteView(APIView):
+    """Create the PortfolioImage row once a direct upload has reached storage."""
+    permission_classes = [IsAuthenticated, IsSuperUser]
+
+    def post(self, request, portfolio_id):
+        try:
+            portfolio = Portfolio.objects.get(pk=portfolio_id)
+        except Portfolio.DoesNotExist:
+            return Response({'detail': _('Portfolio not found')}, status=status.HTTP_404_NOT_FOUND)
+
+        serializer = DirectUploadCompleteSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+        try:
+            object_name = load_slot(data['token'], portfolio)
+        except signing.BadSignature:
+            return Response({'token': [_('Invalid or expired upload token.')]}, status=status.HTTP_400_BAD_REQUEST)
+        if PortfolioImage.objects.filter(gcs_object_name=object_name).exists():
+            return Response({'detail': _('This upload has already been completed.')}, status=status.HTTP_409_CONFLICT)
+
+        backend = get_backend()
+        size = backend.get_size(object_name)
+        if size is None:
+            return Response({'detail': _('Upload not found in storage.')}, status=status.HTTP_400_BAD_REQUEST)
+        if size > settings.PORTFOLIO_DIRECT_UPLOAD_MAX_SIZE:
+            backend.delete(object_name)
+            return Response({'detail': _('Image size must be less than 5MB.')}, status=status.HTTP_400_BAD_REQUEST)
+
+        image_instance = PortfolioImage(
+            portfolio=portfolio,
+            caption=data.get('caption'),
+            width=data.get('width'),
+            height=data.get('height'),
+            gcs_object_name=object_name,
+            processing_status=PortfolioImage.STATUS_PROCESSING,
+        )
+        image_instance.image.name = object_name
+        with open_header_stream(image_instance.image) as stream:
+            header = read_image_header(stream)
+        if header is None:
+            backend.delete(object_name)
+            return Response({'detail': _('Uploaded file is not a valid image.')}, status=status.HTTP_400_BAD_REQUEST)
+        if 'width' not in data and 'height' not in data:
+            image_instance.width, image_instance.height, image_instance.orientation = header
+
+        with transaction.atomic():
+            image_instance.save()
+            enqueue(GENERATE_VARIANTS, {'image_id': image_instance.pk})
+        from .serializers import PortfolioImageSerializer
+        return Response(PortfolioImageSerializer(image_instance).data, status=status.HTTP_201_CREATED)
+
+
+class PortfolioImageDirectUploadView(APIView):
+    """PUT target for URLs issued by LocalDirectUploadBackend (the token is the credential)."""
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def put(self, request, token):
+        backend = get_backend()
+        if not isinstance(backend, LocalDirectUploadBackend):
+            return Response({'detail': _('Not found.')}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            content_length = None
+        try:
+            backend.receive(token, request.content_type, request.stream, content_length)
+        except signing.BadSignature:
+            return Response({'detail': _('Invalid or expired upload URL.')}, status=status.HTTP_403_FORBIDDEN)
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(status=status.HTTP_201_CREATED)
+
+
 class PortfolioImageRetrieveDestroyView(APIView):
     """Retrieve or delete a single image for a portfolio."""
 
@@ -201,7 +473,7 @@ class PortfolioImageRetrieveDestroyView(APIView):
 
     def get_object(self, portfolio_id, image_id):
         try:
-            return PortfolioImage.objects.get(pk=image_id, portfolio_id=portfolio_id)
+            return PortfolioImage.objects.prefetch_related('variants').get(pk=image_id, portfolio_id=portfolio_id)
         except PortfolioImage.DoesNotExist:
             return None
 
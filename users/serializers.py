@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from django.apps import apps
 
+from portfolios.localization import LocalizedFieldsMixin
 
-class UserProfileSerializer(serializers.ModelSerializer):
+
+class UserProfileSerializer(LocalizedFieldsMixin, serializers.ModelSerializer):
     full_name = serializers.SerializerMethodField()
     portfolio_title = serializers.SerializerMethodField()
     portfolio_title_ar = serializers.SerializerMethodField()
@@ -12,6 +14,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
         model = apps.get_model('users', 'User')
         fields = ['id', 'full_name', 'first_name', 'last_name', 'email', 'job_title', 'phone_number', 'location', 'bio', 'bio_ar', 'about_me', 'about_me_ar', 'portfolio_title', 'portfolio_title_ar', 'background_image']
         read_only_fields = ['id', 'full_name', 'portfolio_title', 'portfolio_title_ar']
+        localized_fields = ['bio', 'about_me', 'portfolio_title']
 
     def get_full_name(self, obj):
         return obj.get_full_name()
@@ -92,3 +92,25 @@ class UserSerializerTestCase(APITestCase):
         self.assertEqual(serializer.data['first_name'], 'John')
         self.assertEqual(serializer.data['last_name'], 'Doe')
         self.assertIn('id', serializer.data)
+
+
+class UserProfileCompactTestCase(APITestCase):
+    """Test the compact profile representation"""
+
+    def test_profile_lang_parameter(self):
+        """Test that ?lang=ar collapses translated profile fields"""
+        user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123',
+            bio='Bio',
+            bio_ar='نبذة'
+        )
+        self.client.force_authenticate(user=user)
+
+        response = self.client.get('/api/users/profile/?lang=ar')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['bio'], 'نبذة')
+        self.assertNotIn('bio_ar', response.data)
+        self.assertNotIn('portfolio_title_ar', response.data)
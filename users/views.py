@@ -2,15 +2,18 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
+from authentication.authentication import UserJWTAuthentication
 from .serializers import UserProfileSerializer
 
 
 class ProfileView(APIView):
+    # Needs the User row, not the claims-only TokenUser
+    authentication_classes = [UserJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         """Get the authenticated user's profile"""
-        serializer = UserProfileSerializer(request.user)
+        serializer = UserProfileSerializer(request.user, context={'request': request})
         return Response(serializer.data)
 
     def put(self, request):